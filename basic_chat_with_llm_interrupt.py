@@ -4,19 +4,28 @@ from langgraph.constants import START, END
 from langgraph.graph import StateGraph, MessagesState
 from langgraph.types import interrupt, Command
 from langgraph.checkpoint.memory import InMemorySaver
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
 from typing import Literal
 
 from dotenv import load_dotenv
 import os
 from langchain_openai import ChatOpenAI
 
+from llm_cache import SQLiteLLMCache
+from graph_metrics import NodeMetrics, do_print_node_summary
+from graph_render import do_save_graph_image_async
+from extraction_pipeline import ExtractionPipeline, do_parse_company_person, do_print_pipeline_stats, pipeline_stats
+
 # Load environment variables
 load_dotenv(".env")
 
 openai_api_key = os.getenv("OPENAI_API_KEY")
 llm = ChatOpenAI(model="gpt-3.5-turbo", api_key=openai_api_key)
 
+# LinkedIn/company profiles only depend on the prompt, so serve repeats from a disk cache
+llm_cache = SQLiteLLMCache()
+enrichment_llm = ChatOpenAI(model="gpt-3.5-turbo", api_key=openai_api_key, cache=llm_cache)
+
 # Define graph state using MessagesState
 class State(MessagesState):
     company_name: str = None
@@ -53,10 +62,20 @@ def do_validate_company_and_person(state: State) -> State:
             break
     
     if not user_input:
+        if state.get("company_name") and state.get("person"):
+            return {}  # Pre-filled (e.g. batch mode), nothing to validate
         return {"messages": [AIMessage(content="No input found. Please try again.")]}
     
-    # Use LLM to extract company and person
-    extraction_prompt = f"""
+    # Well-formed input is parsed directly; the LLM only sees the rest
+    result = company_person_pipeline.extract(user_input)
+    if result.stage == "regex":
+        print(f"⚡ Parsed without the LLM: {result.value}")
+
+    return do_apply_extraction(state, result.value)
+
+def do_build_extraction_prompt(user_input: str) -> str:
+    """Build the prompt that asks the LLM to extract company and person"""
+    return f"""
     Extract the company name and person name from the following text: '{user_input}'
     
     Return in this exact format:
@@ -65,59 +84,69 @@ def do_validate_company_and_person(state: State) -> State:
     
     If only one is provided, still use the format but put 'NOT_PROVIDED' for missing information.
     """
-    
-    llm_response = llm.invoke([HumanMessage(content=extraction_prompt)]).content
+
+def do_parse_llm_fields(llm_response: str) -> dict:
+    """Company/person from the LLM's 'Company: ...' / 'Person: ...' lines, without the NOT_PROVIDED ones"""
+    fields = {}
+    for line in llm_response.strip().split('\n'):
+        for label, key in (('Company:', 'company'), ('Person:', 'person')):
+            if line.startswith(label):
+                value = line.replace(label, '').strip()
+                if value and value != 'NOT_PROVIDED':
+                    fields[key] = value
+    return fields
+
+def do_score_llm_fields(fields: dict):
+    """Extraction stage result: confident only when both fields were found"""
+    return fields, 1.0 if len(fields) == 2 else 0.5
+
+def do_llm_extract_company_person(user_input: str):
+    llm_response = llm.invoke([HumanMessage(content=do_build_extraction_prompt(user_input))]).content
     print(f"🤖 LLM extracted: {llm_response}")
-    
-    # Parse the LLM response
-    company_name = state.get("company_name")
-    person = state.get("person")
-    
-    try:
-        lines = llm_response.strip().split('\n')
-        for line in lines:
-            if line.startswith('Company:'):
-                extracted_company = line.replace('Company:', '').strip()
-                if extracted_company and extracted_company != 'NOT_PROVIDED':
-                    company_name = extracted_company
-            elif line.startswith('Person:'):
-                extracted_person = line.replace('Person:', '').strip()
-                if extracted_person and extracted_person != 'NOT_PROVIDED':
-                    person = extracted_person
-        
-        result = {}
-        if company_name:
-            result["company_name"] = company_name
-        if person:
-            result["person"] = person
-            
-        # Create confirmation message
-        if company_name and person:
-            result["messages"] = [AIMessage(content=f"Great! Company: {company_name}, Person: {person}")]
-        elif company_name:
-            result["messages"] = [AIMessage(content=f"Got company: {company_name}. Still need person name.")]
-        elif person:
-            result["messages"] = [AIMessage(content=f"Got person: {person}. Still need company name.")]
-        else:
-            result["messages"] = [AIMessage(content="Could not extract company or person. Please try again with format 'Company: [name], Person: [name]'")]
-            
-        return result
-        
-    except Exception as e:
-        return {"messages": [AIMessage(content=f"Error processing input: {e}. Please try again.")]}
+    return do_score_llm_fields(do_parse_llm_fields(llm_response))
+
+async def do_allm_extract_company_person(user_input: str):
+    llm_response = (await llm.ainvoke([HumanMessage(content=do_build_extraction_prompt(user_input))])).content
+    print(f"🤖 LLM extracted: {llm_response}")
+    return do_score_llm_fields(do_parse_llm_fields(llm_response))
+
+# Regex parser for the 'Company: [name], Person: [name]' format we ask for, then the LLM
+company_person_pipeline = ExtractionPipeline("company_person", [
+    ("regex", do_parse_company_person),
+    ("llm", do_llm_extract_company_person, do_allm_extract_company_person),
+])
+
+def do_apply_extraction(state: State, fields: dict) -> State:
+    """Merge extracted company/person into the state and confirm what is still missing"""
+    company_name = fields.get("company") or state.get("company_name")
+    person = fields.get("person") or state.get("person")
+
+    result = {}
+    if company_name:
+        result["company_name"] = company_name
+    if person:
+        result["person"] = person
+
+    # Create confirmation message
+    if company_name and person:
+        result["messages"] = [AIMessage(content=f"Great! Company: {company_name}, Person: {person}")]
+    elif company_name:
+        result["messages"] = [AIMessage(content=f"Got company: {company_name}. Still need person name.")]
+    elif person:
+        result["messages"] = [AIMessage(content=f"Got person: {person}. Still need company name.")]
+    else:
+        result["messages"] = [AIMessage(content="Could not extract company or person. Please try again with format 'Company: [name], Person: [name]'")]
+
+    return result
 
 def do_get_linkedin_data(state: State) -> State:
     """Simulate getting LinkedIn data for the person"""
     person = state.get("person")
     
     # Simulate LinkedIn API call with LLM-generated realistic data
-    linkedin_prompt = f"""
-    Generate realistic professional LinkedIn data for a person named '{person}'.
-    Include: job title, company, years of experience, key skills, and education.
-    Keep it concise but professional.
-    """
+    linkedin_prompt = do_build_linkedin_prompt(person)
     
-    linkedin_data = llm.invoke([HumanMessage(content=linkedin_prompt)]).content
+    linkedin_data = enrichment_llm.invoke([HumanMessage(content=linkedin_prompt)]).content
     print(f"💼 LinkedIn data retrieved for {person}")
     
     return {
@@ -130,13 +159,9 @@ def do_get_company_website(state: State) -> State:
     company_name = state.get("company_name")
     
     # Simulate website scraping with LLM-generated realistic data
-    website_prompt = f"""
-    Generate realistic company information for '{company_name}'.
-    Include: company description, main products/services, company values, and recent news/achievements.
-    Keep it concise but informative for email personalization.
-    """
+    website_prompt = do_build_website_prompt(company_name)
     
-    company_website = llm.invoke([HumanMessage(content=website_prompt)]).content
+    company_website = enrichment_llm.invoke([HumanMessage(content=website_prompt)]).content
     print(f"🌐 Company website data retrieved for {company_name}")
     
     return {
@@ -146,12 +171,40 @@ def do_get_company_website(state: State) -> State:
 
 def do_write_personalized_email(state: State) -> State:
     """Write a personalized email based on LinkedIn and company data"""
+    email_prompt = do_build_email_prompt(state)
+    
+    email_content = llm.invoke([HumanMessage(content=email_prompt)]).content
+    print("✉️ Personalized email written")
+    
+    return {
+        "email_content": email_content,
+        "messages": [AIMessage(content=f"Here's the personalized email:\n\n{email_content}")]
+    }
+
+def do_build_linkedin_prompt(person: str) -> str:
+    """Build the prompt that simulates a LinkedIn profile lookup"""
+    return f"""
+    Generate realistic professional LinkedIn data for a person named '{person}'.
+    Include: job title, company, years of experience, key skills, and education.
+    Keep it concise but professional.
+    """
+
+def do_build_website_prompt(company_name: str) -> str:
+    """Build the prompt that simulates scraping the company website"""
+    return f"""
+    Generate realistic company information for '{company_name}'.
+    Include: company description, main products/services, company values, and recent news/achievements.
+    Keep it concise but informative for email personalization.
+    """
+
+def do_build_email_prompt(state: State) -> str:
+    """Build the email-writing prompt from the collected person and company data"""
     person = state.get("person")
     company_name = state.get("company_name")
     linkedin_data = state.get("linkedin_data")
     company_website = state.get("company_website")
     
-    email_prompt = f"""
+    return f"""
     Write a personalized business email to {person} at {company_name}.
     
     Person's LinkedIn data:
@@ -171,28 +224,13 @@ def do_write_personalized_email(state: State) -> State:
     Format as a complete email with subject line.
     sign it off with my name "Jonathan Yarkoni" I am the CEO of LATENT AI
     """
-    
-    email_content = llm.invoke([HumanMessage(content=email_prompt)]).content
-    print("✉️ Personalized email written")
-    
-    return {
-        "email_content": email_content,
-        "messages": [AIMessage(content=f"Here's the personalized email:\n\n{email_content}")]
-    }
 
 def do_ask_for_approval(state: State) -> State:
     """Ask user if the email is good to send"""
-    email_content = state.get("email_content")
-    
-    # Print the email separately
-    print("\n" + "="*60)
-    print("📧 GENERATED EMAIL:")
-    print("="*60)
-    print(email_content)
-    print("="*60)
-    
+    # The CLI shows the email while it is written (see do_stream_until_interrupt);
+    # the draft still goes in the interrupt so API clients approve what they read
     prompt = "Is this email good to send? (yes/no)"
-    user_input = interrupt(prompt)
+    user_input = interrupt({"question": prompt, "email": state.get("email_content")})
     
     return {"messages": [HumanMessage(content=user_input)]}
 
@@ -211,13 +249,14 @@ def do_validate_approval(state: State) -> State:
     else:
         return {"messages": [AIMessage(content="Email needs revision. Let me rewrite it...")]}
 
-def do_should_continue_collection(state: State) -> Literal["do_ask_for_company_and_person", "do_get_linkedin_data"]:
+def do_should_continue_collection(state: State) -> Literal["do_ask_for_company_and_person"] | list[str]:
     """Decide whether to continue asking for company/person or move to next step"""
     company_name = state.get("company_name")
     person = state.get("person")
     
     if company_name and person:
-        return "do_get_linkedin_data"
+        # LinkedIn and website lookups don't depend on each other, so fan out and run them in parallel
+        return ["do_get_linkedin_data", "do_get_company_website"]
     else:
         return "do_ask_for_company_and_person"
 
@@ -236,62 +275,108 @@ def do_should_continue_approval(state: State) -> Literal["do_write_personalized_
     else:
         return "do_write_personalized_email"
 
-def do_run_interactive_graph():
+def do_build_graph(nodes: dict = None, checkpointer=None, interrupt_before: list = None):
+    """Build and compile the email workflow graph.
+
+    `nodes` optionally replaces node functions by name (e.g. with async versions),
+    so every variant of the workflow shares the same topology.
+    """
+    node_functions = {
+        "do_ask_for_company_and_person": do_ask_for_company_and_person,
+        "do_validate_company_and_person": do_validate_company_and_person,
+        "do_get_linkedin_data": do_get_linkedin_data,
+        "do_get_company_website": do_get_company_website,
+        "do_write_personalized_email": do_write_personalized_email,
+        "do_ask_for_approval": do_ask_for_approval,
+        "do_validate_approval": do_validate_approval,
+    }
+    node_functions.update(nodes or {})
+
     # Build the graph
     builder = StateGraph(State)
     
     # Add all nodes
-    builder.add_node("do_ask_for_company_and_person", do_ask_for_company_and_person)
-    builder.add_node("do_validate_company_and_person", do_validate_company_and_person)
-    builder.add_node("do_get_linkedin_data", do_get_linkedin_data)
-    builder.add_node("do_get_company_website", do_get_company_website)
-    builder.add_node("do_write_personalized_email", do_write_personalized_email)
-    builder.add_node("do_ask_for_approval", do_ask_for_approval)
-    builder.add_node("do_validate_approval", do_validate_approval)
+    for name, node_function in node_functions.items():
+        builder.add_node(name, node_function)
 
     # Set entry point
     builder.set_entry_point("do_ask_for_company_and_person")
     
     # Add edges
     builder.add_edge("do_ask_for_company_and_person", "do_validate_company_and_person")
-    builder.add_conditional_edges("do_validate_company_and_person", do_should_continue_collection)
-    builder.add_edge("do_get_linkedin_data", "do_get_company_website")
-    builder.add_edge("do_get_company_website", "do_write_personalized_email")
+    builder.add_conditional_edges(
+        "do_validate_company_and_person",
+        do_should_continue_collection,
+        ["do_ask_for_company_and_person", "do_get_linkedin_data", "do_get_company_website"]
+    )
+    # Wait for both enrichment branches before writing the email
+    builder.add_edge(["do_get_linkedin_data", "do_get_company_website"], "do_write_personalized_email")
     builder.add_edge("do_write_personalized_email", "do_ask_for_approval")
     builder.add_edge("do_ask_for_approval", "do_validate_approval")
     builder.add_conditional_edges("do_validate_approval", do_should_continue_approval)
 
-    # Create the graph with a memory checkpointer
-    checkpointer = InMemorySaver()
-    graph = builder.compile(checkpointer=checkpointer)
+    # Create the graph with a memory checkpointer unless one is provided
+    if checkpointer is None:
+        checkpointer = InMemorySaver()
+    return builder.compile(checkpointer=checkpointer, interrupt_before=interrupt_before)
+
+# Node whose LLM tokens are streamed to the reviewer
+EMAIL_WRITER_NODE = "do_write_personalized_email"
+
+def do_print_email_token(token: str, first: bool) -> None:
+    if first:
+        print("\n" + "="*60)
+        print("📧 GENERATED EMAIL:")
+        print("="*60)
+    print(token, end="", flush=True)
+
+def do_stream_until_interrupt(graph, graph_input, config, on_token=do_print_email_token) -> tuple[list, str]:
+    """Run the graph until it finishes or pauses, passing the email writer's tokens to
+    `on_token(token, first)` as they are generated. Returns (pending interrupts, streamed email)."""
+    interrupts = []
+    tokens = []
+    for mode, chunk in graph.stream(graph_input, config=config, stream_mode=["messages", "updates"]):
+        if mode == "messages":
+            message, metadata = chunk
+            # Only the model's token chunks, not the messages the node adds to the state
+            if isinstance(message, AIMessageChunk) and metadata.get("langgraph_node") == EMAIL_WRITER_NODE and message.content:
+                on_token(message.content, not tokens)
+                tokens.append(message.content)
+        elif "__interrupt__" in chunk:
+            interrupts = list(chunk["__interrupt__"])
+    return interrupts, "".join(tokens)
+
+def do_run_interactive_graph():
+    graph = do_build_graph()
 
-    try:
-        png_data = graph.get_graph().draw_mermaid_png()
-        with open("graph_comp.png", "wb") as f:
-            f.write(png_data)
-        print("🎨 Graph saved as graph_comp.png")
-    except Exception as e:
-        print(f"❌ Could not save PNG: {e}")
+    # Drawn locally in the background and cached, so the workflow starts right away
+    do_save_graph_image_async(graph, "graph_comp.png")
 
-    # Set up configuration
-    config = {"configurable": {"thread_id": uuid.uuid4()}}
+    # Set up configuration, timing every node of the run
+    node_metrics = NodeMetrics()
+    config = {"configurable": {"thread_id": uuid.uuid4()}, "callbacks": [node_metrics]}
     print("🚀 Starting email generation workflow...")
     print("Please state company and person of interest:")
     
-    # Start the graph
-    result = graph.invoke({"messages": []}, config=config)
+    # Start the graph, streaming the email as it is written
+    interrupts, email = do_stream_until_interrupt(graph, {"messages": []}, config)
     
     # Continue running until we get a valid result (no interrupt)
-    while "__interrupt__" in result:        
+    while interrupts:
+        if email:
+            print("\n" + "="*60)
         
         # Get user input from command line
         user_input = input("> ")
         
         # Resume the graph with the user's input
-        result = graph.invoke(Command(resume=user_input), config=config)
+        interrupts, email = do_stream_until_interrupt(graph, Command(resume=user_input), config)
     
     # Print the final result
     print("\n🎉 EMAIL SENT! 🎉")
+    print(f"🗄️ Enrichment cache: {llm_cache.stats()}")
+    do_print_node_summary(node_metrics.summary())
+    do_print_pipeline_stats(pipeline_stats())
 
 if __name__ == "__main__":
     do_run_interactive_graph()
\ No newline at end of file
@@ -0,0 +1,165 @@
+import asyncio
+import uuid
+
+from langgraph.types import Command
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+
+from basic_chat_with_llm_interrupt import (
+    State,
+    llm,
+    enrichment_llm,
+    llm_cache,
+    do_build_graph,
+    company_person_pipeline,
+    do_apply_extraction,
+    do_build_linkedin_prompt,
+    do_build_website_prompt,
+    do_build_email_prompt,
+    do_print_email_token,
+    EMAIL_WRITER_NODE,
+)
+from graph_metrics import NodeMetrics, do_print_node_summary
+from extraction_pipeline import do_print_pipeline_stats, pipeline_stats
+
+# Async versions of the LLM nodes. The graph topology, prompts and the
+# non-LLM nodes are shared with basic_chat_with_llm_interrupt.py.
+
+async def do_validate_company_and_person(state: State) -> State:
+    """Validate and extract company name and person from user input"""
+    # Get the most recent human message
+    messages = state.get("messages", [])
+    user_input = None
+    for msg in reversed(messages):
+        if isinstance(msg, HumanMessage):
+            user_input = msg.content
+            break
+
+    if not user_input:
+        if state.get("company_name") and state.get("person"):
+            return {}  # Pre-filled (e.g. batch mode), nothing to validate
+        return {"messages": [AIMessage(content="No input found. Please try again.")]}
+
+    # Well-formed input is parsed directly; the LLM only sees the rest
+    result = await company_person_pipeline.aextract(user_input)
+    if result.stage == "regex":
+        print(f"⚡ Parsed without the LLM: {result.value}")
+
+    return do_apply_extraction(state, result.value)
+
+async def do_get_linkedin_data(state: State) -> State:
+    """Simulate getting LinkedIn data for the person"""
+    person = state.get("person")
+
+    linkedin_prompt = do_build_linkedin_prompt(person)
+
+    linkedin_data = (await enrichment_llm.ainvoke([HumanMessage(content=linkedin_prompt)])).content
+    print(f"💼 LinkedIn data retrieved for {person}")
+
+    return {
+        "linkedin_data": linkedin_data,
+        "messages": [AIMessage(content=f"Retrieved LinkedIn data for {person}")]
+    }
+
+async def do_get_company_website(state: State) -> State:
+    """Simulate getting company website information"""
+    company_name = state.get("company_name")
+
+    website_prompt = do_build_website_prompt(company_name)
+
+    company_website = (await enrichment_llm.ainvoke([HumanMessage(content=website_prompt)])).content
+    print(f"🌐 Company website data retrieved for {company_name}")
+
+    return {
+        "company_website": company_website,
+        "messages": [AIMessage(content=f"Retrieved website information for {company_name}")]
+    }
+
+async def do_write_personalized_email(state: State) -> State:
+    """Write a personalized email based on LinkedIn and company data"""
+    email_prompt = do_build_email_prompt(state)
+
+    email_content = (await llm.ainvoke([HumanMessage(content=email_prompt)])).content
+    print("✉️ Personalized email written")
+
+    return {
+        "email_content": email_content,
+        "messages": [AIMessage(content=f"Here's the personalized email:\n\n{email_content}")]
+    }
+
+def do_build_async_graph(checkpointer=None, interrupt_before: list = None):
+    """Build the email workflow graph with async LLM nodes"""
+    return do_build_graph(
+        nodes={
+            "do_validate_company_and_person": do_validate_company_and_person,
+            "do_get_linkedin_data": do_get_linkedin_data,
+            "do_get_company_website": do_get_company_website,
+            "do_write_personalized_email": do_write_personalized_email,
+        },
+        checkpointer=checkpointer,
+        interrupt_before=interrupt_before,
+    )
+
+async def do_astream_until_interrupt(graph, graph_input, config, on_token=None) -> tuple[list, str]:
+    """Async do_stream_until_interrupt: returns (pending interrupts, streamed email).
+    `on_token(token, first)` may be a plain function or a coroutine function."""
+    interrupts = []
+    tokens = []
+    async for mode, chunk in graph.astream(graph_input, config=config, stream_mode=["messages", "updates"]):
+        if mode == "messages":
+            message, metadata = chunk
+            # Only the model's token chunks, not the messages the node adds to the state
+            if isinstance(message, AIMessageChunk) and metadata.get("langgraph_node") == EMAIL_WRITER_NODE and message.content:
+                if on_token is not None:
+                    rendered = on_token(message.content, not tokens)
+                    if asyncio.iscoroutine(rendered):
+                        await rendered
+                tokens.append(message.content)
+        elif "__interrupt__" in chunk:
+            interrupts = list(chunk["__interrupt__"])
+    return interrupts, "".join(tokens)
+
+async def do_run_lead_thread(graph, thread_id, ask_user, callbacks: list = None, on_token=None) -> dict:
+    """Drive one lead thread to completion, resuming every interrupt with `await ask_user(value)`.
+
+    Many of these can run concurrently on one event loop, one per conversation.
+    The email is passed to `on_token` as it is written, before the approval interrupt.
+    """
+    config = {"configurable": {"thread_id": thread_id}, "callbacks": callbacks or []}
+
+    # Start the graph
+    interrupts, _ = await do_astream_until_interrupt(graph, {"messages": []}, config, on_token)
+
+    # Continue running until we get a valid result (no interrupt)
+    while interrupts:
+        user_input = await ask_user(interrupts[0].value)
+
+        # Resume the graph with the user's input
+        interrupts, _ = await do_astream_until_interrupt(graph, Command(resume=user_input), config, on_token)
+
+    return (await graph.aget_state(config)).values
+
+async def do_ask_user_on_console(prompt) -> str:
+    """Read a reply from the command line without blocking the event loop"""
+    # The approval interrupt also carries the email, which was already streamed
+    if isinstance(prompt, dict):
+        prompt = prompt["question"]
+    print(f"\n{prompt}")
+    return await asyncio.to_thread(input, "> ")
+
+async def do_run_interactive_graph_async():
+    graph = do_build_async_graph()
+
+    print("🚀 Starting email generation workflow (async)...")
+
+    node_metrics = NodeMetrics()
+    await do_run_lead_thread(graph, uuid.uuid4(), do_ask_user_on_console, callbacks=[node_metrics],
+                             on_token=do_print_email_token)
+
+    # Print the final result
+    print("\n🎉 EMAIL SENT! 🎉")
+    print(f"🗄️ Enrichment cache: {llm_cache.stats()}")
+    do_print_node_summary(node_metrics.summary())
+    do_print_pipeline_stats(pipeline_stats())
+
+if __name__ == "__main__":
+    asyncio.run(do_run_interactive_graph_async())
@@ -0,0 +1,128 @@
+import argparse
+import asyncio
+import csv
+import json
+import time
+import uuid
+
+from langchain_core.runnables import RunnableLambda
+
+from basic_chat_with_llm_interrupt_async import do_build_async_graph, llm_cache
+from graph_metrics import NodeMetrics, do_print_node_summary
+from sqlite_checkpointer import PooledSqliteSaver
+
+# Batch mode for the personalized-email workflow.
+# Every (company, person) row runs as its own graph thread with `company_name`
+# and `person` pre-filled, so the collection interrupts are skipped. The graph
+# pauses before `do_ask_for_approval`, and the drafted email is written out.
+
+def do_read_rows(f, is_jsonl: bool):
+    """Yield (line number, row or None, error or None) for every record of the file"""
+    if is_jsonl:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(row, dict):
+                yield line_number, None, "Expected a JSON object"
+                continue
+            yield line_number, row, None
+    else:
+        reader = csv.DictReader(f)
+        reader.fieldnames  # Reads the header
+        # Line where the next row starts; a quoted field can span several lines
+        line_number = reader.line_num + 1
+        for row in reader:
+            yield line_number, row, None
+            line_number = reader.line_num + 1
+
+def do_load_leads(path: str) -> tuple[list[dict], list[dict]]:
+    """Load (company, person) rows from a .csv or .jsonl file; rows missing either come back separately as failures"""
+    leads, rejected = [], []
+    with open(path, newline="", encoding="utf-8") as f:
+        for line_number, row, error in do_read_rows(f, path.endswith(".jsonl")):
+            row = row or {}
+            lead = {field: str(row.get(field) or "").strip() for field in ("company", "person")}
+            missing = [field for field, value in lead.items() if not value]
+            if error is None and missing:
+                error = f"Missing {' and '.join(missing)}"
+            if error:
+                rejected.append({**lead, "line": line_number, "thread_id": None, "email_content": None,
+                                 "error": f"Line {line_number}: {error}", "seconds": 0.0})
+            else:
+                leads.append({**lead, "line": line_number})
+    return leads, rejected
+
+def do_build_lead_processor(graph, callbacks: list = None):
+    """Wrap the graph so each row runs on its own thread and reports its own timing"""
+
+    async def do_process_lead(lead: dict) -> dict:
+        config = {"configurable": {"thread_id": str(uuid.uuid4())}, "callbacks": callbacks or []}
+        started = time.perf_counter()
+        try:
+            result = await graph.ainvoke(
+                {"messages": [], "company_name": lead["company"], "person": lead["person"]},
+                config=config,
+            )
+            email_content, error = result.get("email_content"), None
+        except Exception as e:
+            email_content, error = None, f"{type(e).__name__}: {e}"
+
+        return {
+            "company": lead["company"],
+            "person": lead["person"],
+            "line": lead.get("line"),
+            "thread_id": config["configurable"]["thread_id"],
+            "email_content": email_content,
+            "error": error,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+
+    return RunnableLambda(do_process_lead)
+
+async def do_run_batch(input_path: str, output_path: str, max_concurrency: int = 16) -> list[dict]:
+    """Generate one email per lead with at most `max_concurrency` threads in flight"""
+    leads, rejected = do_load_leads(input_path)
+    print(f"📥 Loaded {len(leads)} leads from {input_path}")
+    for row in rejected:
+        print(f"⚠️ Skipping {row['error']}")
+
+    # Stop before the human approval step - the drafts are reviewed offline, and the
+    # paused threads are persisted so they can still be resumed for approval later
+    checkpointer = PooledSqliteSaver()
+    graph = do_build_async_graph(checkpointer=checkpointer, interrupt_before=["do_ask_for_approval"])
+    node_metrics = NodeMetrics()
+    processor = do_build_lead_processor(graph, callbacks=[node_metrics])
+
+    started = time.perf_counter()
+    results = await processor.abatch(leads, config={"max_concurrency": max_concurrency})
+    elapsed = time.perf_counter() - started
+    checkpointer.close()
+
+    # Rejected rows are reported with the per-row failures, in file order
+    results = sorted(results + rejected, key=lambda row: row["line"])
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        for row in results:
+            f.write(json.dumps(row) + "\n")
+
+    failed = sum(1 for row in results if row["error"])
+    print(f"✉️ Wrote {len(results) - failed} emails to {output_path} ({failed} failed)")
+    print(f"⏱️ {elapsed:.1f}s total, {len(leads) / elapsed if elapsed else 0:.2f} leads/sec")
+    print(f"🗄️ Enrichment cache: {llm_cache.stats()}")
+    do_print_node_summary(node_metrics.summary())
+
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write personalized emails for a file of leads")
+    parser.add_argument("input", help="CSV or JSONL file with 'company' and 'person' columns")
+    parser.add_argument("output", help="JSONL file to write the emails to")
+    parser.add_argument("--max-concurrency", type=int, default=16, help="Threads to run at once")
+    args = parser.parse_args()
+
+    asyncio.run(do_run_batch(args.input, args.output, args.max_concurrency))
@@ -0,0 +1,125 @@
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypedDict
+
+from langgraph.graph import StateGraph, MessagesState, START, END
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from sqlite_checkpointer import PooledSqliteSaver
+from delta_checkpointer import DeltaSqliteSaver
+
+# Checkpoints/sec for the stock single-connection SqliteSaver vs PooledSqliteSaver
+# at 1, 8 and 64 concurrent threads. No LLM calls - the graph only moves state
+# around, so the numbers are pure checkpointing overhead.
+# Also: checkpoint bytes written by a long chat thread with and without delta encoding.
+
+RUNS_PER_WORKER = 20
+
+class State(TypedDict):
+    count: int
+    notes: list[str]
+
+def do_step(state: State) -> State:
+    return {"count": state.get("count", 0) + 1, "notes": state.get("notes", []) + ["step"]}
+
+def do_build_bench_graph(checkpointer):
+    builder = StateGraph(State)
+    builder.add_node("step_1", do_step)
+    builder.add_node("step_2", do_step)
+    builder.add_node("step_3", do_step)
+    builder.add_edge(START, "step_1")
+    builder.add_edge("step_1", "step_2")
+    builder.add_edge("step_2", "step_3")
+    builder.add_edge("step_3", END)
+    return builder.compile(checkpointer=checkpointer)
+
+def do_run_worker(graph) -> None:
+    """One conversation thread: run the graph repeatedly and read its state back"""
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    for _ in range(RUNS_PER_WORKER):
+        graph.invoke({"count": 0, "notes": []}, config=config)
+        graph.get_state(config)
+
+def do_count_checkpoints(path: str) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+
+def do_close(checkpointer) -> None:
+    # The stock SqliteSaver has no close(); its connection is ours to close
+    if hasattr(checkpointer, "close"):
+        checkpointer.close()
+    else:
+        checkpointer.conn.close()
+
+def do_bench(name: str, make_checkpointer, threads: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        checkpointer = make_checkpointer(path)
+        graph = do_build_bench_graph(checkpointer)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda _: do_run_worker(graph), range(threads)))
+        elapsed = time.perf_counter() - started
+
+        do_close(checkpointer)
+        checkpoints = do_count_checkpoints(path)
+
+    return {"saver": name, "threads": threads, "checkpoints": checkpoints, "seconds": round(elapsed, 3),
+            "checkpoints_per_sec": round(checkpoints / elapsed, 1)}
+
+def do_build_chat_graph(checkpointer):
+    def do_reply(state: MessagesState):
+        return {"messages": [AIMessage(content=f"Reply number {len(state['messages'])}. " * 10)]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("reply", do_reply)
+    builder.add_edge(START, "reply")
+    builder.add_edge("reply", END)
+    return builder.compile(checkpointer=checkpointer)
+
+def do_bench_message_growth(name: str, make_checkpointer, turns: int = 200) -> dict:
+    """Run one long chat thread and measure the checkpoint bytes it wrote"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        checkpointer = make_checkpointer(path)
+        graph = do_build_chat_graph(checkpointer)
+        config = {"configurable": {"thread_id": "long-chat"}}
+
+        started = time.perf_counter()
+        for turn in range(turns):
+            graph.invoke({"messages": [HumanMessage(content=f"Question number {turn}. " * 10)]}, config=config)
+        elapsed = time.perf_counter() - started
+        messages = len(graph.get_state(config).values["messages"])
+
+        do_close(checkpointer)
+        with sqlite3.connect(path) as conn:
+            checkpoint_bytes = conn.execute("SELECT SUM(LENGTH(checkpoint)) FROM checkpoints").fetchone()[0]
+
+    return {"saver": name, "turns": turns, "messages": messages, "checkpoint_bytes": checkpoint_bytes,
+            "seconds": round(elapsed, 3)}
+
+if __name__ == "__main__":
+    savers = {
+        "SqliteSaver": lambda path: SqliteSaver(sqlite3.connect(path, check_same_thread=False)),
+        "PooledSqliteSaver": lambda path: PooledSqliteSaver(path, readers=8),
+    }
+
+    print(f"{'saver':<20}{'threads':>8}{'checkpoints':>13}{'seconds':>10}{'ckpt/sec':>11}")
+    for threads in (1, 8, 64):
+        for name, make_checkpointer in savers.items():
+            result = do_bench(name, make_checkpointer, threads)
+            print(f"{result['saver']:<20}{result['threads']:>8}{result['checkpoints']:>13}"
+                  f"{result['seconds']:>10}{result['checkpoints_per_sec']:>11}")
+
+    print(f"\n{'saver':<20}{'turns':>8}{'messages':>10}{'ckpt bytes':>14}{'seconds':>10}")
+    for name, make_checkpointer in {**savers, "DeltaSqliteSaver": lambda path: DeltaSqliteSaver(path)}.items():
+        result = do_bench_message_growth(name, make_checkpointer)
+        print(f"{result['saver']:<20}{result['turns']:>8}{result['messages']:>10}"
+              f"{result['checkpoint_bytes']:>14,}{result['seconds']:>10}")
@@ -0,0 +1,287 @@
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from importlib.metadata import version
+from typing import Any
+
+import langchain_openai
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.types import Command
+
+from graph_metrics import NodeMetrics
+from sqlite_checkpointer import PooledSqliteSaver
+
+# Offline benchmark for every studio graph plus the module-5 supervisor/swarm apps.
+# ChatOpenAI is swapped for ScriptedChatModel before each graph module is imported,
+# so no API key is needed and every run makes the same calls with the same fixed
+# latency. What is left is framework + checkpointer time, which is what we want
+# to compare across commits:
+#   python bench_graphs.py --output before.json
+#   python bench_graphs.py --output after.json --compare before.json
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+class ScriptedChatModel(BaseChatModel):
+    """Deterministic chat model: calls its bound tools `tool_rounds` times per turn, then replies"""
+
+    latency_ms: float = 0.0
+    tool_rounds: int = 1
+    reply: str = "This is a scripted reply."
+    bound_tools: list[dict] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.model_copy(update={"bound_tools": [convert_to_openai_tool(t)["function"] for t in tools]})
+
+    def with_structured_output(self, schema, **kwargs):
+        # Works for pydantic v2 models and the v1 ones from langchain_core.pydantic_v1
+        json_schema = schema.model_json_schema() if hasattr(schema, "model_json_schema") else schema.schema()
+
+        def do_fill_schema(_):
+            return schema(**{name: do_sample_value(field.get("type")) for name, field in json_schema["properties"].items()})
+        return RunnableLambda(do_fill_schema)
+
+    def _next_message(self, messages) -> AIMessage:
+        # Count the calls to our own tools since the last human turn
+        tool_names = [tool["name"] for tool in self.bound_tools]
+        calls = 0
+        for message in reversed(messages):
+            if isinstance(message, HumanMessage):
+                break
+            if isinstance(message, AIMessage):
+                calls += sum(1 for call in message.tool_calls if call["name"] in tool_names)
+
+        # Handoff tools only when there is nothing else to call, so agents never hand off back and forth
+        callable_tools = [t for t in self.bound_tools if not t["name"].startswith("transfer_")] or self.bound_tools
+        if tool_names and calls < self.tool_rounds:
+            tool = callable_tools[calls % len(callable_tools)]
+            args = {name: do_sample_value(field.get("type"))
+                    for name, field in tool.get("parameters", {}).get("properties", {}).items()}
+            return AIMessage(content="", tool_calls=[{"name": tool["name"], "args": args, "id": f"call_{len(messages)}_{calls}"}])
+        return AIMessage(content=self.reply)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency_ms / 1000)
+        return ChatResult(generations=[ChatGeneration(message=self._next_message(messages))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency_ms / 1000)
+        return ChatResult(generations=[ChatGeneration(message=self._next_message(messages))])
+
+def do_sample_value(json_type: str | None) -> Any:
+    """A fixed argument value for a JSON schema type"""
+    return {"integer": 2, "number": 2.0, "boolean": True, "array": [], "object": {}}.get(json_type, "sample")
+
+# name -> where the graph lives and how one benchmark thread drives it
+GRAPHS = {
+    "simple_graph": {"path": "module-1/studio/simple.py", "attr": "graph",
+                     "input": {"graph_state": "Hi, this is Lance."}},
+    "router": {"path": "module-1/studio/router.py", "attr": "graph",
+               "input": {"messages": [HumanMessage(content="Multiply 2 and 3")]}},
+    "agent": {"path": "module-1/studio/agent.py", "attr": "graph",
+              "input": {"messages": [HumanMessage(content="Add 3 and 4. Multiply the output by 2.")]}},
+    "chatbot": {"path": "module-2/studio/chatbot.py", "attr": "graph",
+                "input": {"messages": [HumanMessage(content="Hi! I'm Lance")]}},
+    "chatbot_sales": {"path": "module-2/studio/chatbot_sales.py", "attr": "graph",
+                      "input": {"messages": [HumanMessage(content="Project Apollo, budget $10k")]},
+                      "resume": "Project Apollo, budget $10k", "needs_checkpointer": True},
+    "chatbot_info_collect": {"path": "module-2/studio/chatbot_info_collect.py", "attr": "graph",
+                             "input": {"messages": [HumanMessage(content="I'm Jane Doe, flying to Paris on June 1st")]}},
+    "supervisor": {"path": "module-5/supervisor.py", "attr": "app",
+                   "input": {"messages": [HumanMessage(content="what's the combined headcount of the FAANG companies in 2024?")]}},
+    "swarm": {"path": "module-5/swarm.py", "attr": "app",
+              "input": {"messages": [HumanMessage(content="what's 5 + 7?")]}},
+}
+
+SAVERS = {
+    "none": lambda tmp: None,
+    "memory": lambda tmp: InMemorySaver(),
+    "sqlite": lambda tmp: PooledSqliteSaver(os.path.join(tmp, "bench.db")),
+}
+
+def do_load_graph(name: str, latency_ms: float, tool_rounds: int):
+    """Import a graph module with ChatOpenAI replaced by ScriptedChatModel"""
+    spec = GRAPHS[name]
+    path = os.path.join(ROOT, spec["path"])
+    module_dir = os.path.dirname(path)
+
+    def do_make_model(*args, **kwargs):
+        return ScriptedChatModel(latency_ms=latency_ms, tool_rounds=tool_rounds)
+
+    original = langchain_openai.ChatOpenAI
+    langchain_openai.ChatOpenAI = do_make_model
+    sys.path.insert(0, module_dir)
+    try:
+        module_spec = importlib.util.spec_from_file_location(f"bench_{name}", path)
+        module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(module_dir)
+        langchain_openai.ChatOpenAI = original
+    return getattr(module, spec["attr"])
+
+def do_run_thread(graph, spec: dict, max_resumes: int = 5, callbacks: list = None) -> list[float]:
+    """Run one thread to completion and return the latency of every step, in seconds"""
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}, "recursion_limit": 50, "callbacks": callbacks or []}
+    step_seconds = []
+    graph_input = spec["input"]
+    for _ in range(max_resumes + 1):
+        started = time.perf_counter()
+        for _ in graph.stream(graph_input, config=config, stream_mode="updates", subgraphs=True):
+            now = time.perf_counter()
+            step_seconds.append(now - started)
+            started = now
+        if graph.checkpointer is None or not graph.get_state(config).interrupts:
+            break
+        graph_input = Command(resume=spec.get("resume", "yes"))
+    return step_seconds
+
+def do_percentile(values: list[float], percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))]
+
+def do_bench_graph(name: str, saver: str, iterations: int, latency_ms: float, tool_rounds: int, nodes: bool = False) -> dict:
+    spec = GRAPHS[name]
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpointer = SAVERS[saver](tmp)
+        graph = do_load_graph(name, latency_ms, tool_rounds).builder.compile(checkpointer=checkpointer)
+
+        random.seed(0)
+        do_run_thread(graph, spec)  # Warm-up: lazy imports, tokenizer loading, table setup
+
+        step_seconds = []
+        started = time.perf_counter()
+        for _ in range(iterations):
+            step_seconds.extend(do_run_thread(graph, spec))
+        elapsed = time.perf_counter() - started
+
+        # Separate pass, tracemalloc slows everything down too much to time with it on
+        tracemalloc.start()
+        do_run_thread(graph, spec)
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        # And another one for the per-node breakdown, callbacks have their own overhead
+        node_summary = None
+        if nodes:
+            node_metrics = NodeMetrics(measure_state=True)
+            for _ in range(iterations):
+                do_run_thread(graph, spec, callbacks=[node_metrics])
+            node_summary = node_metrics.summary()
+
+        if checkpointer is not None and hasattr(checkpointer, "close"):
+            checkpointer.close()
+
+    result = {
+        "iterations": iterations,
+        "steps": len(step_seconds),
+        "seconds": round(elapsed, 4),
+        "steps_per_sec": round(len(step_seconds) / elapsed, 1),
+        "p50_step_ms": round(do_percentile(step_seconds, 50) * 1000, 3),
+        "p99_step_ms": round(do_percentile(step_seconds, 99) * 1000, 3),
+        "peak_memory_bytes": peak_bytes,
+    }
+    if node_summary is not None:
+        result["nodes"] = node_summary
+    return result
+
+def do_git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def do_run_benchmarks(names: list[str], iterations: int, latency_ms: float, tool_rounds: int, nodes: bool = False) -> dict:
+    report = {
+        "meta": {
+            "commit": do_git_commit(),
+            "python": platform.python_version(),
+            "langgraph": version("langgraph"),
+            "langchain_core": version("langchain-core"),
+            "iterations": iterations,
+            "latency_ms": latency_ms,
+            "tool_rounds": tool_rounds,
+        },
+        "graphs": {},
+    }
+
+    for name in names:
+        results = {}
+        for saver in SAVERS:
+            if saver == "none" and GRAPHS[name].get("needs_checkpointer"):
+                continue  # Can't resume its interrupts without one
+            try:
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    results[saver] = do_bench_graph(name, saver, iterations, latency_ms, tool_rounds, nodes)
+            except Exception as e:
+                results[saver] = {"error": f"{type(e).__name__}: {e}"}
+
+        # Checkpoint overhead: extra time per step compared to the cheapest baseline that ran
+        baseline = next((results[s] for s in ("none", "memory") if "p50_step_ms" in results.get(s, {})), None)
+        for saver, result in results.items():
+            if baseline is not None and "p50_step_ms" in result:
+                result["checkpoint_overhead_ms"] = round(
+                    result["seconds"] / result["steps"] * 1000 - baseline["seconds"] / baseline["steps"] * 1000, 3)
+        report["graphs"][name] = results
+    return report
+
+def do_print_report(report: dict, previous: dict = None) -> None:
+    print(f"{'graph':<22}{'saver':<8}{'steps':>7}{'steps/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'ckpt ms':>9}{'peak KB':>10}"
+          + (f"{'Δ steps/s':>12}" if previous else ""))
+    for name, results in report["graphs"].items():
+        for saver, result in results.items():
+            if "error" in result:
+                print(f"{name:<22}{saver:<8}  ❌ {result['error']}")
+                continue
+            line = (f"{name:<22}{saver:<8}{result['steps']:>7}{result['steps_per_sec']:>10}{result['p50_step_ms']:>9}"
+                    f"{result['p99_step_ms']:>9}{result.get('checkpoint_overhead_ms', ''):>9}{result['peak_memory_bytes'] // 1024:>10}")
+            if previous:
+                old = previous["graphs"].get(name, {}).get(saver, {})
+                if "steps_per_sec" in old:
+                    change = (result["steps_per_sec"] - old["steps_per_sec"]) / old["steps_per_sec"] * 100
+                    line += f"{change:>+11.1f}%"
+            print(line)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the studio graphs offline with a scripted chat model")
+    parser.add_argument("graphs", nargs="*", default=list(GRAPHS), help=f"Graphs to run (default: all of {', '.join(GRAPHS)})")
+    parser.add_argument("--iterations", type=int, default=20, help="Threads to run per graph and checkpointer")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated latency of every model call")
+    parser.add_argument("--tool-rounds", type=int, default=1, help="Tool calls the model makes per turn before replying")
+    parser.add_argument("--nodes", action="store_true", help="Also record per-node timings (see graph_metrics.py)")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Earlier JSON report to compare steps/sec against")
+    args = parser.parse_args()
+
+    report = do_run_benchmarks(args.graphs, args.iterations, args.latency_ms, args.tool_rounds, args.nodes)
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        if previous["meta"].get("latency_ms") != args.latency_ms:
+            print(f"⚠️ {args.compare} was recorded with --latency-ms {previous['meta'].get('latency_ms')}")
+    do_print_report(report, previous)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report written to {args.output}")
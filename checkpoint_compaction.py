@@ -0,0 +1,158 @@
+import argparse
+import os
+import sqlite3
+import threading
+import time
+
+# Retention and compaction for sqlite checkpoint databases (SqliteSaver / PooledSqliteSaver).
+# Long-lived threads get one checkpoint per super-step forever. This keeps the
+# newest `keep_latest` checkpoints per thread and/or those younger than
+# `max_age_seconds`, drops the writes of deleted checkpoints and vacuums the file.
+# The newest checkpoint of every thread is always kept, so no thread loses its state,
+# and so are the parents that delta-encoded checkpoints are rebuilt from.
+
+# 100-ns intervals between the UUID epoch (1582-10-15) and the Unix epoch
+_UUID_EPOCH_OFFSET = 0x01B21DD213814000
+
+def do_checkpoint_timestamp(checkpoint_id: str) -> float:
+    """Unix time encoded in a checkpoint id (LangGraph uses time-ordered UUIDv6 ids)"""
+    hex_id = checkpoint_id.replace("-", "")
+    timestamp = (int(hex_id[0:12], 16) << 12) | int(hex_id[13:16], 16)
+    return (timestamp - _UUID_EPOCH_OFFSET) / 1e7
+
+def do_database_size(path: str) -> int:
+    """Size of the database file plus its WAL, in bytes"""
+    return sum(os.path.getsize(p) for p in (path, f"{path}-wal") if os.path.exists(p))
+
+def do_select_expired_checkpoints(conn: sqlite3.Connection, keep_latest: int = None, max_age_seconds: float = None) -> list[tuple]:
+    """Return (thread_id, checkpoint_ns, checkpoint_id) of checkpoints outside the retention policy"""
+    rows = conn.execute(
+        """
+        SELECT thread_id, checkpoint_ns, checkpoint_id,
+               ROW_NUMBER() OVER (PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC) AS rank
+        FROM checkpoints
+        """
+    ).fetchall()
+
+    cutoff = time.time() - max_age_seconds if max_age_seconds is not None else None
+    expired = []
+    for thread_id, checkpoint_ns, checkpoint_id, rank in rows:
+        if rank == 1:
+            continue  # Always keep the current state of the thread
+        # A checkpoint is kept if any configured rule keeps it
+        kept_by_count = keep_latest is not None and rank <= keep_latest
+        kept_by_age = cutoff is not None and do_checkpoint_timestamp(checkpoint_id) >= cutoff
+        if not kept_by_count and not kept_by_age:
+            expired.append((thread_id, checkpoint_ns, checkpoint_id))
+
+    # Delta-encoded checkpoints (DeltaSqliteSaver) need their parents back to the last snapshot
+    has_deltas = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'checkpoint_deltas'").fetchone()
+    if has_deltas and expired:
+        delta_parents = {
+            (thread_id, checkpoint_ns, checkpoint_id): (thread_id, checkpoint_ns, parent_id)
+            for thread_id, checkpoint_ns, checkpoint_id, parent_id in conn.execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id FROM checkpoint_deltas"
+            )
+        }
+        expired_set = set(expired)
+        for thread_id, checkpoint_ns, checkpoint_id, _ in rows:
+            key = (thread_id, checkpoint_ns, checkpoint_id)
+            if key in expired_set:
+                continue
+            while key in delta_parents:
+                key = delta_parents[key]
+                expired_set.discard(key)
+        expired = [key for key in expired if key in expired_set]
+    return expired
+
+def do_compact_checkpoints(path: str, keep_latest: int = None, max_age_seconds: float = None, vacuum: bool = True) -> dict:
+    """Apply the retention policy to the database at `path` and report what was reclaimed"""
+    if keep_latest is None and max_age_seconds is None:
+        raise ValueError("Set keep_latest and/or max_age_seconds")
+
+    size_before = do_database_size(path)
+    started = time.perf_counter()
+
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        expired = do_select_expired_checkpoints(conn, keep_latest, max_age_seconds)
+        with conn:
+            conn.executemany(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                expired,
+            )
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'checkpoint_deltas'").fetchone():
+                conn.executemany(
+                    "DELETE FROM checkpoint_deltas WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    expired,
+                )
+            deleted_writes = conn.execute(
+                """
+                DELETE FROM writes WHERE NOT EXISTS (
+                    SELECT 1 FROM checkpoints c
+                    WHERE c.thread_id = writes.thread_id
+                      AND c.checkpoint_ns = writes.checkpoint_ns
+                      AND c.checkpoint_id = writes.checkpoint_id
+                )
+                """
+            ).rowcount
+
+        if vacuum:
+            conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+
+    size_after = do_database_size(path)
+    return {
+        "deleted_checkpoints": len(expired),
+        "deleted_writes": deleted_writes,
+        "bytes_before": size_before,
+        "bytes_after": size_after,
+        "bytes_reclaimed": size_before - size_after,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+class CompactionJob:
+    """Run do_compact_checkpoints every `interval_seconds` on a background thread"""
+
+    def __init__(self, path: str, interval_seconds: float = 3600, keep_latest: int = None, max_age_seconds: float = None, vacuum: bool = True):
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self.policy = {"keep_latest": keep_latest, "max_age_seconds": max_age_seconds, "vacuum": vacuum}
+        self.last_report = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="checkpoint-compaction", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.last_report = do_compact_checkpoints(self.path, **self.policy)
+                print(f"🧹 Checkpoint compaction: {self.last_report}")
+            except Exception as e:
+                print(f"❌ Checkpoint compaction failed: {e}")
+            self._stop.wait(self.interval_seconds)
+
+    def start(self) -> "CompactionJob":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compact a sqlite checkpoint database")
+    parser.add_argument("path", help="Checkpoint database, e.g. module-2/state_db/example.db")
+    parser.add_argument("--keep-latest", type=int, help="Checkpoints to keep per thread")
+    parser.add_argument("--max-age-days", type=float, help="Keep checkpoints younger than this")
+    parser.add_argument("--no-vacuum", action="store_true", help="Skip VACUUM after deleting")
+    args = parser.parse_args()
+
+    report = do_compact_checkpoints(
+        args.path,
+        keep_latest=args.keep_latest,
+        max_age_seconds=args.max_age_days * 24 * 3600 if args.max_age_days is not None else None,
+        vacuum=not args.no_vacuum,
+    )
+    print(f"🧹 Reclaimed {report['bytes_reclaimed']:,} bytes: {report}")
@@ -0,0 +1,180 @@
+import threading
+from collections import OrderedDict
+
+from sqlite_checkpointer import DEFAULT_DB_PATH, PooledSqliteSaver
+
+# Delta-encoded message storage for MessagesState graphs.
+# A plain checkpointer stores the full message list in every checkpoint, so a
+# long thread writes O(n^2) message bytes over its life. DeltaSqliteSaver stores
+# only the messages added/changed and the ids removed relative to the parent
+# checkpoint, plus a full snapshot every `snapshot_every` steps so rebuilding a
+# list never replays more than that many deltas. Lists are rebuilt when a
+# checkpoint is read, and recently rebuilt lists are kept in an LRU cache.
+
+DELTA_KEY = "__messages_delta__"
+
+def do_diff_messages(parent: list, messages: list) -> dict | None:
+    """Describe `messages` relative to `parent`, or None if it can't be expressed as a delta"""
+    if any(m.id is None for m in parent) or any(m.id is None for m in messages):
+        return None
+
+    parent_by_id = {m.id: m for m in parent}
+    message_ids = {m.id for m in messages}
+    removed = [m.id for m in parent if m.id not in message_ids]
+    upserted = [m for m in messages if m.id not in parent_by_id or (parent_by_id[m.id] is not m and parent_by_id[m.id] != m)]
+
+    # add_messages only replaces in place and appends; anything else is stored as a snapshot
+    rebuilt = do_apply_delta(parent, removed, upserted)
+    if [m.id for m in rebuilt] != [m.id for m in messages]:
+        return None
+    return {"removed": removed, "upserted": upserted}
+
+def do_apply_delta(parent: list, removed: list, upserted: list) -> list:
+    """Rebuild a message list from its parent's list and a delta"""
+    removed_ids = set(removed)
+    updates = {m.id: m for m in upserted}
+    rebuilt = []
+    for message in parent:
+        if message.id in removed_ids:
+            continue
+        rebuilt.append(updates.pop(message.id, message))
+    rebuilt.extend(m for m in upserted if m.id in updates)
+    return rebuilt
+
+def do_is_delta(value) -> bool:
+    return isinstance(value, dict) and DELTA_KEY in value
+
+class DeltaSqliteSaver(PooledSqliteSaver):
+    """PooledSqliteSaver that stores the messages channel as deltas between checkpoints"""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, *, snapshot_every: int = 20, channel: str = "messages",
+                 cache_size: int = 256, readers: int = 4, serde=None):
+        super().__init__(path, readers=readers, serde=serde)
+        self.snapshot_every = snapshot_every
+        self.channel = channel
+        self.cache_size = cache_size
+        self.message_cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+
+    def setup(self) -> None:
+        if self.is_setup:
+            return
+        super().setup()
+        # Parent links of delta-encoded checkpoints, so compaction keeps their chains intact
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoint_deltas (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_id TEXT NOT NULL,
+                parent_checkpoint_id TEXT NOT NULL,
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+            )
+            """
+        )
+        self.conn.commit()
+
+    def _remember(self, key: tuple, messages: list, depth: int) -> None:
+        with self.cache_lock:
+            self.message_cache[key] = (messages, depth)
+            self.message_cache.move_to_end(key)
+            while len(self.message_cache) > self.cache_size:
+                self.message_cache.popitem(last=False)
+
+    def _load_messages(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str):
+        """Return (messages, depth since snapshot) for a stored checkpoint, or None"""
+        key = (thread_id, checkpoint_ns, checkpoint_id)
+        with self.cache_lock:
+            if key in self.message_cache:
+                self.message_cache.move_to_end(key)
+                return self.message_cache[key]
+
+        with self.cursor(transaction=False) as cur:
+            row = cur.execute(
+                "SELECT type, checkpoint FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                key,
+            ).fetchone()
+        if row is None:
+            return None
+
+        value = self.serde.loads_typed(row)["channel_values"].get(self.channel)
+        if value is None:
+            return None
+        if do_is_delta(value):
+            loaded = self._rebuild(thread_id, checkpoint_ns, value[DELTA_KEY])
+        else:
+            loaded = (value, 0)
+        self._remember(key, *loaded)
+        return loaded
+
+    def _rebuild(self, thread_id: str, checkpoint_ns: str, delta: dict):
+        parent = self._load_messages(thread_id, checkpoint_ns, delta["parent"])
+        if parent is None:
+            raise ValueError(f"Missing parent checkpoint {delta['parent']} needed to rebuild messages of thread {thread_id}")
+        return do_apply_delta(parent[0], delta["removed"], delta["upserted"]), delta["depth"]
+
+    def _expand(self, checkpoint_tuple):
+        """Replace a stored delta in a checkpoint tuple with the full message list"""
+        if checkpoint_tuple is None:
+            return None
+        value = checkpoint_tuple.checkpoint["channel_values"].get(self.channel)
+        if not do_is_delta(value):
+            return checkpoint_tuple
+
+        configurable = checkpoint_tuple.config["configurable"]
+        key = (str(configurable["thread_id"]), configurable.get("checkpoint_ns", ""), configurable["checkpoint_id"])
+        messages, depth = self._rebuild(key[0], key[1], value[DELTA_KEY])
+        self._remember(key, messages, depth)
+
+        checkpoint = {
+            **checkpoint_tuple.checkpoint,
+            "channel_values": {**checkpoint_tuple.checkpoint["channel_values"], self.channel: list(messages)},
+        }
+        return checkpoint_tuple._replace(checkpoint=checkpoint)
+
+    def get_tuple(self, config):
+        return self._expand(super().get_tuple(config))
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        # Materialize first so the reader connection is released before rebuilding
+        checkpoint_tuples = list(super().list(config, filter=filter, before=before, limit=limit))
+        for checkpoint_tuple in checkpoint_tuples:
+            yield self._expand(checkpoint_tuple)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        parent_id = config["configurable"].get("checkpoint_id")
+        messages = checkpoint["channel_values"].get(self.channel)
+
+        stored, depth = checkpoint, 0
+        if isinstance(messages, list) and parent_id:
+            parent = self._load_messages(thread_id, checkpoint_ns, parent_id)
+            if parent is not None and parent[1] + 1 < self.snapshot_every:
+                delta = do_diff_messages(parent[0], messages)
+                if delta is not None:
+                    depth = parent[1] + 1
+                    delta_value = {DELTA_KEY: {"parent": parent_id, "depth": depth, **delta}}
+                    stored = {**checkpoint, "channel_values": {**checkpoint["channel_values"], self.channel: delta_value}}
+
+        # The parent link and the checkpoint are committed together
+        with self.write_batch():
+            if stored is not checkpoint:
+                with self.cursor() as cur:
+                    cur.execute(
+                        "INSERT OR REPLACE INTO checkpoint_deltas (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id) VALUES (?, ?, ?, ?)",
+                        (thread_id, checkpoint_ns, checkpoint["id"], parent_id),
+                    )
+            next_config = super().put(config, stored, metadata, new_versions)
+        if isinstance(messages, list):
+            self._remember((thread_id, checkpoint_ns, checkpoint["id"]), list(messages), depth)
+        return next_config
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self.write_batch():
+            with self.cursor() as cur:
+                cur.execute("DELETE FROM checkpoint_deltas WHERE thread_id = ?", (str(thread_id),))
+            super().delete_thread(thread_id)
+        with self.cache_lock:
+            for key in [key for key in self.message_cache if key[0] == str(thread_id)]:
+                del self.message_cache[key]
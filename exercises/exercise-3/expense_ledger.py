@@ -0,0 +1,214 @@
+import os
+import sqlite3
+import threading
+from datetime import date
+
+import numpy as np
+
+# Expense ledger for the finance agent's tools.
+# Expenses are written to sqlite and mirrored in memory per user as columns
+# (NumPy arrays of amounts, days and category codes), so the tools never walk
+# the expense list:
+#   - per-category and overall totals are running sums, updated by `add`
+#   - date-range queries binary-search a date index and sum a slice
+#
+#   ledger = ExpenseLedger()
+#   ledger.add("alice", 45.0, "food", "groceries")
+#   ledger.category_total("alice", "food")
+#   ledger.totals_by_category("alice", start="2025-01-01", end="2025-01-31")
+#
+# Amounts are kept in integer cents so the running sums don't drift. Before
+# answering, a user's in-memory copy is checked against the newest expense id in
+# sqlite, and expenses added by other processes are pulled in.
+
+DEFAULT_LEDGER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "expense_ledger.db")
+
+def do_to_cents(amount: float) -> int:
+    return int(round(amount * 100))
+
+def do_to_day(value) -> int:
+    """Day number of a date or "YYYY-MM-DD" string"""
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal()
+
+class _UserLedger:
+    """One user's expenses as columns, plus running totals and a date index"""
+
+    def __init__(self):
+        self.size = 0
+        # Newest expenses.id included, to spot rows added by other processes
+        self.max_id = 0
+        self.cents = np.zeros(0, dtype=np.int64)
+        self.days = np.zeros(0, dtype=np.int32)
+        self.categories = np.zeros(0, dtype=np.int32)
+        self.descriptions = []
+        self.category_codes = {}
+        self.category_names = []
+        self.category_cents = []
+        self.total_cents = 0
+        # Row numbers sorted by day, and their days, for range queries
+        self.by_date = np.zeros(0, dtype=np.int64)
+        self.sorted_days = np.zeros(0, dtype=np.int32)
+
+    def do_code(self, category: str) -> int:
+        code = self.category_codes.get(category)
+        if code is None:
+            code = self.category_codes[category] = len(self.category_names)
+            self.category_names.append(category)
+            self.category_cents.append(0)
+        return code
+
+    def do_reserve(self, size: int) -> None:
+        if size <= len(self.cents):
+            return
+        capacity = max(256, 2 * len(self.cents), size)
+        for column in ("cents", "days", "categories", "by_date", "sorted_days"):
+            setattr(self, column, np.resize(getattr(self, column), capacity))
+
+    def load(self, rows: list[tuple]) -> None:
+        """Bulk-load (id, cents, day, category, description) rows already sorted by day"""
+        self.do_reserve(len(rows))
+        n = len(rows)
+        self.max_id = max((row[0] for row in rows), default=0)
+        self.cents[:n] = [row[1] for row in rows]
+        self.days[:n] = [row[2] for row in rows]
+        self.categories[:n] = [self.do_code(row[3]) for row in rows]
+        self.descriptions = [row[4] for row in rows]
+        self.by_date[:n] = np.arange(n)
+        self.sorted_days[:n] = self.days[:n]
+        self.size = n
+        sums = np.bincount(self.categories[:n], weights=self.cents[:n], minlength=len(self.category_names))
+        self.category_cents = [int(c) for c in sums]
+        self.total_cents = int(self.cents[:n].sum())
+
+    def add(self, expense_id: int, cents: int, day: int, category: str, description: str) -> None:
+        self.max_id = max(self.max_id, expense_id)
+        self.do_reserve(self.size + 1)
+        row = self.size
+        code = self.do_code(category)
+        self.cents[row] = cents
+        self.days[row] = day
+        self.categories[row] = code
+        self.descriptions.append(description)
+        self.category_cents[code] += cents
+        self.total_cents += cents
+
+        # Expenses usually arrive in date order, so this is an append; back-dated ones shift the tail
+        position = row
+        if row and day < self.sorted_days[row - 1]:
+            position = int(np.searchsorted(self.sorted_days[:row], day, side="right"))
+            self.by_date[position + 1:row + 1] = self.by_date[position:row].copy()
+            self.sorted_days[position + 1:row + 1] = self.sorted_days[position:row].copy()
+        self.by_date[position] = row
+        self.sorted_days[position] = day
+        self.size += 1
+
+    def rows_between(self, start: int = None, end: int = None) -> np.ndarray:
+        """Rows dated from `start` to `end`, both included"""
+        days = self.sorted_days[:self.size]
+        lo = 0 if start is None else int(np.searchsorted(days, start, side="left"))
+        hi = self.size if end is None else int(np.searchsorted(days, end, side="right"))
+        return self.by_date[lo:hi]
+
+class ExpenseLedger:
+    """Expenses of every user in sqlite, with an in-memory columnar copy of each user's ledger"""
+
+    def __init__(self, path: str = DEFAULT_LEDGER_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.lock = threading.Lock()
+        self.users = {}
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS expenses (
+                id INTEGER PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                day INTEGER NOT NULL,
+                cents INTEGER NOT NULL,
+                category TEXT NOT NULL,
+                description TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS expenses_user_day ON expenses (user_id, day);
+            CREATE INDEX IF NOT EXISTS expenses_user_id ON expenses (user_id, id);
+            """
+        )
+
+    def do_user(self, user_id: str) -> _UserLedger:
+        """The user's ledger, read from disk the first time and brought up to date on every use"""
+        ledger = self.users.get(user_id)
+        if ledger is None:
+            ledger = self.users[user_id] = _UserLedger()
+            ledger.load(self.conn.execute(
+                "SELECT id, cents, day, category, description FROM expenses WHERE user_id = ? ORDER BY day, id", (user_id,)
+            ).fetchall())
+            return ledger
+
+        # Expenses are only ever added, so a newer id means rows from another process (or our own add)
+        max_id = self.conn.execute("SELECT MAX(id) FROM expenses WHERE user_id = ?", (user_id,)).fetchone()[0] or 0
+        if max_id != ledger.max_id:
+            for row in self.conn.execute(
+                "SELECT id, cents, day, category, description FROM expenses WHERE user_id = ? AND id > ? ORDER BY id",
+                (user_id, ledger.max_id),
+            ).fetchall():
+                ledger.add(*row)
+        return ledger
+
+    def add(self, user_id: str, amount: float, category: str, description: str, when=None) -> None:
+        cents = do_to_cents(amount)
+        day = do_to_day(when or date.today())
+        category = category.lower()
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO expenses (user_id, day, cents, category, description) VALUES (?, ?, ?, ?, ?)",
+                (user_id, day, cents, category, description),
+            )
+            self.conn.commit()
+            # Picks up the new row, and any other process added before it
+            self.do_user(user_id)
+
+    def category_total(self, user_id: str, category: str) -> float:
+        with self.lock:
+            ledger = self.do_user(user_id)
+            code = ledger.category_codes.get(category.lower())
+            return ledger.category_cents[code] / 100 if code is not None else 0.0
+
+    def total(self, user_id: str, start=None, end=None) -> float:
+        with self.lock:
+            ledger = self.do_user(user_id)
+            if start is None and end is None:
+                return ledger.total_cents / 100
+            rows = ledger.rows_between(do_to_day(start) if start else None, do_to_day(end) if end else None)
+            return int(ledger.cents[rows].sum()) / 100
+
+    def totals_by_category(self, user_id: str, start=None, end=None) -> dict[str, float]:
+        with self.lock:
+            ledger = self.do_user(user_id)
+            if start is None and end is None:
+                cents = ledger.category_cents
+            else:
+                rows = ledger.rows_between(do_to_day(start) if start else None, do_to_day(end) if end else None)
+                cents = np.bincount(ledger.categories[rows], weights=ledger.cents[rows],
+                                    minlength=len(ledger.category_names)).astype(np.int64).tolist()
+            return {name: c / 100 for name, c in zip(ledger.category_names, cents) if c}
+
+    def count(self, user_id: str) -> int:
+        with self.lock:
+            return self.do_user(user_id).size
+
+    def expenses(self, user_id: str, start=None, end=None) -> list[dict]:
+        """Expenses in the date range, oldest first"""
+        with self.lock:
+            ledger = self.do_user(user_id)
+            rows = ledger.rows_between(do_to_day(start) if start else None, do_to_day(end) if end else None)
+            return [
+                {
+                    "amount": int(ledger.cents[row]) / 100,
+                    "category": ledger.category_names[ledger.categories[row]],
+                    "description": ledger.descriptions[row],
+                    "date": date.fromordinal(int(ledger.days[row])).isoformat(),
+                }
+                for row in rows.tolist()
+            ]
@@ -1,87 +1,131 @@
 import os
 import getpass
+import uuid
 from datetime import datetime
 from langchain_openai import ChatOpenAI
 from langgraph.graph import MessagesState, START, StateGraph
-from langgraph.prebuilt import tools_condition, ToolNode
+from langgraph.prebuilt import tools_condition
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.config import get_config
 from langchain_core.messages import HumanMessage, SystemMessage
 from dotenv import load_dotenv
 from rich import print
 
+from message_trimming import trim_for_model, trimming_stats
+from parallel_tools import create_parallel_tool_node
+from memory_store import SqliteMemoryStore
+from expense_ledger import ExpenseLedger
+
 # Load environment variables
 load_dotenv('.env')
 
 openai_api_key = os.getenv("OPENAI_API_KEY")
 llm = ChatOpenAI(model="gpt-3.5-turbo", api_key=openai_api_key)
 
-# In-memory storage
-finance_data = {
-    "expenses": [],
-    "budgets": {}
-}
+# Long-term storage: kept across restarts and shared by all threads of a user.
+# Each user gets their own namespaces, picked by `user_id` in the run's config.
+store = SqliteMemoryStore()
+
+# Expenses with running per-category totals and a date index, so tool calls don't scan them
+ledger = ExpenseLedger()
+
+# How many stored memories are added to the prompt each turn, and how close they must be
+TOP_K_MEMORIES = 5
+MIN_MEMORY_SCORE = 0.2
+
+def current_user_id() -> str:
+    return str(get_config()["configurable"].get("user_id", "default"))
+
+def user_namespace(*path: str) -> tuple:
+    """Namespace of the current user"""
+    return ("finance", current_user_id(), *path)
 
 def add_expense(amount: float, category: str, description: str) -> str:
     """Add an expense to the tracker."""
-    expense = {
-        "amount": amount,
-        "category": category.lower(),
-        "description": description,
-        "date": datetime.now().strftime("%Y-%m-%d")
-    }
-    finance_data["expenses"].append(expense)
+    date = datetime.now().strftime("%Y-%m-%d")
+    ledger.add(current_user_id(), amount, category, description, date)
+    # Also kept as a memory, so later turns can recall what the money was spent on
+    memory = {"content": f"Spent ${amount:.2f} on {description} ({category.lower()}) on {date}"}
+    store.put(user_namespace("expenses"), uuid.uuid4().hex, memory)
     return f"Added expense: ${amount:.2f} for {description} in {category} category"
 
 def calculate_budget_remaining(category: str) -> str:
     """Calculate remaining budget for a category."""
     category = category.lower()
-    
-    if category not in finance_data["budgets"]:
+
+    budget = store.get(user_namespace("budgets"), category)
+    if budget is None:
         return f"No budget set for {category} category."
-    
-    budget = finance_data["budgets"][category]
-    spent = sum(exp["amount"] for exp in finance_data["expenses"] if exp["category"] == category)
-    remaining = budget - spent
-    
-    return f"Budget: ${budget:.2f}, Spent: ${spent:.2f}, Remaining: ${remaining:.2f}"
 
-def get_spending_summary() -> str:
-    """Get spending summary."""
-    if not finance_data["expenses"]:
+    spent = ledger.category_total(current_user_id(), category)
+    remaining = budget.value["amount"] - spent
+
+    return f"Budget: ${budget.value['amount']:.2f}, Spent: ${spent:.2f}, Remaining: ${remaining:.2f}"
+
+def get_spending_summary(start_date: str = "", end_date: str = "") -> str:
+    """Get spending summary, optionally for a period. Dates are YYYY-MM-DD and both are included."""
+    by_category = ledger.totals_by_category(current_user_id(), start_date or None, end_date or None)
+    if not by_category:
         return "No expenses recorded"
-    
-    total = sum(exp["amount"] for exp in finance_data["expenses"])
-    return f"Total spent: ${total:.2f}"
+
+    total = sum(by_category.values())
+    breakdown = ", ".join(f"{category}: ${spent:.2f}" for category, spent in sorted(by_category.items()))
+    return f"Total spent: ${total:.2f} ({breakdown})"
 
 def set_budget(category: str, amount: float) -> str:
     """Set budget for a category."""
-    finance_data["budgets"][category.lower()] = amount
+    store.put(user_namespace("budgets"), category.lower(), {"amount": amount}, index=False)
     return f"Set budget for {category}: ${amount:.2f}"
 
+def remember(fact: str) -> str:
+    """Save a fact about the user's finances (income, goals, recurring bills, preferences) for future conversations."""
+    store.put(user_namespace("memories"), uuid.uuid4().hex, {"content": fact})
+    return f"Remembered: {fact}"
+
+def recall_memories(query: str) -> list[str]:
+    """The user's stored facts and expenses closest to `query`"""
+    items = store.search(user_namespace(), query=query, limit=TOP_K_MEMORIES)
+    return [item.value["content"] for item in items if item.score >= MIN_MEMORY_SCORE]
+
 # Tools and agent setup
-tools = [add_expense, calculate_budget_remaining, get_spending_summary, set_budget]
+tools = [add_expense, calculate_budget_remaining, get_spending_summary, set_budget, remember]
 llm = ChatOpenAI(model="gpt-4o")
 llm_with_tools = llm.bind_tools(tools)
 
 sys_msg = SystemMessage(content="You are a personal finance assistant. Help track expenses and budgets.")
 
+# Prompt budget for the history sent to the model on each turn
+MAX_PROMPT_TOKENS = 4000
+
+# Tool calls of one turn (e.g. several add_expense calls) run concurrently, each with its own timeout
+MAX_TOOL_WORKERS = 8
+TOOL_TIMEOUT_SECONDS = 10.0
+
 def assistant(state: MessagesState):
-    return {"messages": [llm_with_tools.invoke([sys_msg] + state["messages"])]}
+    # Retrieve what is relevant to this turn instead of carrying it all in the history
+    last_human = next((m for m in reversed(state["messages"]) if isinstance(m, HumanMessage)), None)
+    memories = recall_memories(last_human.content) if last_human is not None else []
+    system = sys_msg
+    if memories:
+        system = SystemMessage(content=sys_msg.content + "\n\nWhat you know about this user:\n" + "\n".join(f"- {m}" for m in memories))
+
+    messages = trim_for_model([system] + state["messages"], max_tokens=MAX_PROMPT_TOKENS)
+    return {"messages": [llm_with_tools.invoke(messages)]}
 
 # Build graph
 builder = StateGraph(MessagesState)
 builder.add_node("assistant", assistant)
-builder.add_node("tools", ToolNode(tools))
+builder.add_node("tools", create_parallel_tool_node(tools, max_workers=MAX_TOOL_WORKERS, timeout_seconds=TOOL_TIMEOUT_SECONDS))
 builder.add_edge(START, "assistant")
 builder.add_conditional_edges("assistant", tools_condition)
 builder.add_edge("tools", "assistant")
 
 # Compile with memory
 memory = MemorySaver()
-finance_agent = builder.compile(checkpointer=memory)
+finance_agent = builder.compile(checkpointer=memory, store=store)
 
 if __name__ == "__main__":
-    config = {"configurable": {"thread_id": 1}}
+    config = {"configurable": {"thread_id": 1, "user_id": "demo"}}
     
     # Demo showing memory functionality
     print("🏦 Finance Agent Demo")
@@ -101,4 +145,11 @@ if __name__ == "__main__":
     print(f"User: Check remaining budget after that expense")
     print(f"Agent: {result['messages'][-1].content}") 
 
-    print(finance_data)
\ No newline at end of file
+    # Long-term memory test - a new thread of the same user still knows the budget and expenses
+    new_thread = {"configurable": {"thread_id": 2, "user_id": "demo"}}
+    result = finance_agent.invoke({"messages": [HumanMessage("How much have I spent on food so far?")]}, new_thread)
+    print(f"User (new thread): How much have I spent on food so far?")
+    print(f"Agent: {result['messages'][-1].content}")
+
+    print(store.search(("finance", "demo")))
+    print(trimming_stats)
\ No newline at end of file
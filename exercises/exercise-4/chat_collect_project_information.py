@@ -211,13 +211,14 @@ def do_validate_approval(state: State) -> State:
     else:
         return {"messages": [AIMessage(content="Email needs revision. Let me rewrite it...")]}
 
-def do_should_continue_collection(state: State) -> Literal["do_ask_for_company_and_person", "do_get_linkedin_data"]:
+def do_should_continue_collection(state: State) -> Literal["do_ask_for_company_and_person"] | list[str]:
     """Decide whether to continue asking for company/person or move to next step"""
     company_name = state.get("company_name")
     person = state.get("person")
     
     if company_name and person:
-        return "do_get_linkedin_data"
+        # LinkedIn and website lookups don't depend on each other, so fan out and run them in parallel
+        return ["do_get_linkedin_data", "do_get_company_website"]
     else:
         return "do_ask_for_company_and_person"
 
@@ -254,9 +255,13 @@ def do_run_interactive_graph():
     
     # Add edges
     builder.add_edge("do_ask_for_company_and_person", "do_validate_company_and_person")
-    builder.add_conditional_edges("do_validate_company_and_person", do_should_continue_collection)
-    builder.add_edge("do_get_linkedin_data", "do_get_company_website")
-    builder.add_edge("do_get_company_website", "do_write_personalized_email")
+    builder.add_conditional_edges(
+        "do_validate_company_and_person",
+        do_should_continue_collection,
+        ["do_ask_for_company_and_person", "do_get_linkedin_data", "do_get_company_website"]
+    )
+    # Wait for both enrichment branches before writing the email
+    builder.add_edge(["do_get_linkedin_data", "do_get_company_website"], "do_write_personalized_email")
     builder.add_edge("do_write_personalized_email", "do_ask_for_approval")
     builder.add_edge("do_ask_for_approval", "do_validate_approval")
     builder.add_conditional_edges("do_validate_approval", do_should_continue_approval)
@@ -5,10 +5,18 @@ from langgraph.prebuilt import create_react_agent
 
 from rich import print
 
+from tool_cache import memoize_tool, ToolResultStore, tool_cache_stats
+from fast_path_router import FastPathRouter, do_build_fast_path_graph
+
 model = ChatOpenAI(model="gpt-4o")
 
 # Create specialized agents
 
+# The travel tools are pure, so their results are cached, and shared with other
+# processes through the default sqlite store (tool_cache.db, next to tool_cache.py at the repo root)
+tool_store = ToolResultStore()
+
+@memoize_tool(store=tool_store)
 def calculate_trip_cost(destination: str, days: int, people: int) -> str:
     """Calculate estimated travel costs for a trip."""
     daily_cost = 120  # Cost per person per day
@@ -23,6 +31,7 @@ def calculate_trip_cost(destination: str, days: int, people: int) -> str:
         f"- Total estimated cost: ${total_cost:,}"
     )
 
+@memoize_tool(store=tool_store)
 def compare_costs(destination1: str, destination2: str, days: int) -> str:
     """Compare costs between two destinations."""
     cost1 = (120 * days) + 800
@@ -41,6 +50,7 @@ def compare_costs(destination1: str, destination2: str, days: int) -> str:
         f"- Difference: ${abs(cost1 - cost2):,}"
     )
 
+@memoize_tool(store=tool_store)
 def plan_trip_itinerary(city: str, days: int) -> str:
     """Create a detailed trip itinerary for a city."""
     # Mock itinerary data
@@ -84,6 +94,7 @@ def plan_trip_itinerary(city: str, days: int) -> str:
         "\n".join(selected_days)
     )
 
+@memoize_tool(store=tool_store)
 def suggest_activities(city: str, interest: str) -> str:
     """Suggest activities based on interests."""
     suggestions = {
@@ -120,8 +131,18 @@ workflow = create_supervisor(
     )
 )
 
+# Requests that clearly need one expert, or clearly both (e.g. an itinerary and its
+# cost), skip the supervisor model; for both, the experts run concurrently and
+# `model` combines their answers
+router = FastPathRouter({
+    "budget_expert": [r"\b(cost|costs|price|prices|budget|cheap|cheaper|expensive|afford)\b", r"how much", r"\$\d"],
+    "trip_planner": [r"\b(itinerary|activities|things to do|sightseeing|what to see|plan)\b"],
+})
+
 # Compile and run
-app = workflow.compile()
+supervisor_app = workflow.compile()
+app = do_build_fast_path_graph(supervisor_app, {"budget_expert": budget_agent, "trip_planner": planner_agent}, router,
+                               synthesizer=model)
 result = app.invoke({
     "messages": [
         {
@@ -130,4 +151,6 @@ result = app.invoke({
         }
     ]
 })
-print(result) 
\ No newline at end of file
+print(result)
+print(tool_cache_stats())
+print(router.stats) 
\ No newline at end of file
@@ -0,0 +1,176 @@
+import inspect
+import re
+import threading
+
+# Staged extraction: cheap deterministic parsers first, models only when they fail.
+# Each stage takes the user's text and returns (value, confidence) or None. The
+# pipeline stops at the first stage whose confidence reaches `min_confidence`;
+# when none does, the most confident result is returned. A stage is
+# (name, func) or (name, func, async_func); `aextract` prefers the async one.
+#
+#   pipeline = ExtractionPipeline("company_person", [
+#       ("regex", do_parse_company_person),
+#       ("llm", do_llm_extract),
+#   ])
+#   result = pipeline.extract("Company: Acme, Person: Jane Doe")   # regex hit, no LLM call
+#
+# Every pipeline counts which stage resolved each input; see pipeline_stats().
+
+# pipeline name -> ExtractionPipeline, for pipeline_stats()
+_registry = {}
+
+class ExtractionResult:
+    def __init__(self, value, confidence: float, stage: str):
+        self.value = value
+        self.confidence = confidence
+        self.stage = stage
+
+    def __repr__(self) -> str:
+        return f"ExtractionResult(value={self.value!r}, confidence={self.confidence}, stage={self.stage!r})"
+
+class ExtractionPipeline:
+    """Run extraction stages in order and stop at the first confident result"""
+
+    def __init__(self, name: str, stages: list[tuple], min_confidence: float = 1.0):
+        self.name = name
+        self.stages = stages
+        self.min_confidence = min_confidence
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.hits = {stage[0]: 0 for stage in stages}
+        self.unresolved = 0
+        _registry[name] = self
+
+    def extract(self, text: str):
+        """Most confident ExtractionResult, or None if no stage produced anything"""
+        results = []
+        for stage_name, stage, *_ in self.stages:
+            result = self.do_run_stage(stage_name, stage(text))
+            if result is not None:
+                results.append(result)
+                if result.confidence >= self.min_confidence:
+                    break
+        return self.do_record(results)
+
+    async def aextract(self, text: str):
+        results = []
+        for stage_name, stage, *async_stage in self.stages:
+            output = (async_stage[0] or stage)(text) if async_stage else stage(text)
+            if inspect.isawaitable(output):
+                output = await output
+            result = self.do_run_stage(stage_name, output)
+            if result is not None:
+                results.append(result)
+                if result.confidence >= self.min_confidence:
+                    break
+        return self.do_record(results)
+
+    @staticmethod
+    def do_run_stage(stage_name: str, output):
+        if output is None:
+            return None
+        value, confidence = output
+        return ExtractionResult(value, confidence, stage_name)
+
+    def do_record(self, results: list):
+        best = max(reversed(results), key=lambda result: result.confidence, default=None)
+        with self.lock:
+            self.calls += 1
+            if best is not None and best.confidence >= self.min_confidence:
+                self.hits[best.stage] += 1
+            else:
+                self.unresolved += 1
+        return best
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "calls": self.calls,
+                "hits": dict(self.hits),
+                "hit_rates": {stage: round(hits / self.calls, 3) if self.calls else 0.0 for stage, hits in self.hits.items()},
+                "unresolved": self.unresolved,
+            }
+
+def pipeline_stats() -> dict:
+    """Stage hit counts and rates of every pipeline, by pipeline name"""
+    return {name: pipeline.stats() for name, pipeline in _registry.items()}
+
+def do_print_pipeline_stats(stats: dict) -> None:
+    for name, pipeline in stats.items():
+        if not pipeline["calls"]:
+            continue
+        stages = ", ".join(f"{stage} {rate:.0%}" for stage, rate in pipeline["hit_rates"].items())
+        print(f"🧩 {name}: {pipeline['calls']} inputs - {stages}, unresolved {pipeline['unresolved']}")
+
+def do_escape_label(value) -> str:
+    """Label value escaped for the Prometheus text format"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def render_pipeline_prometheus() -> str:
+    lines = [
+        "# HELP extraction_stage_hits_total Inputs resolved by each extraction stage",
+        "# TYPE extraction_stage_hits_total counter",
+    ]
+    for name, pipeline in pipeline_stats().items():
+        name = do_escape_label(name)
+        for stage, hits in pipeline["hits"].items():
+            stage = do_escape_label(stage)
+            lines.append(f'extraction_stage_hits_total{{pipeline="{name}",stage="{stage}"}} {hits}')
+        lines.append(f'extraction_stage_hits_total{{pipeline="{name}",stage="unresolved"}} {pipeline["unresolved"]}')
+    return "\n".join(lines) + "\n"
+
+# --- Parsers ---
+
+_LABELLED = [
+    re.compile(r"company\s*[:=-]\s*(?P<company>.+?)\s*[,;\n]\s*(?:and\s+)?person\s*[:=-]\s*(?P<person>.+?)\s*$", re.IGNORECASE),
+    re.compile(r"person\s*[:=-]\s*(?P<person>.+?)\s*[,;\n]\s*(?:and\s+)?company\s*[:=-]\s*(?P<company>.+?)\s*$", re.IGNORECASE),
+]
+
+def do_parse_company_person(text: str):
+    """'Company: Acme, Person: Jane Doe' (either order) -> ({"company": ..., "person": ...}, 1.0)"""
+    for pattern in _LABELLED:
+        match = pattern.search(text.strip())
+        if match and match["company"] and match["person"]:
+            return {"company": match["company"], "person": match["person"]}, 1.0
+    return None
+
+_NUMBER = re.compile(r"-?\d+")
+
+_AGE_WORDS = r"(?:years?|yrs?)(?:\s+of\s+age|\s+old)?|y/?o"
+
+# "I'm 42", "I am 42.", "my age is 42 years", "age: 42", "42 years old", "42 yo".
+# After "I'm"/"I am"/"age" the number must end the input or be followed by an age
+# word: "I'm 6 feet tall" and "I am 5 minutes late" are not ages.
+_AGE_PHRASES = [
+    re.compile(rf"\b(?:i[’']m|i\s+am|my\s+age\s+is|age\s*(?:is|:|=)?)\s*(-?\d+)\s*(?:{_AGE_WORDS})?\s*[.!]?\s*$", re.IGNORECASE),
+    re.compile(r"(-?\d+)\s*(?:(?:years?|yrs?)(?:\s+of\s+age|\s+old)|y/?o)\b", re.IGNORECASE),
+]
+
+MAX_AGE = 120
+
+def do_parse_int(text: str):
+    """The whole input is an integer"""
+    try:
+        return int(text.strip()), 1.0
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+def do_parse_age_in_text(text: str):
+    """An age stated in a sentence ("I'm 42", "42 years old"). Any other lone number
+    ("I have 3 kids", "I'm 6 feet tall") is only a guess, so later stages still run."""
+    for pattern in _AGE_PHRASES:
+        match = pattern.search(text)
+        if match:
+            return int(match[1]), 1.0
+    numbers = _NUMBER.findall(text)
+    return (int(numbers[0]), 0.5) if len(numbers) == 1 else None
+
+def do_make_age_parser(parse):
+    """Wrap a number parser so that numbers outside 0-MAX_AGE don't count as an age"""
+    def do_parse_age(text: str):
+        result = parse(text)
+        if result is None:
+            return None
+        age, confidence = result
+        return age, confidence if 0 <= age <= MAX_AGE else 0.0
+    return do_parse_age
@@ -0,0 +1,143 @@
+import math
+import re
+from collections import Counter
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import StateGraph, MessagesState, START, END
+from langgraph.types import Send
+
+# Fast path in front of a supervisor workflow.
+# The supervisor model spends a full round-trip deciding which agent to call, and
+# another one after the agent returns. For requests that obviously belong to one
+# agent, FastPathRouter picks the agent itself and the agent's answer is final;
+# anything unclear still goes to the supervisor.
+#
+#   router = FastPathRouter({"math_expert": [r"\bmultiply\b", ...], "research_expert": [...]})
+#   app = do_build_fast_path_graph(workflow.compile(), {"math_expert": math_agent, ...}, router)
+#
+# With a `synthesizer` model, compound requests that match several agents skip the
+# supervisor too: the agents run concurrently in one superstep (one Send each),
+# their replies are merged in the router's agent order, and the synthesizer writes
+# the final answer. Without one, compound requests go to the supervisor.
+#
+# Routing uses regex patterns first. When no pattern matches, it falls back to a
+# bag-of-words classifier trained on past supervisor decisions (see `learn` and
+# do_collect_routing_examples).
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+def do_tokenize(text: str) -> Counter:
+    return Counter(_WORD.findall(text.lower()))
+
+def do_cosine(a: Counter, b: Counter) -> float:
+    dot = sum(count * b[word] for word, count in a.items())
+    norm = math.sqrt(sum(c * c for c in a.values())) * math.sqrt(sum(c * c for c in b.values()))
+    return dot / norm if norm else 0.0
+
+class FastPathRouter:
+    """Pick the agents for a request without the supervisor model, or none when unsure"""
+
+    def __init__(self, patterns: dict[str, list[str]], min_similarity: float = 0.35, min_margin: float = 0.1):
+        self.patterns = {agent: [re.compile(p, re.IGNORECASE) for p in agent_patterns]
+                         for agent, agent_patterns in patterns.items()}
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self.centroids = {agent: Counter() for agent in patterns}
+        self.stats = {"fast_path": 0, "parallel": 0, "supervisor": 0}
+
+    def learn(self, examples: list[tuple[str, str]]) -> None:
+        """Add (request, agent the supervisor chose) examples to the classifier"""
+        for text, agent in examples:
+            if agent in self.centroids:
+                self.centroids[agent].update(do_tokenize(text))
+
+    def route(self, text: str, allow_parallel: bool = False) -> list[str]:
+        """Agents to send the request to: one, several for a compound request, or none if unsure"""
+        agents = self.match(text)
+        if len(agents) > 1 and not allow_parallel:
+            agents = []
+        self.stats["supervisor" if not agents else "fast_path" if len(agents) == 1 else "parallel"] += 1
+        return agents
+
+    def match(self, text: str) -> list[str]:
+        matched = [agent for agent, patterns in self.patterns.items() if any(p.search(text) for p in patterns)]
+        if matched:
+            # Several agents matching means a compound request
+            return matched
+
+        tokens = do_tokenize(text)
+        scores = sorted(((do_cosine(tokens, centroid), agent) for agent, centroid in self.centroids.items() if centroid),
+                        reverse=True)
+        if not scores or scores[0][0] < self.min_similarity:
+            return []
+        if len(scores) > 1 and scores[0][0] - scores[1][0] < self.min_margin:
+            return []
+        return [scores[0][1]]
+
+def do_collect_routing_examples(messages: list, handoff_prefix: str = "transfer_to_") -> list[tuple[str, str]]:
+    """(request, agent) pairs from a finished supervisor conversation: the first handoff after each human message"""
+    examples = []
+    request = None
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            request = message.content
+        elif isinstance(message, AIMessage) and request is not None:
+            for tool_call in message.tool_calls:
+                if tool_call["name"].startswith(handoff_prefix):
+                    examples.append((request, tool_call["name"][len(handoff_prefix):]))
+                    request = None
+                    break
+    return examples
+
+SYNTHESIS_PROMPT = (
+    "Several experts have each answered part of the user's request above. "
+    "Combine their answers into one reply to the user. Do not add information they did not provide."
+)
+
+def do_last_human_text(state: MessagesState) -> str | None:
+    last_human = next((m for m in reversed(state["messages"]) if isinstance(m, HumanMessage)), None)
+    return last_human.content if last_human is not None else None
+
+def do_make_agent_node(agent):
+    """Run an agent on the shared history and keep only its final message, like create_supervisor does"""
+
+    def do_call_agent(state: MessagesState, config) -> dict:
+        return {"messages": agent.invoke(state, config)["messages"][-1:]}
+
+    async def do_acall_agent(state: MessagesState, config) -> dict:
+        return {"messages": (await agent.ainvoke(state, config))["messages"][-1:]}
+
+    return RunnableLambda(do_call_agent, afunc=do_acall_agent, name=agent.name)
+
+def do_build_fast_path_graph(supervisor_app, agents: dict, router: FastPathRouter, synthesizer=None):
+    """Wrap a compiled supervisor workflow so confidently routed requests go straight to their agents"""
+
+    def do_pick_route(state: MessagesState):
+        text = do_last_human_text(state)
+        picked = router.route(text, allow_parallel=synthesizer is not None) if text is not None else []
+        if not picked:
+            return "supervisor"
+        print(f"⚡ Fast path: {', '.join(picked)}")
+        # Sends of one superstep run concurrently and their writes are applied in this order
+        return [Send(agent, state) for agent in picked]
+
+    def do_after_agent(state: MessagesState) -> str:
+        text = do_last_human_text(state)
+        return "synthesize" if synthesizer is not None and len(router.match(text)) > 1 else END
+
+    def do_synthesize(state: MessagesState) -> dict:
+        response = synthesizer.invoke([SystemMessage(content=SYNTHESIS_PROMPT)] + state["messages"])
+        response.name = "supervisor"
+        return {"messages": [response]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("supervisor", supervisor_app)
+    for name, agent in agents.items():
+        builder.add_node(name, do_make_agent_node(agent))
+        builder.add_conditional_edges(name, do_after_agent, ["synthesize", END])
+    builder.add_node("synthesize", do_synthesize)
+    builder.add_conditional_edges(START, do_pick_route, ["supervisor", *agents])
+    builder.add_edge("supervisor", END)
+    builder.add_edge("synthesize", END)
+    return builder.compile()
@@ -0,0 +1,288 @@
+import bisect
+import json
+import threading
+import time
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langgraph.errors import GraphBubbleUp
+
+# Local per-node instrumentation for compiled graphs, no network needed.
+# Pass a NodeMetrics handler as a callback and every node execution records:
+#   - wall time, split into time spent in LLM calls and the rest ("framework")
+#   - prompt/completion tokens of the LLM calls made inside the node
+#   - size of the state the node was called with, with NodeMetrics(measure_state=True);
+#     off by default, since it serializes the whole state on every node
+#
+#   metrics = NodeMetrics()
+#   graph.invoke(inputs, config={"callbacks": [metrics], ...})
+#   print(metrics.render_prometheus())   # Prometheus text format, e.g. for a /metrics endpoint
+#   do_print_node_summary(metrics.summary())
+#
+# Spans can also be sent to a local OpenTelemetry collector: NodeMetrics(tracer=do_setup_opentelemetry()).
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+class Histogram:
+    """Cumulative-bucket histogram, the same shape Prometheus exposes"""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+def do_escape_label(value) -> str:
+    """Label value escaped for the Prometheus text format"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def do_state_size(inputs) -> int:
+    """Approximate size of a node's input state, in bytes of JSON"""
+    try:
+        return len(json.dumps(inputs, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+class NodeMetrics(BaseCallbackHandler):
+    """Callback handler that times every graph node and the LLM calls made inside it"""
+
+    # Timing needs the callbacks to run when the event happens, also under ainvoke
+    run_inline = True
+
+    def __init__(self, tracer=None, measure_state: bool = False):
+        self.tracer = tracer
+        self.measure_state = measure_state
+        self.lock = threading.Lock()
+        self.parents = {}    # run_id -> parent run_id, to find the node an LLM call belongs to
+        self.node_runs = {}  # run_id of a running node -> what has been measured so far
+        self.llm_runs = {}   # run_id of a running LLM call -> (enclosing node run_ids, start time)
+
+        self.runs = {}  # (node, status) -> count
+        self.duration = {}
+        self.llm_duration = {}
+        self.framework_duration = {}
+        self.state_bytes = {}
+        self.prompt_tokens = {}
+        self.completion_tokens = {}
+        self.llm_calls = {}
+
+    # Callback events
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        with self.lock:
+            self.parents[run_id] = parent_run_id
+            # Edges and runnables inside a node carry the same metadata; the node run is the one named after it
+            if node is None or kwargs.get("name") != node:
+                return
+            self.node_runs[run_id] = {
+                "node": node,
+                "started": time.perf_counter(),
+                "started_ns": time.time_ns(),
+                "llm_seconds": 0.0,
+                "state_bytes": do_state_size(inputs) if self.measure_state else None,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "llm_calls": 0,
+            }
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._finish_node(run_id, "ok")
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        # Interrupts and handoffs (Command to a parent graph) are raised as exceptions too
+        self._finish_node(run_id, "interrupted" if isinstance(error, GraphBubbleUp) else "error")
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs):
+        with self.lock:
+            self.parents[run_id] = parent_run_id
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        with self.lock:
+            self.parents.pop(run_id, None)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self.on_tool_end(None, run_id=run_id)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        self._start_llm(run_id, parent_run_id)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        self._start_llm(run_id, parent_run_id)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        prompt_tokens, completion_tokens = 0, 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    prompt_tokens += usage.get("input_tokens", 0)
+                    completion_tokens += usage.get("output_tokens", 0)
+        if not prompt_tokens and not completion_tokens:
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            prompt_tokens = token_usage.get("prompt_tokens", 0)
+            completion_tokens = token_usage.get("completion_tokens", 0)
+        self._finish_llm(run_id, prompt_tokens, completion_tokens)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish_llm(run_id, 0, 0)
+
+    # Bookkeeping
+
+    def _start_llm(self, run_id, parent_run_id) -> None:
+        with self.lock:
+            self.parents[run_id] = parent_run_id
+            # Innermost node first; subgraph nodes enclose the nodes of their subgraph
+            node_runs = []
+            ancestor = parent_run_id
+            while ancestor is not None:
+                if ancestor in self.node_runs:
+                    node_runs.append(ancestor)
+                ancestor = self.parents.get(ancestor)
+            self.llm_runs[run_id] = (node_runs, time.perf_counter())
+
+    def _finish_llm(self, run_id, prompt_tokens: int, completion_tokens: int) -> None:
+        with self.lock:
+            self.parents.pop(run_id, None)
+            node_runs, started = self.llm_runs.pop(run_id, ([], None))
+            node_runs = [node_run for node_run in node_runs if node_run in self.node_runs]
+            if not node_runs:
+                return
+            # The wait counts as LLM time for every enclosing node, the tokens only for the innermost one
+            llm_seconds = time.perf_counter() - started
+            for node_run in node_runs:
+                self.node_runs[node_run]["llm_seconds"] += llm_seconds
+            measured = self.node_runs[node_runs[0]]
+            measured["prompt_tokens"] += prompt_tokens
+            measured["completion_tokens"] += completion_tokens
+            measured["llm_calls"] += 1
+
+    def _finish_node(self, run_id, status: str) -> None:
+        ended = time.perf_counter()
+        with self.lock:
+            self.parents.pop(run_id, None)
+            measured = self.node_runs.pop(run_id, None)
+            if measured is None:
+                return
+            node = measured["node"]
+            seconds = ended - measured["started"]
+            llm_seconds = min(measured["llm_seconds"], seconds)
+
+            self.runs[(node, status)] = self.runs.get((node, status), 0) + 1
+            self.duration.setdefault(node, Histogram(DURATION_BUCKETS)).observe(seconds)
+            self.llm_duration.setdefault(node, Histogram(DURATION_BUCKETS)).observe(llm_seconds)
+            self.framework_duration.setdefault(node, Histogram(DURATION_BUCKETS)).observe(seconds - llm_seconds)
+            if measured["state_bytes"] is not None:
+                self.state_bytes.setdefault(node, Histogram(SIZE_BUCKETS)).observe(measured["state_bytes"])
+            self.prompt_tokens[node] = self.prompt_tokens.get(node, 0) + measured["prompt_tokens"]
+            self.completion_tokens[node] = self.completion_tokens.get(node, 0) + measured["completion_tokens"]
+            self.llm_calls[node] = self.llm_calls.get(node, 0) + measured["llm_calls"]
+
+        if self.tracer is not None:
+            span = self.tracer.start_span(node, start_time=measured["started_ns"])
+            span.set_attribute("langgraph.node", node)
+            span.set_attribute("langgraph.status", status)
+            span.set_attribute("langgraph.llm_seconds", llm_seconds)
+            span.set_attribute("langgraph.llm_calls", measured["llm_calls"])
+            span.set_attribute("langgraph.prompt_tokens", measured["prompt_tokens"])
+            span.set_attribute("langgraph.completion_tokens", measured["completion_tokens"])
+            if measured["state_bytes"] is not None:
+                span.set_attribute("langgraph.state_bytes", measured["state_bytes"])
+            span.end(end_time=measured["started_ns"] + int(seconds * 1e9))
+
+    # Reporting
+
+    def summary(self) -> dict:
+        """Per-node totals and estimated p50/p99 wall time, slowest p99 first"""
+        with self.lock:
+            nodes = {}
+            for node, histogram in self.duration.items():
+                nodes[node] = {
+                    "runs": histogram.count,
+                    "errors": self.runs.get((node, "error"), 0),
+                    "p50_seconds": round(histogram.quantile(0.5), 4),
+                    "p99_seconds": round(histogram.quantile(0.99), 4),
+                    "total_seconds": round(histogram.sum, 4),
+                    "llm_seconds": round(self.llm_duration[node].sum, 4),
+                    "framework_seconds": round(self.framework_duration[node].sum, 4),
+                    "llm_calls": self.llm_calls.get(node, 0),
+                    "prompt_tokens": self.prompt_tokens.get(node, 0),
+                    "completion_tokens": self.completion_tokens.get(node, 0),
+                    "mean_state_bytes": round(self.state_bytes[node].sum / self.state_bytes[node].count) if node in self.state_bytes else None,
+                }
+        return dict(sorted(nodes.items(), key=lambda item: item[1]["p99_seconds"], reverse=True))
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+
+        def do_add_counter(name: str, help_text: str, values: dict, label_names: tuple) -> None:
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} counter"])
+            for key, value in sorted(values.items()):
+                key = key if isinstance(key, tuple) else (key,)
+                labels = ",".join(f'{label}="{do_escape_label(value)}"' for label, value in zip(label_names, key))
+                lines.append(f"{name}{{{labels}}} {value}")
+
+        def do_add_histogram(name: str, help_text: str, histograms: dict) -> None:
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} histogram"])
+            for node, histogram in sorted(histograms.items()):
+                node = do_escape_label(node)
+                cumulative = 0
+                for bucket, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{node="{node}",le="{bucket}"}} {cumulative}')
+                lines.append(f'{name}_sum{{node="{node}"}} {histogram.sum}')
+                lines.append(f'{name}_count{{node="{node}"}} {histogram.count}')
+
+        with self.lock:
+            do_add_counter("langgraph_node_runs_total", "Node executions by outcome", self.runs, ("node", "status"))
+            do_add_counter("langgraph_node_llm_calls_total", "LLM calls made inside a node", self.llm_calls, ("node",))
+            do_add_counter("langgraph_node_prompt_tokens_total", "Prompt tokens sent by a node", self.prompt_tokens, ("node",))
+            do_add_counter("langgraph_node_completion_tokens_total", "Completion tokens received by a node", self.completion_tokens, ("node",))
+            do_add_histogram("langgraph_node_duration_seconds", "Wall time of a node execution", self.duration)
+            do_add_histogram("langgraph_node_llm_seconds", "Time a node spent waiting on LLM calls", self.llm_duration)
+            do_add_histogram("langgraph_node_framework_seconds", "Node wall time outside LLM calls", self.framework_duration)
+            do_add_histogram("langgraph_node_state_bytes", "Size of the state a node was called with", self.state_bytes)
+        return "\n".join(lines) + "\n"
+
+def do_setup_opentelemetry(endpoint: str = "http://localhost:4317", service_name: str = "langgraph"):
+    """Tracer that exports node spans to a local OTLP collector (needs the opentelemetry-sdk and
+    opentelemetry-exporter-otlp packages)"""
+    try:
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError as e:
+        raise ImportError("OpenTelemetry export needs: pip install opentelemetry-sdk opentelemetry-exporter-otlp") from e
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint, insecure=True)))
+    return provider.get_tracer("graph_metrics")
+
+def do_print_node_summary(summary: dict) -> None:
+    print(f"{'node':<32}{'runs':>6}{'p50 s':>9}{'p99 s':>9}{'llm s':>9}{'other s':>9}{'tokens in/out':>16}{'state B':>10}")
+    for node, stats in summary.items():
+        tokens = f"{stats['prompt_tokens']}/{stats['completion_tokens']}"
+        state_bytes = "-" if stats["mean_state_bytes"] is None else stats["mean_state_bytes"]
+        print(f"{node:<32}{stats['runs']:>6}{stats['p50_seconds']:>9}{stats['p99_seconds']:>9}"
+              f"{stats['llm_seconds']:>9}{stats['framework_seconds']:>9}{tokens:>16}{state_bytes:>10}")
@@ -0,0 +1,171 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+from xml.sax.saxutils import escape
+
+# Local, cached graph pictures.
+# draw_mermaid_png() sends the diagram to a remote renderer on every run, which
+# slows startup down and fails without network access. Instead:
+#   - the picture is drawn locally, with Graphviz `dot` when it is installed and
+#     as an SVG laid out in pure Python otherwise
+#   - pictures are cached on disk under a hash of the graph topology, so an
+#     unchanged graph is never drawn twice
+#   - do_save_graph_image_async draws in a background thread, so startup never waits
+#
+#   do_save_graph_image_async(graph, "graph_comp.png")   # graph_comp.png, or graph_comp.svg without Graphviz
+
+GRAPH_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".graph_cache")
+
+# Drawing nodes at (x, y) centres, in pixels
+LAYER_HEIGHT = 90
+NODE_GAP = 40
+NODE_HEIGHT = 36
+CHAR_WIDTH = 7.5
+
+def do_topology(graph) -> tuple[list, list]:
+    """(node ids, edges) of a compiled graph, in a stable order"""
+    drawable = graph.get_graph()
+    nodes = sorted(drawable.nodes)
+    edges = sorted({(edge.source, edge.target, bool(edge.conditional), str(edge.data or "")) for edge in drawable.edges})
+    return nodes, edges
+
+def do_topology_hash(nodes: list, edges: list) -> str:
+    return hashlib.sha256(repr((nodes, edges)).encode("utf-8")).hexdigest()[:16]
+
+def do_is_terminal(node: str) -> bool:
+    return node in ("__start__", "__end__")
+
+def do_to_dot(nodes: list, edges: list) -> str:
+    lines = [
+        "digraph G {",
+        '  node [shape=box, style="rounded,filled", fillcolor="#f2f0ff", fontname="Helvetica"];',
+    ]
+    for node in nodes:
+        shape = ', shape=ellipse, fillcolor="#bfb6fc"' if do_is_terminal(node) else ""
+        lines.append(f'  "{node}" [label="{node.strip("_")}"{shape}];')
+    for source, target, conditional, label in edges:
+        attrs = ["style=dashed"] if conditional else []
+        if label:
+            attrs.append(f'label="{label}"')
+        lines.append(f'  "{source}" -> "{target}" [{", ".join(attrs)}];')
+    lines.append("}")
+    return "\n".join(lines)
+
+def do_render_png_with_dot(dot_source: str) -> bytes:
+    result = subprocess.run(["dot", "-Tpng"], input=dot_source.encode("utf-8"), capture_output=True, timeout=30)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", "replace").strip())
+    return result.stdout
+
+def do_layers(nodes: list, edges: list) -> dict[str, int]:
+    """Layer of each node: its longest path from the start, with back edges (loops) ignored"""
+    children = {node: [] for node in nodes}
+    for source, target, _, _ in edges:
+        children[source].append(target)
+
+    # Depth-first search from the start to find the edges that close loops
+    back_edges, state = set(), {}
+
+    def do_visit(node):
+        state[node] = "open"
+        for child in children[node]:
+            if state.get(child) == "open":
+                back_edges.add((node, child))
+            elif child not in state:
+                do_visit(child)
+        state[node] = "done"
+
+    for root in ["__start__"] + nodes:
+        if root in children and root not in state:
+            do_visit(root)
+
+    layers = {node: 0 for node in nodes}
+    # Relaxing len(nodes) times reaches the longest paths of a DAG
+    for _ in nodes:
+        for source, target, _, _ in edges:
+            if (source, target) not in back_edges and layers[target] < layers[source] + 1:
+                layers[target] = layers[source] + 1
+    return layers
+
+def do_render_svg(nodes: list, edges: list) -> bytes:
+    layers = do_layers(nodes, edges)
+    rows = {}
+    for node in nodes:
+        rows.setdefault(layers[node], []).append(node)
+
+    widths = {node: len(node.strip("_")) * CHAR_WIDTH + 32 for node in nodes}
+    row_widths = {layer: sum(widths[n] for n in row) + NODE_GAP * (len(row) - 1) for layer, row in rows.items()}
+    width = max(row_widths.values(), default=0) + 2 * NODE_GAP + 120
+    height = (max(rows, default=0) + 1) * LAYER_HEIGHT + NODE_GAP
+
+    positions = {}
+    for layer, row in rows.items():
+        x = (width - 120 - row_widths[layer]) / 2
+        for node in row:
+            positions[node] = (x + widths[node] / 2, NODE_GAP / 2 + NODE_HEIGHT / 2 + layer * LAYER_HEIGHT)
+            x += widths[node] + NODE_GAP
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" font-family="Helvetica, Arial, sans-serif" font-size="13">',
+        '<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" markerHeight="8" orient="auto">'
+        '<path d="M0,0 L10,5 L0,10 z" fill="#333"/></marker></defs>',
+        f'<rect width="{width:.0f}" height="{height:.0f}" fill="white"/>',
+    ]
+    for source, target, conditional, label in edges:
+        (x1, y1), (x2, y2) = positions[source], positions[target]
+        dash = ' stroke-dasharray="5,4"' if conditional else ""
+        if layers[target] > layers[source]:
+            path = f"M{x1:.0f},{y1 + NODE_HEIGHT / 2:.0f} L{x2:.0f},{y2 - NODE_HEIGHT / 2:.0f}"
+            label_x, label_y = (x1 + x2) / 2, (y1 + y2) / 2
+        else:
+            # Loops and same-layer edges go round the right of both nodes
+            bend = max(x1 + widths[source] / 2, x2 + widths[target] / 2) + 50
+            start = (x1 + widths[source] / 2, y1)
+            end = (x2 + widths[target] / 2, y2)
+            path = f"M{start[0]:.0f},{start[1]:.0f} C{bend:.0f},{start[1]:.0f} {bend:.0f},{end[1]:.0f} {end[0]:.0f},{end[1]:.0f}"
+            label_x, label_y = bend, (y1 + y2) / 2
+        parts.append(f'<path d="{path}" fill="none" stroke="#333" stroke-width="1.2"{dash} marker-end="url(#arrow)"/>')
+        if label:
+            parts.append(f'<text x="{label_x:.0f}" y="{label_y:.0f}" text-anchor="middle" font-size="11" fill="#555">{escape(label)}</text>')
+    for node in nodes:
+        x, y = positions[node]
+        w = widths[node]
+        fill, radius = ("#bfb6fc", NODE_HEIGHT / 2) if do_is_terminal(node) else ("#f2f0ff", 6)
+        parts.append(f'<rect x="{x - w / 2:.0f}" y="{y - NODE_HEIGHT / 2:.0f}" width="{w:.0f}" height="{NODE_HEIGHT}" '
+                     f'rx="{radius:.0f}" fill="{fill}" stroke="#7c6fd6"/>')
+        parts.append(f'<text x="{x:.0f}" y="{y + 4:.0f}" text-anchor="middle">{escape(node.strip("_"))}</text>')
+    parts.append("</svg>")
+    return "\n".join(parts).encode("utf-8")
+
+def do_save_graph_image(graph, path: str, cache_dir: str = GRAPH_CACHE_DIR) -> str:
+    """Write the graph's picture next to `path` and return the file written: a PNG with Graphviz, an SVG without"""
+    nodes, edges = do_topology(graph)
+    ext = ".png" if shutil.which("dot") else ".svg"
+    cached = os.path.join(cache_dir, do_topology_hash(nodes, edges) + ext)
+
+    if not os.path.exists(cached):
+        data = do_render_png_with_dot(do_to_dot(nodes, edges)) if ext == ".png" else do_render_svg(nodes, edges)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write then rename, so a concurrent run never copies half a picture
+        tmp = f"{cached}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, cached)
+
+    target = os.path.splitext(path)[0] + ext
+    shutil.copyfile(cached, target)
+    return target
+
+def do_save_graph_image_async(graph, path: str, cache_dir: str = GRAPH_CACHE_DIR) -> threading.Thread:
+    """Save the graph's picture in a background thread; failures are printed, never raised"""
+    def do_save():
+        try:
+            print(f"🎨 Graph saved as {do_save_graph_image(graph, path, cache_dir)}")
+        except Exception as e:
+            print(f"❌ Could not save graph image: {e}")
+
+    thread = threading.Thread(target=do_save, name="graph-render")
+    thread.start()
+    return thread
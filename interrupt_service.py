@@ -0,0 +1,198 @@
+import asyncio
+import json
+import time
+import uuid
+
+from langgraph.types import Command
+
+from basic_chat_with_llm_interrupt_async import do_build_async_graph, do_astream_until_interrupt
+from delta_checkpointer import DeltaSqliteSaver
+from graph_metrics import NodeMetrics
+from extraction_pipeline import render_pipeline_prometheus
+
+# Resumable HTTP service for human-in-the-loop graphs.
+# Instead of a `while "__interrupt__" in result: input(...)` loop per conversation,
+# every request runs the graph until its next interrupt and returns. All thread
+# state lives in the shared sqlite checkpointer, so one worker can hold any number
+# of paused conversations and any worker can resume any of them. A thread is
+# resumed by one request at a time: a concurrent resume of the same thread, from
+# this worker or another one, gets 409.
+#
+# Run it with an ASGI server, e.g.:
+#   uvicorn interrupt_service:app --port 8000
+#
+#   curl -X POST localhost:8000/graphs/email/threads -d '{}'
+#   -> {"thread_id": "...", "status": "interrupted", "interrupts": ["Please provide both ..."], ...}
+#   curl -X POST localhost:8000/graphs/email/threads/<thread_id>/resume -d '{"resume": "Company: Acme, Person: Jane Doe"}'
+#   curl localhost:8000/graphs/email/threads/<thread_id>
+#   -> once the email is written: {..., "interrupts": [{"question": "Is this email good to send? (yes/no)", "email": "..."}]}
+#   curl localhost:8000/metrics   (per-node latency/token and extraction stage metrics, Prometheus text format)
+#
+# Add "stream": true to a start/resume body to get the email as server-sent events
+# while it is written ("token" events), followed by a "thread" event with the usual
+# response once the graph has paused again or finished.
+
+checkpointer = DeltaSqliteSaver()
+node_metrics = NodeMetrics()
+
+# A claim left behind by a worker that died mid-resume expires after this long
+RESUME_CLAIM_TTL_SECONDS = 600
+
+# Compiled once per process and shared by all threads; add graphs here to serve them
+GRAPHS = {
+    "email": do_build_async_graph(checkpointer=checkpointer),
+}
+
+def do_public_values(values: dict) -> dict:
+    """The JSON-friendly part of a thread's state (messages are left out)"""
+    return {k: v for k, v in values.items() if isinstance(v, (str, int, float, bool)) or v is None}
+
+async def do_describe_thread(graph, thread_id: str) -> dict:
+    """Report whether a thread is waiting on a human, and what it is asking"""
+    state = await graph.aget_state({"configurable": {"thread_id": thread_id}})
+    interrupts = [i.value for task in state.tasks for i in task.interrupts]
+    if interrupts:
+        status = "interrupted"
+    elif state.next:
+        status = "pending"
+    else:
+        status = "done"
+    checkpoint_id = state.config["configurable"].get("checkpoint_id") if state.config else None
+    return {"thread_id": thread_id, "status": status, "interrupts": interrupts, "checkpoint_id": checkpoint_id,
+            "values": do_public_values(state.values)}
+
+def do_claim_resume(thread_id: str, checkpoint_id: str) -> bool:
+    """Claim the right to resume a thread; False if another request, in any worker, holds it"""
+    now = time.time()
+    with checkpointer.cursor() as cur:
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resume_claims (
+                thread_id TEXT PRIMARY KEY,
+                checkpoint_id TEXT NOT NULL,
+                claimed_at REAL NOT NULL
+            )
+            """
+        )
+        cur.execute("DELETE FROM resume_claims WHERE thread_id = ? AND claimed_at < ?", (thread_id, now - RESUME_CLAIM_TTL_SECONDS))
+        cur.execute("INSERT OR IGNORE INTO resume_claims (thread_id, checkpoint_id, claimed_at) VALUES (?, ?, ?)",
+                    (thread_id, checkpoint_id, now))
+        return cur.rowcount == 1
+
+def do_release_resume(thread_id: str, checkpoint_id: str) -> None:
+    with checkpointer.cursor() as cur:
+        cur.execute("DELETE FROM resume_claims WHERE thread_id = ? AND checkpoint_id = ?", (thread_id, checkpoint_id))
+
+async def do_start_thread(graph, body: dict, on_token=None) -> tuple[int, dict]:
+    thread_id = str(uuid.uuid4())
+    graph_input = {"messages": [], **body.get("input", {})}
+    config = {"configurable": {"thread_id": thread_id}, "callbacks": [node_metrics]}
+    await do_astream_until_interrupt(graph, graph_input, config, on_token)
+    return 201, await do_describe_thread(graph, thread_id)
+
+async def do_resume_thread(graph, thread_id: str, body: dict, on_token=None) -> tuple[int, dict]:
+    thread = await do_describe_thread(graph, thread_id)
+    if not thread["values"] and thread["status"] == "done":
+        return 404, {"error": f"Unknown thread {thread_id}"}
+    if thread["status"] != "interrupted":
+        return 409, {"error": f"Thread {thread_id} is not waiting for input", **thread}
+    if "resume" not in body:
+        return 400, {"error": "Body must contain 'resume'"}
+
+    checkpoint_id = thread["checkpoint_id"]
+    if not await asyncio.to_thread(do_claim_resume, thread_id, checkpoint_id):
+        return 409, {"error": f"Thread {thread_id} is already being resumed", **thread}
+    try:
+        # Compare-and-set: another request may have resumed it between our read and our claim
+        current = await do_describe_thread(graph, thread_id)
+        if current["checkpoint_id"] != checkpoint_id:
+            return 409, {"error": f"Thread {thread_id} was resumed by another request", **current}
+
+        config = {"configurable": {"thread_id": thread_id}, "callbacks": [node_metrics]}
+        await do_astream_until_interrupt(graph, Command(resume=body["resume"]), config, on_token)
+    finally:
+        await asyncio.to_thread(do_release_resume, thread_id, checkpoint_id)
+    return 200, await do_describe_thread(graph, thread_id)
+
+async def do_route(method: str, parts: list[str], body: dict, on_token=None) -> tuple[int, dict]:
+    # /graphs/{graph}/threads[/{thread_id}[/resume]]
+    if len(parts) < 3 or parts[0] != "graphs" or parts[2] != "threads":
+        return 404, {"error": "Not found"}
+    graph = GRAPHS.get(parts[1])
+    if graph is None:
+        return 404, {"error": f"Unknown graph {parts[1]}"}
+
+    if method == "POST" and len(parts) == 3:
+        return await do_start_thread(graph, body, on_token)
+    if method == "GET" and len(parts) == 4:
+        thread = await do_describe_thread(graph, parts[3])
+        return (200, thread) if thread["values"] or thread["status"] != "done" else (404, {"error": f"Unknown thread {parts[3]}"})
+    if method == "POST" and len(parts) == 5 and parts[4] == "resume":
+        return await do_resume_thread(graph, parts[3], body, on_token)
+    return 404, {"error": "Not found"}
+
+async def do_read_body(receive) -> dict:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    raw = b"".join(chunks)
+    return json.loads(raw) if raw.strip() else {}
+
+def do_sse_event(event: str, payload: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n".encode("utf-8")
+
+def do_make_token_streamer(send):
+    """on_token callback that sends tokens as server-sent events, starting the response on the first one"""
+    stream = {"started": False}
+
+    async def on_token(token: str, first: bool) -> None:
+        if not stream["started"]:
+            await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/event-stream")]})
+            stream["started"] = True
+        await send({"type": "http.response.body", "body": do_sse_event("token", {"token": token}), "more_body": True})
+
+    return on_token, stream
+
+async def app(scope, receive, send):
+    """Minimal ASGI app, no web framework needed"""
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                checkpointer.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    if scope["type"] != "http":
+        return
+
+    if scope["method"] == "GET" and scope["path"].rstrip("/") == "/metrics":
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain; version=0.0.4")]})
+        await send({"type": "http.response.body", "body": (node_metrics.render_prometheus() + render_pipeline_prometheus()).encode("utf-8")})
+        return
+
+    on_token, stream = None, {"started": False}
+    try:
+        body = await do_read_body(receive)
+        if body.get("stream"):
+            on_token, stream = do_make_token_streamer(send)
+        parts = [part for part in scope["path"].split("/") if part]
+        status, payload = await do_route(scope["method"], parts, body, on_token)
+    except json.JSONDecodeError as e:
+        status, payload = 400, {"error": f"Invalid JSON: {e}"}
+    except Exception as e:
+        print(f"❌ Request failed: {e}")
+        status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+
+    if stream["started"]:
+        # Headers are already sent, so the outcome goes into the last event
+        await send({"type": "http.response.body", "body": do_sse_event("thread" if status < 400 else "error", payload)})
+        return
+
+    await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": json.dumps(payload, default=str).encode("utf-8")})
@@ -0,0 +1,162 @@
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+
+# Lazy graph loading for `langgraph dev` and LangGraph Server.
+# The server imports every module listed in langgraph.json on boot, and our
+# graph modules build models and compile graphs at import time. Each studio
+# directory has a small studio_loader.py that langgraph.json points at instead:
+#
+#   "graphs": {"chatbot": "./studio_loader.py:chatbot", ...}
+#
+# with the real targets listed in studio_graphs.json next to it:
+#
+#   {"chatbot": "./chatbot.py:graph", ...}
+#
+# and that calls do_install_lazy_graphs(globals(), <studio dir>). Boot then only
+# imports the loader. A graph is imported and compiled on its first request and
+# cached for the next ones. A graph that fails to load is reported once and
+# refused on later requests; the other graphs keep working.
+# STUDIO_PRELOAD="chatbot,agent" loads the listed graphs at boot anyway.
+#
+# `python studio_loader.py` in a studio directory loads every graph and prints
+# the import-time breakdown.
+
+REGISTRY_FILE = "studio_graphs.json"
+
+class GraphLoadError(RuntimeError):
+    pass
+
+class LazyGraphLoader:
+    """Import each registered graph on first use, cache it, and remember the ones that failed"""
+
+    def __init__(self, registry: dict[str, str], base_dir: str):
+        self.registry = registry
+        self.base_dir = base_dir
+        self.graphs = {}
+        self.errors = {}
+        self.timings = {}
+        self.lock = threading.Lock()
+
+    def get(self, name: str):
+        graph = self.graphs.get(name)
+        if graph is not None:
+            return graph
+        with self.lock:
+            if name not in self.graphs and name not in self.errors:
+                self.do_load(name)
+        if name in self.errors:
+            raise GraphLoadError(f"Graph '{name}' could not be loaded: {self.errors[name]}")
+        return self.graphs[name]
+
+    def do_load(self, name: str) -> None:
+        if name not in self.registry:
+            self.errors[name] = "not listed in the registry"
+            return
+        path, attr = self.registry[name].rsplit(":", 1)
+        path = os.path.normpath(os.path.join(self.base_dir, path))
+        # Graph modules may import other modules of their studio directory, as under `langgraph dev`
+        if self.base_dir not in sys.path:
+            sys.path.insert(0, self.base_dir)
+
+        modules_before = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            module = self.do_import(path)
+            imported = time.perf_counter()
+            graph = getattr(module, attr)
+            if callable(graph) and not hasattr(graph, "invoke"):
+                # A factory function
+                graph = graph()
+            if not hasattr(graph, "invoke") and hasattr(graph, "compile"):
+                # An uncompiled StateGraph
+                graph = graph.compile()
+        except Exception as e:
+            self.errors[name] = f"{type(e).__name__}: {e}"
+            print(f"❌ Skipping graph '{name}' ({self.registry[name]}): {self.errors[name]}")
+            return
+        done = time.perf_counter()
+
+        self.graphs[name] = graph
+        self.timings[name] = {
+            "import_seconds": imported - start,
+            "build_seconds": done - imported,
+            "new_modules": len(sys.modules) - modules_before,
+        }
+        print(f"📦 Loaded graph '{name}' in {(done - start) * 1000:.0f}ms")
+
+    def do_import(self, path: str):
+        """Import a graph file under its own module name, reusing it when several graphs live in one file"""
+        module_name = os.path.splitext(os.path.basename(path))[0]
+        module = sys.modules.get(module_name)
+        if module is not None and os.path.abspath(getattr(module, "__file__", "") or "") == path:
+            return module
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} does not exist")
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+        return module
+
+    def do_preload(self, names: list[str]) -> None:
+        """Load graphs ahead of their first request; failures are reported and skipped"""
+        for name in names:
+            try:
+                self.get(name)
+            except GraphLoadError:
+                pass
+
+    def report(self) -> list[dict]:
+        """Per-graph load times, slowest first, followed by the graphs that failed"""
+        rows = [{"graph": name, "status": "loaded", **timing} for name, timing in self.timings.items()]
+        rows.sort(key=lambda row: row["import_seconds"] + row["build_seconds"], reverse=True)
+        rows += [{"graph": name, "status": "failed", "error": error} for name, error in self.errors.items()]
+        return rows
+
+def do_print_report(rows: list[dict]) -> None:
+    print(f"{'graph':<24} {'import ms':>10} {'build ms':>10} {'modules':>8}")
+    for row in rows:
+        if row["status"] == "loaded":
+            print(f"{row['graph']:<24} {row['import_seconds'] * 1000:>10.0f} {row['build_seconds'] * 1000:>10.0f} {row['new_modules']:>8}")
+        else:
+            print(f"{row['graph']:<24} ❌ {row['error']}")
+    print("Modules imported by an earlier graph are not counted again, so load order matters.")
+
+def do_read_registry(path: str) -> dict[str, str]:
+    with open(path) as f:
+        return json.load(f)
+
+def do_make_factory(loader: LazyGraphLoader, name: str):
+    def make_graph():
+        return loader.get(name)
+
+    make_graph.__name__ = make_graph.__qualname__ = name
+    return make_graph
+
+def do_install_lazy_graphs(module_globals: dict, studio_dir: str) -> LazyGraphLoader:
+    """Give the calling module one graph factory per entry of the studio's studio_graphs.json"""
+    loader = LazyGraphLoader(do_read_registry(os.path.join(studio_dir, REGISTRY_FILE)), studio_dir)
+    factories = {}
+    module_name = module_globals.get("__name__")
+
+    def __getattr__(name: str):
+        # langgraph.json looks graphs up by attribute: "./studio_loader.py:chatbot"
+        if name in loader.registry:
+            if name not in factories:
+                factories[name] = do_make_factory(loader, name)
+            return factories[name]
+        raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+
+    module_globals["__getattr__"] = __getattr__
+
+    if os.getenv("STUDIO_PRELOAD"):
+        loader.do_preload([name.strip() for name in os.environ["STUDIO_PRELOAD"].split(",") if name.strip()])
+    return loader
@@ -0,0 +1,111 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from langchain_core.caches import BaseCache
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+# Persistent cache for LLM calls whose answer only depends on the prompt,
+# like the LinkedIn/company enrichment steps. Pass it to a chat model with
+# `ChatOpenAI(..., cache=SQLiteLLMCache())` and repeated prompts are answered
+# from disk instead of the API.
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "module-2", "state_db", "llm_cache.db")
+
+_WHITESPACE = re.compile(r"(?:\s|\\n|\\t)+")
+
+class SQLiteLLMCache(BaseCache):
+    """Content-addressed LLM cache in sqlite with TTL expiry and LRU eviction.
+
+    Entries are keyed on a hash of the whitespace-normalized prompt plus the
+    model string (model name and call parameters), so the same prompt sent to
+    a different model is a separate entry.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 10_000):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                llm_string TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS llm_cache_last_access ON llm_cache (last_access);
+            """
+        )
+
+    @staticmethod
+    def do_make_key(prompt: str, llm_string: str) -> str:
+        """Hash the normalized prompt together with the model string"""
+        normalized_prompt = _WHITESPACE.sub(" ", prompt).strip()
+        return hashlib.sha256(f"{llm_string}\x00{normalized_prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str):
+        key = self.do_make_key(prompt, llm_string)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self.conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self.conn.commit()
+                self.misses += 1
+                return None
+
+            self.conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self.hits += 1
+
+        return [ChatGeneration(message=AIMessage(content=row[0]))]
+
+    def update(self, prompt: str, llm_string: str, return_val) -> None:
+        # Enrichment calls produce a single plain-text generation
+        if len(return_val) != 1:
+            return
+
+        key = self.do_make_key(prompt, llm_string)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, llm_string, response, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, llm_string, return_val[0].text, now, now),
+            )
+            # Evict the least recently used entries once over capacity
+            self.conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self.conn.commit()
+
+    def clear(self, **kwargs) -> None:
+        with self.lock:
+            self.conn.execute("DELETE FROM llm_cache")
+            self.conn.commit()
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process plus the number of stored entries"""
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
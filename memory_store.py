@@ -0,0 +1,533 @@
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langgraph.store.base import BaseStore, GetOp, Item, ListNamespacesOp, PutOp, SearchItem, SearchOp
+from langgraph.store.base.embed import get_text_at_path
+
+# Long-term memory for agents, shared across threads and kept across restarts.
+# The checkpointer remembers one conversation; this store remembers a user.
+# It is a LangGraph BaseStore, so it can also be passed to `compile(store=...)`:
+#
+#   store = SqliteMemoryStore()
+#   store.put(("finance", user_id, "memories"), key, {"content": "Rent is due on the 1st"})
+#   store.search(("finance", user_id), query="when do I pay rent?", limit=3)
+#
+# Namespaces are per user, so one user's memories never show up in another
+# user's search. Text is embedded locally (HashingEmbeddings, no network) and
+# searched through a locality-sensitive hashing index that lives in the same
+# sqlite file: each memory is filed in one bucket per hash table, a query only
+# reranks the memories in its own and neighbouring buckets, and small
+# namespaces are simply reranked in full. Retrieving the top-k memories per
+# turn replaces stuffing the whole history into the prompt.
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "memory_store.db")
+
+# Namespace parts are joined with a character that can't appear in user input
+_SEPARATOR = "\x1f"
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic bag-of-words embeddings: words and character trigrams hashed into `dims` buckets"""
+
+    def __init__(self, dims: int = 256):
+        self.dims = dims
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.do_embed(text).tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def do_embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dims, dtype=np.float32)
+        for word in _WORD.findall(text.lower()):
+            self.do_add_feature(vector, word, 1.0)
+            # Trigrams make "grocery" and "groceries" land close together
+            padded = f" {word} "
+            for i in range(len(padded) - 2):
+                self.do_add_feature(vector, padded[i:i + 3], 0.5)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def do_add_feature(self, vector: np.ndarray, feature: str, weight: float) -> None:
+        # crc32 is stable across processes, unlike hash()
+        h = zlib.crc32(feature.encode("utf-8"))
+        vector[h % self.dims] += weight if (h >> 16) & 1 else -weight
+
+class LSHIndex:
+    """Random-hyperplane hashing: similar vectors tend to share bucket ids"""
+
+    def __init__(self, dims: int, num_tables: int = 8, num_bits: int = 12, seed: int = 42):
+        self.num_tables = num_tables
+        self.num_bits = num_bits
+        # Fixed seed: bucket ids written to disk stay valid in the next process
+        self.planes = np.random.default_rng(seed).standard_normal((num_tables, num_bits, dims)).astype(np.float32)
+        self.powers = 1 << np.arange(num_bits)
+
+    def buckets(self, vector: np.ndarray) -> list[int]:
+        """One bucket id per table"""
+        return ((self.planes @ vector > 0) @ self.powers).tolist()
+
+    def probes(self, vector: np.ndarray) -> list[tuple[int, int]]:
+        """(table, bucket) pairs to look in: the query's buckets and the ones a single bit away"""
+        probes = []
+        for table, bucket in enumerate(self.buckets(vector)):
+            probes.append((table, bucket))
+            probes.extend((table, bucket ^ (1 << bit)) for bit in range(self.num_bits))
+        return probes
+
+class _NamespaceIndex:
+    """In-memory copy of one namespace's embeddings and buckets, loaded from sqlite on its first search"""
+
+    def __init__(self, dims: int, num_tables: int):
+        # memory_namespaces.version this copy matches
+        self.version = None
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.matrix = np.zeros((0, dims), dtype=np.float32)
+        self.live = np.zeros(0, dtype=bool)
+        self.size = 0
+        self.rows = {}
+        self.free = []
+        self.buckets = [defaultdict(set) for _ in range(num_tables)]
+        self.row_buckets = {}
+
+    def add(self, memory_id: int, vector: np.ndarray, buckets: list[int]) -> None:
+        if self.free:
+            row = self.free.pop()
+        else:
+            if self.size == len(self.ids):
+                capacity = max(64, 2 * len(self.ids))
+                self.ids = np.resize(self.ids, capacity)
+                self.matrix = np.vstack([self.matrix, np.zeros((capacity - len(self.matrix), self.matrix.shape[1]), dtype=np.float32)])
+                self.live = np.concatenate([self.live, np.zeros(capacity - len(self.live), dtype=bool)])
+            row = self.size
+            self.size += 1
+        self.ids[row] = memory_id
+        self.matrix[row] = vector
+        self.live[row] = True
+        self.rows[memory_id] = row
+        self.row_buckets[row] = buckets
+        for table, bucket in enumerate(buckets):
+            self.buckets[table][bucket].add(row)
+
+    def remove(self, memory_id: int) -> None:
+        row = self.rows.pop(memory_id, None)
+        if row is None:
+            return
+        for table, bucket in enumerate(self.row_buckets.pop(row)):
+            self.buckets[table][bucket].discard(row)
+        self.live[row] = False
+        self.free.append(row)
+
+    def candidates(self, probes: list[tuple[int, int]]) -> np.ndarray:
+        rows = set()
+        for table, bucket in probes:
+            rows.update(self.buckets[table].get(bucket, ()))
+        return np.fromiter(rows, dtype=np.int64, count=len(rows))
+
+    def all_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.live[:self.size])
+
+def do_namespace_text(namespace: tuple) -> str:
+    return _SEPARATOR.join(namespace)
+
+def do_timestamp(seconds: float) -> datetime:
+    return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+class SqliteMemoryStore(BaseStore):
+    """BaseStore in sqlite with local embeddings and an on-disk LSH index for semantic search.
+
+    `fields` are the value paths that get embedded (default: every string in the
+    value); a put can override them with `index=[...]` or skip embedding with
+    `index=False`. A namespace's embeddings and buckets are read into memory on
+    its first search and kept in sync by later puts. Every put also bumps the
+    namespace's version in sqlite and stamps its row with it, so a search only
+    reads back the rows another process or store instance has written since;
+    after a delete the namespace is reloaded in full. Namespaces of up to
+    `exact_search_limit` memories are scored in full, larger ones only on the
+    memories in the query's buckets. A filter is checked on the best-scored
+    memories first, in batches, rather than on the whole namespace.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH, embeddings: Embeddings = None, fields: list[str] = None,
+                 num_tables: int = 8, num_bits: int = 12, exact_search_limit: int = 2048):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.embeddings = embeddings or HashingEmbeddings()
+        self.dims = len(self.embeddings.embed_query("dimension probe"))
+        self.fields = fields
+        self.index = LSHIndex(self.dims, num_tables, num_bits)
+        self.exact_search_limit = exact_search_limit
+        # namespace -> _NamespaceIndex, for the namespaces searched so far
+        self.loaded = {}
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS memories (
+                id INTEGER PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                embedding BLOB,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                version INTEGER NOT NULL DEFAULT 0,
+                UNIQUE (namespace, key)
+            );
+            CREATE INDEX IF NOT EXISTS memories_updated_at ON memories (namespace, updated_at);
+            CREATE TABLE IF NOT EXISTS memory_buckets (
+                namespace TEXT NOT NULL,
+                memory_id INTEGER NOT NULL,
+                tbl INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                PRIMARY KEY (namespace, memory_id, tbl)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS memory_namespaces (
+                namespace TEXT PRIMARY KEY,
+                items INTEGER NOT NULL,
+                version INTEGER NOT NULL DEFAULT 0,
+                reset_version INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS memory_index_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+        # Files written before namespaces and rows were versioned
+        for table, column in [("memory_namespaces", "version"), ("memory_namespaces", "reset_version"), ("memories", "version")]:
+            if column not in [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS memories_version ON memories (namespace, version)")
+        self.conn.commit()
+        self.do_check_index_layout(num_tables, num_bits)
+
+    def do_check_index_layout(self, num_tables: int, num_bits: int) -> None:
+        """Rebuild the buckets if the file was indexed with a different embedding size or hash layout"""
+        layout = json.dumps({"dims": self.dims, "num_tables": num_tables, "num_bits": num_bits})
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM memory_index_meta WHERE key = 'layout'").fetchone()
+            if row is not None and row[0] == layout:
+                return
+            self.conn.execute("DELETE FROM memory_buckets")
+            rows = self.conn.execute("SELECT id, namespace, embedding FROM memories WHERE embedding IS NOT NULL").fetchall()
+            if rows and len(rows[0][2]) != self.dims * 4:
+                # Embedded by another model: the old vectors can't be compared with new queries
+                self.conn.execute("UPDATE memories SET embedding = NULL")
+                rows = []
+            for memory_id, namespace, blob in rows:
+                self.do_write_buckets(memory_id, namespace, self.index.buckets(np.frombuffer(blob, dtype=np.float32)))
+            # Versions only ever grow, so no process keeps using a copy loaded before the rebuild
+            version = self.conn.execute("SELECT COALESCE(MAX(version), 0) + 1 FROM memory_namespaces").fetchone()[0]
+            self.conn.execute("DELETE FROM memory_namespaces")
+            self.conn.execute(
+                "INSERT INTO memory_namespaces (namespace, items, version, reset_version) "
+                "SELECT namespace, COUNT(*), ?, ? FROM memories GROUP BY namespace",
+                (version, version),
+            )
+            self.conn.execute("INSERT OR REPLACE INTO memory_index_meta (key, value) VALUES ('layout', ?)", (layout,))
+            self.conn.commit()
+
+    def do_write_buckets(self, memory_id: int, namespace: str, buckets: list[int]) -> None:
+        self.conn.executemany(
+            "INSERT INTO memory_buckets (namespace, memory_id, tbl, bucket) VALUES (?, ?, ?, ?)",
+            [(namespace, memory_id, table, bucket) for table, bucket in enumerate(buckets)],
+        )
+
+    def do_item_text(self, value: dict, fields: list[str] = None) -> str:
+        fields = fields or self.fields
+        if fields:
+            return " ".join(text for field in fields for text in get_text_at_path(value, field))
+        return " ".join(self.do_strings(value))
+
+    def do_strings(self, value):
+        if isinstance(value, str):
+            yield value
+        elif isinstance(value, dict):
+            for v in value.values():
+                yield from self.do_strings(v)
+        elif isinstance(value, (list, tuple)):
+            for v in value:
+                yield from self.do_strings(v)
+
+    def batch(self, ops) -> list:
+        results = []
+        wrote = False
+        for op in ops:
+            if isinstance(op, GetOp):
+                results.append(self.do_get(op))
+            elif isinstance(op, PutOp):
+                self.do_put(op)
+                wrote = True
+                results.append(None)
+            elif isinstance(op, SearchOp):
+                results.append(self.do_search(op))
+            elif isinstance(op, ListNamespacesOp):
+                results.append(self.do_list_namespaces(op))
+            else:
+                raise ValueError(f"Unknown store operation: {op!r}")
+        if wrote:
+            # One commit per batch, not per put
+            with self.lock:
+                self.conn.commit()
+        return results
+
+    async def abatch(self, ops) -> list:
+        return await asyncio.to_thread(self.batch, list(ops))
+
+    def do_get(self, op: GetOp):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value, created_at, updated_at FROM memories WHERE namespace = ? AND key = ?",
+                (do_namespace_text(op.namespace), op.key),
+            ).fetchone()
+        if row is None:
+            return None
+        return Item(value=json.loads(row[0]), key=op.key, namespace=op.namespace,
+                    created_at=do_timestamp(row[1]), updated_at=do_timestamp(row[2]))
+
+    def do_put(self, op: PutOp) -> None:
+        namespace = do_namespace_text(op.namespace)
+        embedding = None
+        if op.value is not None and op.index is not False:
+            text = self.do_item_text(op.value, op.index)
+            if text:
+                embedding = np.asarray(self.embeddings.embed_query(text), dtype=np.float32)
+
+        with self.lock:
+            loaded = self.loaded.get(namespace)
+            row = self.conn.execute("SELECT id FROM memories WHERE namespace = ? AND key = ?", (namespace, op.key)).fetchone()
+            deleted = row is not None and op.value is None
+            added = (op.value is not None) - (row is not None)
+
+            # Per-namespace sizes, so prefix lookups don't scan the memories, and versions,
+            # so other processes know their in-memory copy is out of date. Written rows
+            # carry the version, so those copies only read back what changed; a delete
+            # leaves no row behind, so reset_version makes them reload in full.
+            # Emptied namespaces keep their row, so their version keeps counting up.
+            version = self.conn.execute(
+                """
+                INSERT INTO memory_namespaces (namespace, items, version) VALUES (?, ?, 1)
+                ON CONFLICT (namespace) DO UPDATE SET
+                    items = items + excluded.items,
+                    version = version + 1,
+                    reset_version = CASE WHEN ? THEN version + 1 ELSE reset_version END
+                RETURNING version
+                """,
+                (namespace, added, deleted),
+            ).fetchone()[0]
+
+            if row is not None:
+                self.conn.execute("DELETE FROM memory_buckets WHERE namespace = ? AND memory_id = ?", (namespace, row[0]))
+                if loaded is not None:
+                    loaded.remove(row[0])
+            if op.value is None:
+                self.conn.execute("DELETE FROM memories WHERE namespace = ? AND key = ?", (namespace, op.key))
+            else:
+                now = time.time()
+                memory_id = self.conn.execute(
+                    """
+                    INSERT INTO memories (namespace, key, value, embedding, created_at, updated_at, version)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (namespace, key) DO UPDATE SET
+                        value = excluded.value, embedding = excluded.embedding, updated_at = excluded.updated_at,
+                        version = excluded.version
+                    RETURNING id
+                    """,
+                    (namespace, op.key, json.dumps(op.value), embedding.tobytes() if embedding is not None else None,
+                     now, now, version),
+                ).fetchone()[0]
+                if embedding is not None:
+                    buckets = self.index.buckets(embedding)
+                    self.do_write_buckets(memory_id, namespace, buckets)
+                    if loaded is not None:
+                        loaded.add(memory_id, embedding, buckets)
+
+            # Still current if nobody else wrote since it was loaded; otherwise the
+            # next search reads back the rows written after loaded.version
+            if loaded is not None and loaded.version == version - 1:
+                loaded.version = version
+
+    def do_namespaces(self, prefix: tuple) -> dict[str, tuple[int, int]]:
+        """Non-empty stored namespaces under `prefix`, with their (version, reset_version)"""
+        if not prefix:
+            rows = self.conn.execute("SELECT namespace, version, reset_version FROM memory_namespaces WHERE items > 0")
+        else:
+            text = do_namespace_text(prefix)
+            rows = self.conn.execute(
+                "SELECT namespace, version, reset_version FROM memory_namespaces "
+                "WHERE items > 0 AND (namespace = ? OR substr(namespace, 1, ?) = ?)",
+                (text, len(text) + 1, text + _SEPARATOR),
+            )
+        return {namespace: (version, reset_version) for namespace, version, reset_version in rows}
+
+    def do_load_namespace(self, namespace: str, version: int, reset_version: int) -> _NamespaceIndex:
+        loaded = self.loaded.get(namespace)
+        if loaded is not None and loaded.version == version:
+            return loaded
+        if loaded is None or loaded.version < reset_version:
+            loaded = self.loaded[namespace] = _NamespaceIndex(self.dims, self.index.num_tables)
+            since = None
+        else:
+            # Only the rows written since this copy was loaded
+            since = loaded.version
+        loaded.version = version
+
+        condition, params = ("", (namespace,)) if since is None else (" AND version > ?", (namespace, since))
+        buckets = defaultdict(list)
+        for memory_id, table, bucket in self.conn.execute(
+            f"""
+            SELECT memory_id, tbl, bucket FROM memory_buckets
+            WHERE namespace = ? AND memory_id IN (SELECT id FROM memories WHERE namespace = ?{condition})
+            ORDER BY memory_id, tbl
+            """,
+            (namespace,) + params,
+        ):
+            buckets[memory_id].append(bucket)
+        for memory_id, blob in self.conn.execute(f"SELECT id, embedding FROM memories WHERE namespace = ?{condition}", params):
+            loaded.remove(memory_id)
+            if blob is not None:
+                loaded.add(memory_id, np.frombuffer(blob, dtype=np.float32), buckets[memory_id])
+        return loaded
+
+    def do_filter_condition(self, filter: dict) -> tuple[str, list]:
+        conditions, params = [], []
+        for field, expected in (filter or {}).items():
+            if isinstance(expected, (dict, list)):
+                conditions.append("json_extract(value, ?) = json(?)")
+                params += [f"$.{field}", json.dumps(expected)]
+            else:
+                conditions.append("json_extract(value, ?) = ?")
+                params += [f"$.{field}", expected]
+        return " AND ".join(conditions) or "1", params
+
+    def do_search(self, op: SearchOp) -> list:
+        filter_where, filter_params = self.do_filter_condition(op.filter)
+        query = np.asarray(self.embeddings.embed_query(op.query), dtype=np.float32) if op.query is not None else None
+        with self.lock:
+            namespaces = self.do_namespaces(op.namespace_prefix)
+            if not namespaces:
+                return []
+            versions = namespaces
+            namespaces = list(versions)
+            in_namespaces = f"namespace IN ({','.join('?' * len(namespaces))})"
+            if query is None:
+                rows = self.conn.execute(
+                    f"""
+                    SELECT namespace, key, value, created_at, updated_at FROM memories
+                    WHERE {in_namespaces} AND {filter_where}
+                    ORDER BY updated_at DESC LIMIT ? OFFSET ?
+                    """,
+                    namespaces + filter_params + [op.limit, op.offset],
+                ).fetchall()
+                return [self.do_search_item(row, None) for row in rows]
+
+            wanted = op.offset + op.limit
+            loaded = [self.do_load_namespace(namespace, *versions[namespace]) for namespace in namespaces]
+            probes = None
+            if any(len(namespace_index.rows) > self.exact_search_limit for namespace_index in loaded):
+                probes = self.index.probes(query)
+
+            ids, scores = [], []
+            for namespace_index in loaded:
+                namespace_ids, namespace_scores, approximate = self.do_score(namespace_index, query, probes, wanted)
+                if op.filter:
+                    keep = self.do_filter_ranked(namespace_ids, namespace_scores, filter_where, filter_params, wanted)
+                    if len(keep) < wanted and approximate:
+                        # Too few matches among the bucket neighbours: score every memory
+                        namespace_ids, namespace_scores, _ = self.do_score(namespace_index, query, None, wanted)
+                        keep = self.do_filter_ranked(namespace_ids, namespace_scores, filter_where, filter_params, wanted)
+                    namespace_ids, namespace_scores = namespace_ids[keep], namespace_scores[keep]
+                ids.append(namespace_ids)
+                scores.append(namespace_scores)
+            ids, scores = np.concatenate(ids), np.concatenate(scores)
+
+            if len(ids) > wanted:
+                top = np.argpartition(-scores, wanted - 1)[:wanted]
+                top = top[np.argsort(-scores[top])]
+            else:
+                top = np.argsort(-scores)
+            top = top[op.offset:]
+            if not len(top):
+                return []
+            top_ids, top_scores = ids[top].tolist(), scores[top].tolist()
+            by_id = {row[0]: row[1:] for row in self.conn.execute(
+                f"""
+                SELECT id, namespace, key, value, created_at, updated_at FROM memories
+                WHERE id IN ({','.join('?' * len(top_ids))})
+                """,
+                top_ids,
+            )}
+        return [self.do_search_item(by_id[memory_id], float(score)) for memory_id, score in zip(top_ids, top_scores)]
+
+    def do_score(self, namespace_index: _NamespaceIndex, query: np.ndarray, probes: list, wanted: int):
+        """(memory ids, scores, whether only bucket neighbours were scored) for one loaded namespace"""
+        if probes is not None and len(namespace_index.rows) > self.exact_search_limit:
+            rows = namespace_index.candidates(probes)
+            if len(rows) >= wanted:
+                return namespace_index.ids[rows], namespace_index.matrix[rows] @ query, True
+        # Small namespace, or too few neighbours in the buckets: score every memory
+        rows = namespace_index.all_rows()
+        return namespace_index.ids[rows], (namespace_index.matrix[:namespace_index.size] @ query)[rows], False
+
+    def do_filter_ranked(self, ids: np.ndarray, scores: np.ndarray, filter_where: str, filter_params: list,
+                         wanted: int) -> np.ndarray:
+        """Positions in `ids` of the first `wanted` memories, best score first, whose values match the filter"""
+        order = np.argsort(-scores)
+        ranked = ids[order].tolist()
+        matched, start, batch = [], 0, max(4 * wanted, 64)
+        while start < len(ranked) and len(matched) < wanted:
+            chunk = ranked[start:start + batch]
+            passed = {row[0] for row in self.conn.execute(
+                f"SELECT id FROM memories WHERE id IN ({','.join('?' * len(chunk))}) AND {filter_where}",
+                chunk + filter_params,
+            )}
+            matched.extend(start + i for i, memory_id in enumerate(chunk) if memory_id in passed)
+            start += batch
+            # Selective filters need more rows; stay well under sqlite's bound-variable limit
+            batch = min(4 * batch, 900)
+        return order[matched[:wanted]]
+
+    def do_search_item(self, row: tuple, score) -> SearchItem:
+        namespace, key, value, created_at, updated_at = row
+        return SearchItem(namespace=tuple(namespace.split(_SEPARATOR)), key=key, value=json.loads(value),
+                          created_at=do_timestamp(created_at), updated_at=do_timestamp(updated_at), score=score)
+
+    def do_list_namespaces(self, op: ListNamespacesOp) -> list[tuple]:
+        with self.lock:
+            rows = self.conn.execute("SELECT namespace FROM memory_namespaces WHERE items > 0").fetchall()
+        namespaces = set()
+        for (text,) in rows:
+            namespace = tuple(text.split(_SEPARATOR))
+            if all(self.do_matches(namespace, condition) for condition in op.match_conditions or ()):
+                namespaces.add(namespace[:op.max_depth] if op.max_depth is not None else namespace)
+        return sorted(namespaces)[op.offset:op.offset + op.limit]
+
+    @staticmethod
+    def do_matches(namespace: tuple, condition) -> bool:
+        path = tuple(condition.path)
+        if len(path) > len(namespace):
+            return False
+        part = namespace[:len(path)] if condition.match_type == "prefix" else namespace[len(namespace) - len(path):]
+        return all(p == "*" or p == n for p, n in zip(path, part))
+
+    def clear(self) -> None:
+        with self.lock:
+            self.conn.execute("DELETE FROM memory_buckets")
+            # Rows are kept so the versions keep counting up for other processes
+            self.conn.execute("UPDATE memory_namespaces SET items = 0, version = version + 1, reset_version = version + 1")
+            self.conn.execute("DELETE FROM memories")
+            self.conn.commit()
+            self.loaded.clear()
@@ -0,0 +1,74 @@
+from functools import lru_cache
+
+import tiktoken
+from langchain_core.messages import AIMessage, AnyMessage, trim_messages
+
+# Pre-model trimming stage for MessagesState agents.
+# Call `trim_for_model([sys_msg] + state["messages"])` right before invoking the
+# model: the system message is always kept, the rest of the history is cut from
+# the oldest end down to a token budget, and the kept window always starts on a
+# human message so a tool call is never separated from its tool result.
+
+# Tokens added per message by the chat format (role, separators)
+TOKENS_PER_MESSAGE = 3
+
+# Running totals, so the savings can be checked after a session
+trimming_stats = {"calls": 0, "tokens_before": 0, "tokens_after": 0}
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    """Load the tokenizer once per model, or None if it can't be loaded (e.g. offline)"""
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        print(f"⚠️ Could not load tokenizer for {model}, estimating tokens instead: {e}")
+        return None
+
+@lru_cache(maxsize=8192)
+def _count_text_tokens(model: str, text: str) -> int:
+    """Count tokens for a piece of text; repeated history messages hit the cache"""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text))
+
+def count_message_tokens(messages: list[AnyMessage], model: str = "gpt-4o") -> int:
+    """Approximate the prompt tokens of a list of messages, including tool call arguments"""
+    total = 0
+    for message in messages:
+        content = message.content if isinstance(message.content, str) else str(message.content)
+        total += TOKENS_PER_MESSAGE + _count_text_tokens(model, content)
+        if isinstance(message, AIMessage):
+            for tool_call in message.tool_calls:
+                total += _count_text_tokens(model, f"{tool_call['name']}{tool_call['args']}")
+    return total
+
+def trim_for_model(messages: list[AnyMessage], max_tokens: int = 4000, model: str = "gpt-4o") -> list[AnyMessage]:
+    """Trim the history to `max_tokens`, keeping the system message and tool call/result pairs"""
+    tokens_before = count_message_tokens(messages, model)
+    if tokens_before <= max_tokens:
+        trimmed, tokens_after = messages, tokens_before
+    else:
+        trimmed = trim_messages(
+            messages,
+            max_tokens=max_tokens,
+            strategy="last",
+            token_counter=lambda msgs: count_message_tokens(msgs, model),
+            include_system=True,
+            start_on="human",
+            allow_partial=False,
+        )
+        if not any(message.type != "system" for message in trimmed):
+            # The latest turn alone is over budget - send it anyway rather than an empty history
+            last_human = max((i for i, message in enumerate(messages) if message.type == "human"), default=len(messages) - 1)
+            trimmed = [message for message in messages[:last_human] if message.type == "system"] + messages[last_human:]
+        tokens_after = count_message_tokens(trimmed, model)
+        print(f"✂️ Trimmed prompt from {tokens_before} to {tokens_after} tokens ({len(messages)} -> {len(trimmed)} messages)")
+
+    trimming_stats["calls"] += 1
+    trimming_stats["tokens_before"] += tokens_before
+    trimming_stats["tokens_after"] += tokens_after
+    return trimmed
@@ -2,8 +2,14 @@ from langchain_core.messages import SystemMessage
 from langchain_openai import ChatOpenAI
 
 from langgraph.graph import START, StateGraph, MessagesState
-from langgraph.prebuilt import tools_condition, ToolNode
+from langgraph.prebuilt import tools_condition
 
+from message_trimming import trim_for_model
+from parallel_tools import create_parallel_tool_node
+from tool_cache import memoize_tool
+
+# Pure arithmetic, so repeated calls are answered from the cache
+@memoize_tool
 def add(a: int, b: int) -> int:
     """Adds a and b.
 
@@ -13,6 +19,7 @@ def add(a: int, b: int) -> int:
     """
     return a + b
 
+@memoize_tool
 def multiply(a: int, b: int) -> int:
     """Multiplies a and b.
 
@@ -22,6 +29,7 @@ def multiply(a: int, b: int) -> int:
     """
     return a * b
 
+@memoize_tool
 def divide(a: int, b: int) -> float:
     """Divide a and b.
 
@@ -40,14 +48,22 @@ llm_with_tools = llm.bind_tools(tools)
 # System message
 sys_msg = SystemMessage(content="You are a helpful assistant tasked with writing performing arithmetic on a set of inputs.")
 
+# Prompt budget for the history sent to the model on each turn
+MAX_PROMPT_TOKENS = 4000
+
+# Tool calls of one turn run concurrently on this many threads, each with its own timeout
+MAX_TOOL_WORKERS = 8
+TOOL_TIMEOUT_SECONDS = 10.0
+
 # Node
 def assistant(state: MessagesState):
-   return {"messages": [llm_with_tools.invoke([sys_msg] + state["messages"])]}
+   messages = trim_for_model([sys_msg] + state["messages"], max_tokens=MAX_PROMPT_TOKENS)
+   return {"messages": [llm_with_tools.invoke(messages)]}
 
 # Build graph
 builder = StateGraph(MessagesState)
 builder.add_node("assistant", assistant)
-builder.add_node("tools", ToolNode(tools))
+builder.add_node("tools", create_parallel_tool_node(tools, max_workers=MAX_TOOL_WORKERS, timeout_seconds=TOOL_TIMEOUT_SECONDS))
 builder.add_edge(START, "assistant")
 builder.add_conditional_edges(
     "assistant",
@@ -1,5 +1,5 @@
-from typing import Literal
 from langchain_core.messages import HumanMessage, SystemMessage, RemoveMessage
+from langchain_core.messages.utils import count_tokens_approximately, trim_messages
 from langgraph.graph import MessagesState
 from langgraph.graph import StateGraph, START, END
 
@@ -32,24 +32,48 @@ def call_model(state: State):
     response = model.invoke(messages)
     return {"messages": response}
 
-# Determine whether to end or summarize the conversation
-def should_continue(state: State) -> Literal["summarize_conversation", "__end__"]:
+# Token budgets for the conversation history
+MAX_HISTORY_TOKENS = 2000  # Summarize once the unsummarized history grows past this
+KEEP_RECENT_TOKENS = 500   # Most recent messages that stay verbatim after summarizing
+
+# Determine whether to summarize alongside this turn
+def should_summarize(state: State) -> list[str]:
     
-    """Return the next node to execute."""
+    """Return the nodes to execute for this turn."""
     
     messages = state["messages"]
     
-    # If there are more than six messages, then we summarize the conversation
-    if len(messages) > 6:
-        return "summarize_conversation"
+    # If the history is over budget, summarize the older messages in parallel with
+    # answering. Both run in the same step, so invoke() returns after the slower of
+    # the two (not after both in turn); streaming callers get the reply tokens
+    # as soon as they are generated
+    if count_tokens_approximately(messages) > MAX_HISTORY_TOKENS:
+        return ["conversation", "summarize_conversation"]
     
-    # Otherwise we can just end
-    return END
+    # Otherwise we can just answer
+    return ["conversation"]
 
 def summarize_conversation(state: State):
     
     # First get the summary if it exists
     summary = state.get("summary", "")
+    messages = state["messages"]
+
+    # Keep the most recent messages (and always the latest one) verbatim
+    recent = trim_messages(
+        messages,
+        max_tokens=KEEP_RECENT_TOKENS,
+        token_counter=count_tokens_approximately,
+        strategy="last",
+        start_on="human",
+    )
+    recent_ids = {m.id for m in recent}
+    
+    # Summarized messages are removed from state, so everything older than the
+    # recent window was added since the last summary
+    new_messages = [m for m in messages[:-1] if m.id not in recent_ids]
+    if not new_messages:
+        return {}
 
     # Create our summarization prompt 
     if summary:
@@ -64,12 +88,11 @@ def summarize_conversation(state: State):
         # If no summary exists, just create a new one
         summary_message = "Create a summary of the conversation above:"
 
-    # Add prompt to our history
-    messages = state["messages"] + [HumanMessage(content=summary_message)]
-    response = model.invoke(messages)
+    # Only send the new messages, the older ones are already in the summary
+    response = model.invoke(new_messages + [HumanMessage(content=summary_message)])
     
-    # Delete all but the 2 most recent messages and add our summary to the state 
-    delete_messages = [RemoveMessage(id=m.id) for m in state["messages"][:-2]]
+    # Delete the summarized messages and add our summary to the state 
+    delete_messages = [RemoveMessage(id=m.id) for m in new_messages]
     return {"summary": response.content, "messages": delete_messages}
 
 # Define a new graph
@@ -77,9 +100,10 @@ workflow = StateGraph(State)
 workflow.add_node("conversation", call_model)
 workflow.add_node(summarize_conversation)
 
-# Set the entrypoint as conversation
-workflow.add_edge(START, "conversation")
-workflow.add_conditional_edges("conversation", should_continue)
+# Answer every turn, and summarize old history at the same time when over budget.
+# A turn that summarizes takes max(reply, summary) for non-streaming callers
+workflow.add_conditional_edges(START, should_summarize, ["conversation", "summarize_conversation"])
+workflow.add_edge("conversation", END)
 workflow.add_edge("summarize_conversation", END)
 
 # Compile
@@ -8,6 +8,11 @@ from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, Tool
 from langchain_core.tools import tool
 from langchain_openai import ChatOpenAI
 
+from message_trimming import trim_for_model
+
+# Prompt budget for the history sent to the model on each turn
+MAX_PROMPT_TOKENS = 4000
+
 # Define the state structure
 class AgentState(TypedDict):
     messages: Annotated[list, add_messages]
@@ -43,7 +48,7 @@ Do not ask for any other information. After calling the tool, tell the user that
 
     def do_run_agent(state: AgentState):
         """Runs the agent LLM to get a response or tool call."""
-        messages = [prompt] + state['messages']
+        messages = trim_for_model([prompt] + state['messages'], max_tokens=MAX_PROMPT_TOKENS, model="gpt-4")
         ai_response = llm_with_tools.invoke(messages)
         return {"messages": [ai_response]}
 
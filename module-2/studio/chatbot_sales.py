@@ -2,7 +2,7 @@ from typing import Optional, List, Literal
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph import MessagesState
 from langchain_core.messages import AIMessage, HumanMessage
-from langchain_core.pydantic_v1 import BaseModel, Field
+from pydantic import BaseModel, Field, create_model
 from langchain_openai import ChatOpenAI
 from langgraph.types import Command, interrupt
 
@@ -10,13 +10,27 @@ class CustomerInfoState(MessagesState):
     budget: Optional[str]
     project_title: Optional[str]
     interaction_count: int
+    # Number of messages already sent to the extraction model
+    extracted_count: int
 
 class CustomerInfo(BaseModel):
      """Information to extract from the user's message."""
      budget: Optional[str] = Field(description="The budget for the project. If not mentioned, leave this field empty.")
      project_title: Optional[str] = Field(description="The title of the project. If not mentioned, leave this field empty.")
 
-extraction_model = ChatOpenAI(model="gpt-4o", temperature=0).with_structured_output(CustomerInfo)
+extraction_llm = ChatOpenAI(model="gpt-4o", temperature=0)
+extraction_model = extraction_llm.with_structured_output(CustomerInfo)
+
+# Extraction models by the tuple of fields they ask for, built on first use
+_extractors = {tuple(CustomerInfo.model_fields): extraction_model}
+
+def get_extractor(missing: tuple) -> object:
+    """Extraction model whose schema only has the `missing` CustomerInfo fields"""
+    if missing not in _extractors:
+        fields = {name: (Optional[str], Field(description=CustomerInfo.model_fields[name].description)) for name in missing}
+        schema = create_model("CustomerInfo", __doc__=CustomerInfo.__doc__, **fields)
+        _extractors[missing] = extraction_llm.with_structured_output(schema)
+    return _extractors[missing]
 
 def check_and_route(state: CustomerInfoState) -> Literal["ask_questions", "complete"]:
     """
@@ -74,9 +88,9 @@ def ask_questions(state: CustomerInfoState) -> dict:
     }
 
 def collect_info(state: CustomerInfoState) -> dict:
-    """Collect information from user response based on the whole conversation."""
+    """Collect information from the messages added since the last extraction."""
     print("---Collecting User Response---")
-    location = interrupt()
+    location = interrupt("Waiting for the user's answer")
 
     if not state.get('messages'):
         return {}
@@ -85,20 +99,23 @@ def collect_info(state: CustomerInfoState) -> dict:
     if not isinstance(last_message, HumanMessage):
         return {}
 
-    # Ask the model to fill a form based on the conversation history.
-    extracted_info: CustomerInfo = extraction_model.invoke(state['messages'])
-    
-    updates = {}
-    
-    # Only update if the field was extracted and is not already set in the state.
-    if extracted_info.budget and not state.get("budget"):
-        updates["budget"] = extracted_info.budget
-        print(f"Extracted budget: {extracted_info.budget}")
-    
-    if extracted_info.project_title and not state.get("project_title"):
-        updates["project_title"] = extracted_info.project_title
-        print(f"Extracted project title: {extracted_info.project_title}")
-    
+    updates = {"extracted_count": len(state['messages'])}
+
+    # Only ask for the fields that are still missing, and skip the model once the form is full.
+    missing = tuple(name for name in CustomerInfo.model_fields if not (state.get(name) or "").strip())
+    if not missing:
+        return updates
+
+    # Earlier messages were already extracted: send only the latest questions and answers.
+    new_messages = state['messages'][state.get('extracted_count') or 0:]
+    extracted_info = get_extractor(missing).invoke(new_messages)
+
+    for name in missing:
+        value = getattr(extracted_info, name)
+        if value:
+            updates[name] = value
+            print(f"Extracted {name.replace('_', ' ')}: {value}")
+
     # Don't create a new message, just return the updates
     return updates
 
@@ -0,0 +1,15 @@
+import os
+
+from lazy_graph_loader import do_install_lazy_graphs, do_print_report
+
+STUDIO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Entry point for langgraph.json: one factory per graph in studio_graphs.json,
+# each importing its graph on the first request (see lazy_graph_loader.py).
+# `python studio_loader.py` loads every graph and prints the import-time breakdown.
+
+loader = do_install_lazy_graphs(globals(), STUDIO_DIR)
+
+if __name__ == "__main__":
+    loader.do_preload(list(loader.registry))
+    do_print_report(loader.report())
@@ -4,16 +4,50 @@ import uuid
 from langgraph.constants import START, END
 from langgraph.graph import StateGraph
 from langgraph.types import interrupt, Command, Interrupt
+from langgraph.func import task
 from langgraph.checkpoint.memory import InMemorySaver
 
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
 import os
 
+from extraction_pipeline import ExtractionPipeline, do_make_age_parser, do_parse_int, do_parse_age_in_text, do_print_pipeline_stats, pipeline_stats
+
 # Define graph state
 class State(TypedDict):
     age: int
 
+# Whole-number input first, then an age stated in a sentence; only 0-120 counts as an age
+age_pipeline = ExtractionPipeline("age", [
+    ("int", do_make_age_parser(do_parse_int)),
+    ("regex", do_make_age_parser(do_parse_age_in_text)),
+])
+
+EXPLAIN_INVALID_AGE_PROMPT = (
+    "You are a helpful assistant. The user was asked to enter their age as a non-negative integer, "
+    "but they entered an invalid value. Kindly explain to the user why their input is not valid."
+)
+
+# interrupt() re-runs get_valid_age from the top on every resume. Work done
+# between interrupts goes through tasks: their results are saved with the
+# checkpoint and read back on replay instead of being run again, so the N-th
+# resume makes at most one LLM call instead of N.
+@task
+def do_extract_age(user_input: str):
+    """The age in the input, or None if it needs an explanation"""
+    result = age_pipeline.extract(user_input)
+    if result is not None and result.confidence >= age_pipeline.min_confidence:
+        return result.value
+    return None
+
+@task
+def do_llm_explain_invalid_age(user_input: str) -> str:
+    response = llm.invoke([
+        {"role": "system", "content": EXPLAIN_INVALID_AGE_PROMPT},
+        {"role": "user", "content": f"The user entered: '{user_input}'."}
+    ])
+    return response.content
+
 # Node that asks for human input and validates it
 def get_valid_age(state: State) -> State:
     prompt = "Please enter your age:"
@@ -21,28 +55,13 @@ def get_valid_age(state: State) -> State:
     while True:
         user_input = interrupt(prompt)
 
-        # Validate the input
-        try:
-            age = int(user_input)
-            if age < 0:
-                raise ValueError("Age must be non-negative.")
+        # Validate the input; "42" and "I'm 42" are parsed without the LLM
+        age = do_extract_age(user_input).result()
+        if age is not None:
             break  # Valid input received
-        except (ValueError, TypeError):
-            # Use an LLM to explain why the input is invalid and prompt again
-            def do_llm_explain_invalid_age(user_input):
-
-                system_prompt = (
-                    "You are a helpful assistant. The user was asked to enter their age as a non-negative integer, "
-                    "but they entered an invalid value. Kindly explain to the user why their input is not valid."
-                )
-                user_message = f"The user entered: '{user_input}'."
-                response = llm.invoke([
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ])
-                return response.content
-
-            prompt = do_llm_explain_invalid_age(user_input)
+
+        # Use an LLM to explain why the input is invalid and prompt again
+        prompt = do_llm_explain_invalid_age(user_input).result()
 
     return {"age": age}
 
@@ -89,6 +108,7 @@ def run_interactive_graph():
     
     # Print the final result
     print("\nFinal result:", result)
+    do_print_pipeline_stats(pipeline_stats())
 
 if __name__ == "__main__":
     load_dotenv("../.env")
@@ -5,6 +5,7 @@ import uuid
 from langgraph.constants import START, END
 from langgraph.graph import StateGraph
 from langgraph.types import interrupt, Command, Interrupt
+from langgraph.func import task
 from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.graph import MessagesState
 from langchain_core.messages import AIMessage, HumanMessage, AnyMessage, SystemMessage
@@ -15,46 +16,67 @@ from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
 import os
 
+from extraction_pipeline import ExtractionPipeline, do_make_age_parser, do_parse_int, do_parse_age_in_text, do_print_pipeline_stats, pipeline_stats
+
 # Define graph state
 class State(MessagesState):
     age: int
 
+# Whole-number input first, then an age stated in a sentence; only 0-120 counts as an age
+age_pipeline = ExtractionPipeline("age", [
+    ("int", do_make_age_parser(do_parse_int)),
+    ("regex", do_make_age_parser(do_parse_age_in_text)),
+])
+
+EXPLAIN_INVALID_AGE_PROMPT = (
+    "You are a helpful assistant. The user was asked to enter their age as a non-negative integer, "
+    "but they entered an invalid value. Kindly explain to the user why their input is not valid."
+)
+
+# interrupt() re-runs get_valid_age from the top on every resume. Work done
+# between interrupts goes through tasks: their results are saved with the
+# checkpoint and read back on replay instead of being run again, so the N-th
+# resume makes at most one LLM call instead of N.
+@task
+def do_extract_age(user_input: str):
+    """The age in the input, or None if it needs an explanation"""
+    result = age_pipeline.extract(user_input)
+    if result is not None and result.confidence >= age_pipeline.min_confidence:
+        return result.value
+    return None
+
+@task
+def do_llm_explain_invalid_age(user_input: str) -> AIMessage:
+    return llm.invoke([
+        SystemMessage(content=EXPLAIN_INVALID_AGE_PROMPT),
+        HumanMessage(content=f"The user entered: '{user_input}'."),
+    ])
+
 # Node that asks for human input and validates it
 def get_valid_age(state: State) -> State:
-    if "messages" not in state:
-        state["messages"] = []
-    
+    # Messages of this node only; the add_messages reducer appends them to the history
+    new_messages = []
     prompt = "Please enter your age:"
 
     while True:
         user_input = interrupt(prompt)
-        
-        # Add user message to state
-        state["messages"] = state["messages"] + [HumanMessage(content=user_input)]
-
-        # Validate the input
-        try:
-            age = int(user_input)
-            if age < 0:
-                raise ValueError("Age must be non-negative.")
+        new_messages.append(HumanMessage(content=user_input))
+
+        # Validate the input; "42" and "I'm 42" are parsed without the LLM
+        age = do_extract_age(user_input).result()
+        if age is not None:
             break  # Valid input received
-        except (ValueError, TypeError):
-            # Use an LLM to explain why the input is invalid and prompt again
-            def do_llm_explain_invalid_age(user_input, messages: List[AnyMessage]) -> str:
-                system_message = SystemMessage(content=(
-                    "You are a helpful assistant. The user was asked to enter their age as a non-negative integer, "
-                    "but they entered an invalid value. Kindly explain to the user why their input is not valid."
-                ))
-                user_message = HumanMessage(content=f"The user entered: '{user_input}'.")
-                response = llm.invoke([system_message, user_message])
-                
-                # Add assistant's response to messages
-                messages.extend([system_message, user_message, response])
-                return response.content
-
-            prompt = do_llm_explain_invalid_age(user_input, state["messages"])
-
-    return {"age": age, "messages": state["messages"]}
+
+        # Use an LLM to explain why the input is invalid and prompt again
+        response = do_llm_explain_invalid_age(user_input).result()
+        new_messages.extend([
+            SystemMessage(content=EXPLAIN_INVALID_AGE_PROMPT),
+            HumanMessage(content=f"The user entered: '{user_input}'."),
+            response,
+        ])
+        prompt = response.content
+
+    return {"age": age, "messages": new_messages}
 
 # Node that uses the valid input
 def report_age(state: State) -> State:
@@ -103,6 +125,7 @@ def run_interactive_graph():
     
     # Print the final result
     print("\nFinal result:", result)
+    do_print_pipeline_stats(pipeline_stats())
 
 if __name__ == "__main__":
     load_dotenv()
@@ -6,6 +6,8 @@ from langgraph.graph import StateGraph
 from langgraph.types import interrupt, Command
 from langgraph.checkpoint.memory import InMemorySaver
 
+from graph_render import do_save_graph_image_async
+
 # Define the shared graph state
 class State(TypedDict):
     llm_output: str
@@ -52,13 +54,9 @@ builder.add_edge("rejected_path", END)
 checkpointer = InMemorySaver()
 graph = builder.compile(checkpointer=checkpointer)
 
-try:
-    png_data = graph.get_graph().draw_mermaid_png()
-    with open("graph.png", "wb") as f:
-        f.write(png_data)
-    print("Graph saved as graph.png")
-except Exception as e:
-    print(f"Could not save PNG: {e}")
+# Drawn locally in the background and cached, so the run doesn't wait for it
+do_save_graph_image_async(graph, "graph.png")
+
 # Run until interrupt
 config = {"configurable": {"thread_id": uuid.uuid4()}}
 result = graph.invoke({}, config=config)
@@ -0,0 +1,75 @@
+from collections import OrderedDict
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+# Compact context for agents that receive a handoff (supervisor workers, swarm agents).
+# The shared `messages` history keeps everything, but an agent's model only needs
+# the user's request, a little recent conversation and its own work since it took
+# over - not the tool traffic of every agent before it. Pass the hook to
+# create_react_agent:
+#
+#   create_react_agent(model, tools, name="Bob", pre_model_hook=make_handoff_context_hook(last_k=4))
+#
+# It returns `llm_input_messages`, so only the model input is compacted and the
+# graph state is left untouched. With a `summarizer` model, the messages left out
+# are replaced by a short summary instead of being dropped.
+
+# Running totals, so the savings can be checked after a session
+handoff_stats = {"calls": 0, "messages_before": 0, "messages_after": 0}
+
+SUMMARY_PROMPT = "Summarize the conversation above in a few sentences, keeping any facts, numbers and decisions."
+
+def do_is_handoff_message(message) -> bool:
+    return isinstance(message, ToolMessage) and (message.name or "").startswith("transfer_to_")
+
+def do_is_conversation_message(message) -> bool:
+    """User turns and plain agent replies; tool calls and tool results are left out"""
+    if isinstance(message, HumanMessage):
+        return True
+    return isinstance(message, AIMessage) and not message.tool_calls and bool(message.content)
+
+def do_compact_handoff_context(messages: list, last_k: int = 4) -> tuple[list, list]:
+    """Split the history into (messages to send, conversation messages left out)"""
+    # The agent's own work starts after the latest user turn or handoff to it
+    boundary = 0
+    for i, message in enumerate(messages):
+        if isinstance(message, HumanMessage) or do_is_handoff_message(message):
+            boundary = i + 1
+    earlier, own_work = messages[:boundary], messages[boundary:]
+
+    conversation = [m for m in earlier if do_is_conversation_message(m)]
+    kept = conversation[-last_k:] if last_k > 0 else []
+
+    # Always keep the request being worked on
+    last_human = next((m for m in reversed(earlier) if isinstance(m, HumanMessage)), None)
+    if last_human is not None and not any(m is last_human for m in kept):
+        kept = [last_human] + kept
+    kept_ids = {id(m) for m in kept}
+    omitted = [m for m in conversation if id(m) not in kept_ids]
+    return kept + own_work, omitted
+
+def make_handoff_context_hook(last_k: int = 4, summarizer=None, cache_size: int = 128):
+    """pre_model_hook that sends an agent's model only the compact handoff context"""
+    summaries = OrderedDict()
+
+    def do_summarize(omitted: list) -> str:
+        key = tuple(m.id for m in omitted)
+        if key not in summaries:
+            summaries[key] = summarizer.invoke(omitted + [HumanMessage(content=SUMMARY_PROMPT)]).content
+            while len(summaries) > cache_size:
+                summaries.popitem(last=False)
+        summaries.move_to_end(key)
+        return summaries[key]
+
+    def handoff_context(state: dict) -> dict:
+        messages = state["messages"]
+        compact, omitted = do_compact_handoff_context(messages, last_k)
+        if summarizer is not None and omitted:
+            compact = [SystemMessage(content=f"Summary of the earlier conversation: {do_summarize(omitted)}")] + compact
+
+        handoff_stats["calls"] += 1
+        handoff_stats["messages_before"] += len(messages)
+        handoff_stats["messages_after"] += len(compact)
+        return {"llm_input_messages": compact}
+
+    return handoff_context
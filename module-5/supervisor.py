@@ -5,6 +5,9 @@ from langgraph.prebuilt import create_react_agent
 
 from rich import print
 
+from fast_path_router import FastPathRouter, do_build_fast_path_graph
+from handoff_context import make_handoff_context_hook
+
 model = ChatOpenAI(model="gpt-4o")
 
 # Create specialized agents
@@ -32,14 +35,17 @@ math_agent = create_react_agent(
     model=model,
     tools=[add, multiply],
     name="math_expert",
-    prompt="You are a math expert. Always use one tool at a time."
+    prompt="You are a math expert. Always use one tool at a time.",
+    # Only the request, recent replies and its own work go to the model, not the whole team's history
+    pre_model_hook=make_handoff_context_hook(last_k=4),
 )
 
 research_agent = create_react_agent(
     model=model,
     tools=[web_search],
     name="research_expert",
-    prompt="You are a world class researcher with access to web search. Do not do any math."
+    prompt="You are a world class researcher with access to web search. Do not do any math.",
+    pre_model_hook=make_handoff_context_hook(last_k=4),
 )
 
 # Create supervisor workflow
@@ -53,14 +59,23 @@ workflow = create_supervisor(
     )
 )
 
-# Compile and run
-app = workflow.compile()
-result = app.invoke({
-    "messages": [
-        {
-            "role": "user",
-            "content": "what's the combined headcount of the FAANG companies in 2024?"
-        }
-    ]
+# Requests that clearly need only one expert skip the supervisor model
+router = FastPathRouter({
+    "math_expert": [r"\b(add|sum|plus|multiply|times|product|total|combined)\b", r"\d+\s*[-+*/x]\s*\d+"],
+    "research_expert": [r"\b(search|look up|news|latest|current|headcount|who|when)\b"],
 })
-print(result)
\ No newline at end of file
+
+# Compile and run
+supervisor_app = workflow.compile()
+app = do_build_fast_path_graph(supervisor_app, {"math_expert": math_agent, "research_expert": research_agent}, router)
+
+if __name__ == "__main__":
+    result = app.invoke({
+        "messages": [
+            {
+                "role": "user",
+                "content": "what's the combined headcount of the FAANG companies in 2024?"
+            }
+        ]
+    })
+    print(result)
\ No newline at end of file
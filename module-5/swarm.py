@@ -6,6 +6,8 @@ from langgraph_swarm import create_handoff_tool, create_swarm
 
 from rich import print
 
+from handoff_context import make_handoff_context_hook, handoff_stats
+
 model = ChatOpenAI(model="gpt-4o")
 
 def add(a: int, b: int) -> int:
@@ -17,6 +19,8 @@ alice = create_react_agent(
     [add, create_handoff_tool(agent_name="Bob")],
     prompt="You are Alice, an addition expert.",
     name="Alice",
+    # Only the request, recent replies and its own work go to the model, not the other agent's tool traffic
+    pre_model_hook=make_handoff_context_hook(last_k=4),
 )
 
 bob = create_react_agent(
@@ -24,6 +28,7 @@ bob = create_react_agent(
     [create_handoff_tool(agent_name="Alice", description="Transfer to Alice, she can help with math")],
     prompt="You are Bob, you speak like a pirate.",
     name="Bob",
+    pre_model_hook=make_handoff_context_hook(last_k=4),
 )
 
 checkpointer = InMemorySaver()
@@ -33,14 +38,16 @@ workflow = create_swarm(
 )
 app = workflow.compile(checkpointer=checkpointer)
 
-config = {"configurable": {"thread_id": "1"}}
-turn_1 = app.invoke(
-    {"messages": [{"role": "user", "content": "i'd like to speak to Bob"}]},
-    config,
-)
-print(turn_1)
-turn_2 = app.invoke(
-    {"messages": [{"role": "user", "content": "what's 5 + 7?"}]},
-    config,
-)
-print(turn_2)
\ No newline at end of file
+if __name__ == "__main__":
+    config = {"configurable": {"thread_id": "1"}}
+    turn_1 = app.invoke(
+        {"messages": [{"role": "user", "content": "i'd like to speak to Bob"}]},
+        config,
+    )
+    print(turn_1)
+    turn_2 = app.invoke(
+        {"messages": [{"role": "user", "content": "what's 5 + 7?"}]},
+        config,
+    )
+    print(turn_2)
+    print(handoff_stats)
\ No newline at end of file
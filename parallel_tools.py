@@ -0,0 +1,132 @@
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from langchain_core.tools import BaseTool, StructuredTool, tool as make_tool
+from langgraph.prebuilt import ToolNode
+
+# Tool execution for ReAct agents whose model emits several tool calls per turn.
+# ToolNode already dispatches the calls of one AIMessage concurrently and returns
+# the ToolMessages in tool-call order. `create_parallel_tool_node` adds:
+#   - a bounded thread pool that all sync tools of the node run on
+#   - a timeout per tool, counted from when the tool starts: a call queued behind
+#     a busy pool is not timed out while it waits for a worker (async tools are
+#     cancelled, sync ones are abandoned - a Python thread can't be killed, so it
+#     finishes in the background and its outcome is printed when it does)
+#   - error isolation: a failing or timed-out call becomes an error ToolMessage
+#     and the other calls of the turn still return their results
+
+class ToolTimeoutError(TimeoutError):
+    pass
+
+def do_timeout_error(name: str, timeout_seconds: float, still_running: bool) -> ToolTimeoutError:
+    if still_running:
+        # Tell the model, so it checks before retrying a tool that writes something
+        return ToolTimeoutError(f"{name} did not finish within {timeout_seconds}s. It is still running "
+                                f"and may still complete, so check its effect before calling it again.")
+    return ToolTimeoutError(f"{name} did not finish within {timeout_seconds}s and was cancelled")
+
+class PoolCall:
+    """One sync tool call on the pool. Its timeout starts when a worker picks it up, not when it is queued"""
+
+    def __init__(self, pool: ThreadPoolExecutor, name: str, func, kwargs: dict, loop: asyncio.AbstractEventLoop = None):
+        self.name = name
+        self.started_at = None
+        self.started = threading.Event()
+        # Set on `loop` for async callers, which can't block on the threading.Event
+        self.loop = loop
+        self.astarted = asyncio.Event() if loop else None
+        self.afinished = asyncio.Event() if loop else None
+        # Keep the caller's context (callbacks, tracing) in the pool thread
+        context = contextvars.copy_context()
+        self.future = pool.submit(context.run, self.do_start, func, kwargs)
+
+    def do_signal(self, event: asyncio.Event):
+        if self.loop:
+            try:
+                self.loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # The caller's loop is gone; nobody waits for this call
+
+    def do_start(self, func, kwargs):
+        self.started_at = time.monotonic()
+        self.started.set()
+        self.do_signal(self.astarted)
+        try:
+            return func(kwargs)
+        finally:
+            self.do_signal(self.afinished)
+
+    def remaining(self, timeout_seconds: float) -> float:
+        return max(0.0, self.started_at + timeout_seconds - time.monotonic())
+
+    def do_abandon(self, timeout_seconds: float) -> ToolTimeoutError:
+        """Stop waiting for the call and print how it ends once it does"""
+        def do_report(future):
+            late = time.monotonic() - self.started_at - timeout_seconds
+            error = future.exception()
+            outcome = f"failed: {error}" if error else "completed"
+            print(f"⚠️ Tool {self.name} {outcome} {late:.1f}s after its {timeout_seconds}s timeout")
+
+        self.future.add_done_callback(do_report)
+        return do_timeout_error(self.name, timeout_seconds, still_running=True)
+
+def do_wrap_tool(base: BaseTool, pool: ThreadPoolExecutor, timeout_seconds: float) -> StructuredTool:
+    """Same name, description and arguments as `base`, but run on `pool` with a timeout"""
+
+    async_only = isinstance(base, StructuredTool) and base.func is None
+
+    def do_call(kwargs):
+        # Async-only tools get their own event loop in the pool thread
+        return asyncio.run(base.ainvoke(kwargs)) if async_only else base.invoke(kwargs)
+
+    def do_run(**kwargs):
+        call = PoolCall(pool, base.name, do_call, kwargs)
+        # Waiting for a free worker does not count against the tool's timeout
+        call.started.wait()
+        try:
+            return call.future.result(timeout=call.remaining(timeout_seconds))
+        except FutureTimeoutError:
+            raise call.do_abandon(timeout_seconds) from None
+
+    async def do_arun(**kwargs):
+        if isinstance(base, StructuredTool) and base.coroutine is None:
+            # Sync tool: run it on the pool instead of the event loop's default executor
+            call = PoolCall(pool, base.name, base.invoke, kwargs, loop=asyncio.get_running_loop())
+            await call.astarted.wait()
+            try:
+                await asyncio.wait_for(call.afinished.wait(), timeout=call.remaining(timeout_seconds))
+            except asyncio.TimeoutError:
+                raise call.do_abandon(timeout_seconds) from None
+            return call.future.result()
+        try:
+            return await asyncio.wait_for(base.ainvoke(kwargs), timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            raise do_timeout_error(base.name, timeout_seconds, still_running=False) from None
+
+    return StructuredTool.from_function(
+        func=do_run,
+        coroutine=do_arun,
+        name=base.name,
+        description=base.description,
+        args_schema=base.args_schema,
+        return_direct=base.return_direct,
+    )
+
+def create_parallel_tool_node(tools: list, max_workers: int = 8, timeout_seconds: float = 30.0,
+                              timeouts: dict[str, float] = None, name: str = "tools") -> ToolNode:
+    """ToolNode that runs the tool calls of a turn concurrently on a pool of `max_workers` threads.
+
+    `timeouts` overrides `timeout_seconds` for individual tools, by tool name.
+    """
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-pool")
+    timeouts = timeouts or {}
+    wrapped = []
+    for t in tools:
+        base = t if isinstance(t, BaseTool) else make_tool(t)
+        wrapped.append(do_wrap_tool(base, pool, timeouts.get(base.name, timeout_seconds)))
+
+    # Errors (including timeouts) are returned to the model as error ToolMessages
+    return ToolNode(wrapped, name=name, handle_tool_errors=True)
@@ -0,0 +1,131 @@
+import asyncio
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+# Production checkpointer for the workflows in this repo.
+# Same tables as SqliteSaver (so existing databases like module-2/state_db/example.db
+# keep working), but tuned for many concurrent threads:
+#   - WAL journal, so readers never block the writer and vice versa
+#   - a pool of read-only connections for get_state / history lookups
+#   - one writer connection that never keeps a transaction open between calls,
+#     so other processes (workers, checkpoint compaction) can always write
+#   - the rows written by one put() are committed together in one transaction.
+#     Each put_writes() call is its own short transaction: grouping a superstep's
+#     task writes with its checkpoint would mean holding the write lock while
+#     sibling nodes run or while the run waits at an interrupt
+#   - async methods, so the same saver works with ainvoke/astream
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "module-2", "state_db", "checkpoints.db")
+
+class PooledSqliteSaver(SqliteSaver):
+    """SqliteSaver with WAL, a reader connection pool and one writer that commits after every call"""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, *, readers: int = 4, serde=None):
+        if path == ":memory:":
+            raise ValueError("PooledSqliteSaver needs a database file; use InMemorySaver for in-memory checkpoints")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        super().__init__(self._connect(path), serde=serde)
+        self.path = path
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # Re-entrant, so write_batch() can hold it around cursor() calls
+        self.lock = threading.RLock()
+        self.batch_depth = 0
+
+        self.reader_pool = queue.Queue()
+        for _ in range(readers):
+            reader = self._connect(path)
+            reader.execute("PRAGMA query_only=ON")
+            self.reader_pool.put(reader)
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        return sqlite3.connect(path, check_same_thread=False, timeout=30)
+
+    @contextmanager
+    def cursor(self, transaction: bool = True):
+        if transaction:
+            # Writes go through the single writer connection and are committed right
+            # away, unless they are part of a write_batch()
+            with self.lock:
+                self.setup()
+                cur = self.conn.cursor()
+                try:
+                    yield cur
+                finally:
+                    cur.close()
+                    if self.batch_depth == 0:
+                        self.conn.commit()
+            return
+
+        # Reads go to a pooled connection; they only ever see committed writes
+        if not self.is_setup:
+            with self.lock:
+                self.setup()
+        reader = self.reader_pool.get()
+        try:
+            cur = reader.cursor()
+            try:
+                yield cur
+            finally:
+                cur.close()
+        finally:
+            self.reader_pool.put(reader)
+
+    @contextmanager
+    def write_batch(self):
+        """Commit every write made inside the block in one transaction, or none of them"""
+        with self.lock:
+            self.setup()
+            self.batch_depth += 1
+            try:
+                yield
+            except BaseException:
+                self.batch_depth -= 1
+                if self.batch_depth == 0:
+                    self.conn.rollback()
+                raise
+            self.batch_depth -= 1
+            if self.batch_depth == 0:
+                self.conn.commit()
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        with self.write_batch():
+            return super().put(config, checkpoint, metadata, new_versions)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self.write_batch():
+            super().delete_thread(thread_id)
+
+    def close(self) -> None:
+        while not self.reader_pool.empty():
+            self.reader_pool.get().close()
+        self.conn.close()
+
+    # Async variant: the blocking sqlite calls run in worker threads, where the
+    # reader pool lets several of them proceed at once.
+
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        checkpoints = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint in checkpoints:
+            yield checkpoint
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path: str = ""):
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return await asyncio.to_thread(self.delete_thread, thread_id)
@@ -0,0 +1,108 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+import uuid
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+from langgraph.types import Command, interrupt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checkpoint_compaction import CompactionJob, do_compact_checkpoints
+from delta_checkpointer import DeltaSqliteSaver
+from sqlite_checkpointer import PooledSqliteSaver
+
+# Compaction runs next to a live app: it must not wait on, or break, a thread
+# that another saver has paused at an interrupt.
+#
+#   python -m unittest discover tests
+
+TURNS = 6
+
+class State(MessagesState):
+    turn: int
+
+def do_reply(state: State) -> dict:
+    turn = state.get("turn", 0) + 1
+    return {"messages": [AIMessage(content=f"reply {turn}")], "turn": turn}
+
+def do_continue(state: State) -> str:
+    return "reply" if state["turn"] < TURNS else "ask"
+
+def do_ask(state: State) -> dict:
+    return {"messages": [HumanMessage(content=interrupt("Anything else?"))]}
+
+def do_build_graph(checkpointer):
+    builder = StateGraph(State)
+    builder.add_node("reply", do_reply)
+    builder.add_node("ask", do_ask)
+    builder.add_edge(START, "reply")
+    builder.add_conditional_edges("reply", do_continue, ["reply", "ask"])
+    builder.add_edge("ask", END)
+    return builder.compile(checkpointer=checkpointer)
+
+def do_count_checkpoints(path: str, config: dict) -> int:
+    # Counted on a separate connection: reading through the saver could change what it has committed
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM checkpoints WHERE thread_id = ?",
+                            (config["configurable"]["thread_id"],)).fetchone()[0]
+    finally:
+        conn.close()
+
+class CompactionWithPausedThreadTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "checkpoints.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def do_pause_thread(self, saver_class):
+        saver = saver_class(self.path)
+        graph = do_build_graph(saver)
+        config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        result = graph.invoke({"messages": [HumanMessage(content="hi")]}, config)
+        self.assertIn("__interrupt__", result)
+        self.addCleanup(saver.close)
+        return saver, graph, config
+
+    def do_check_compaction(self, saver_class):
+        saver, graph, config = self.do_pause_thread(saver_class)
+        checkpoints_before = do_count_checkpoints(self.path, config)
+
+        started = time.perf_counter()
+        report = do_compact_checkpoints(self.path, keep_latest=1)
+        self.assertLess(time.perf_counter() - started, 5)
+        self.assertGreater(report["deleted_checkpoints"], 0)
+        self.assertLess(do_count_checkpoints(self.path, config), checkpoints_before)
+
+        # The paused thread resumes from its compacted history
+        result = graph.invoke(Command(resume="no thanks"), config)
+        self.assertEqual([m.content for m in result["messages"]],
+                         ["hi"] + [f"reply {turn}" for turn in range(1, TURNS + 1)] + ["no thanks"])
+
+    def test_compact_next_to_paused_pooled_saver(self):
+        self.do_check_compaction(PooledSqliteSaver)
+
+    def test_compact_next_to_paused_delta_saver(self):
+        self.do_check_compaction(DeltaSqliteSaver)
+
+    def test_compaction_job_next_to_paused_saver(self):
+        saver, graph, config = self.do_pause_thread(DeltaSqliteSaver)
+        job = CompactionJob(self.path, interval_seconds=60, keep_latest=1).start()
+        deadline = time.time() + 10
+        while job.last_report is None and time.time() < deadline:
+            time.sleep(0.05)
+        job.stop()
+
+        self.assertIsNotNone(job.last_report, "compaction did not finish next to the paused thread")
+        self.assertGreater(job.last_report["deleted_checkpoints"], 0)
+        self.assertNotIn("__interrupt__", graph.invoke(Command(resume="bye"), config))
+
+if __name__ == "__main__":
+    unittest.main()
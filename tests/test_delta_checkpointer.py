@@ -0,0 +1,138 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delta_checkpointer import DELTA_KEY, DeltaSqliteSaver, do_apply_delta, do_diff_messages
+
+# Checkpoints store only what changed in the message list; every checkpoint
+# must still read back exactly as a plain checkpointer would have stored it.
+#
+#   python -m unittest discover tests
+
+def do_reply(state: MessagesState) -> dict:
+    return {"messages": [AIMessage(content=f"reply to {state['messages'][-1].content}")]}
+
+def do_trim(state: MessagesState) -> dict:
+    # Like chatbot.py: keep the last four messages once the thread grows
+    return {"messages": [RemoveMessage(id=m.id) for m in state["messages"][:-4]]}
+
+def do_build_graph(checkpointer):
+    builder = StateGraph(MessagesState)
+    builder.add_node("reply", do_reply)
+    builder.add_node("trim", do_trim)
+    builder.add_edge(START, "reply")
+    builder.add_edge("reply", "trim")
+    builder.add_edge("trim", END)
+    return builder.compile(checkpointer=checkpointer)
+
+def do_run_turns(graph, config: dict, turns: int) -> None:
+    for turn in range(turns):
+        graph.invoke({"messages": [HumanMessage(content=f"message {turn}", id=f"human-{turn}")]}, config)
+
+def do_history(graph, config: dict) -> list:
+    return [[(type(m).__name__, m.content) for m in snapshot.values.get("messages", [])]
+            for snapshot in graph.get_state_history(config)]
+
+def do_message(message_id: str, content: str = "") -> HumanMessage:
+    return HumanMessage(content=content or message_id, id=message_id)
+
+class DiffMessagesTest(unittest.TestCase):
+    def test_round_trip(self):
+        parent = [do_message("a"), do_message("b"), do_message("c")]
+        for messages in [parent + [do_message("d")],
+                         [parent[0], do_message("b", "edited"), parent[2]],
+                         [parent[0], parent[2], do_message("d")],
+                         []]:
+            with self.subTest(messages=[m.content for m in messages]):
+                delta = do_diff_messages(parent, messages)
+                self.assertEqual(do_apply_delta(parent, delta["removed"], delta["upserted"]), messages)
+
+    def test_unchanged_messages_are_not_stored(self):
+        parent = [do_message("a"), do_message("b")]
+        self.assertEqual(do_diff_messages(parent, parent + [do_message("c")]),
+                         {"removed": [], "upserted": [do_message("c")]})
+
+    def test_lists_a_delta_cannot_express(self):
+        parent = [do_message("a"), do_message("b")]
+        self.assertIsNone(do_diff_messages(parent, [parent[1], parent[0]]))
+        self.assertIsNone(do_diff_messages(parent, parent + [HumanMessage(content="no id")]))
+
+class DeltaSqliteSaverTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "checkpoints.db")
+        self.config = {"configurable": {"thread_id": "thread-1"}}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def do_open_saver(self, **kwargs) -> DeltaSqliteSaver:
+        saver = DeltaSqliteSaver(self.path, **kwargs)
+        self.addCleanup(saver.close)
+        return saver
+
+    def do_count_stored(self) -> tuple[int, int]:
+        """(delta-encoded, full) checkpoints with messages in the file"""
+        saver = self.do_open_saver()
+        deltas = snapshots = 0
+        conn = sqlite3.connect(self.path)
+        try:
+            for row in conn.execute("SELECT type, checkpoint FROM checkpoints"):
+                value = saver.serde.loads_typed(row)["channel_values"].get("messages")
+                if isinstance(value, dict) and DELTA_KEY in value:
+                    deltas += 1
+                elif value is not None:
+                    snapshots += 1
+        finally:
+            conn.close()
+        return deltas, snapshots
+
+    def test_history_matches_a_plain_checkpointer(self):
+        expected = InMemorySaver()
+        do_run_turns(do_build_graph(expected), self.config, 8)
+        graph = do_build_graph(self.do_open_saver(snapshot_every=5))
+        do_run_turns(graph, self.config, 8)
+
+        self.assertEqual(do_history(graph, self.config), do_history(do_build_graph(expected), self.config))
+        deltas, snapshots = self.do_count_stored()
+        self.assertGreater(deltas, snapshots)
+
+    def test_reads_back_after_reopening(self):
+        # A new process: an empty message cache, so every list is rebuilt from the file
+        graph = do_build_graph(self.do_open_saver(snapshot_every=5))
+        do_run_turns(graph, self.config, 8)
+        reopened = do_build_graph(self.do_open_saver(snapshot_every=5))
+        self.assertEqual(do_history(reopened, self.config), do_history(graph, self.config))
+        self.assertEqual([m.content for m in reopened.get_state(self.config).values["messages"]],
+                         ["message 6", "reply to message 6", "message 7", "reply to message 7"])
+
+    def test_snapshots_bound_the_replay(self):
+        saver = self.do_open_saver(snapshot_every=4)
+        do_run_turns(do_build_graph(saver), self.config, 10)
+        with saver.cache_lock:
+            depths = [depth for messages, depth in saver.message_cache.values()]
+        self.assertTrue(depths)
+        self.assertLess(max(depths), 4)
+
+    def test_delete_thread(self):
+        saver = self.do_open_saver()
+        graph = do_build_graph(saver)
+        do_run_turns(graph, self.config, 3)
+        saver.delete_thread("thread-1")
+        self.assertEqual(do_history(graph, self.config), [])
+        conn = sqlite3.connect(self.path)
+        try:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM checkpoint_deltas").fetchone()[0], 0)
+        finally:
+            conn.close()
+
+if __name__ == "__main__":
+    unittest.main()
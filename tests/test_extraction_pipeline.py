@@ -0,0 +1,89 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction_pipeline import ExtractionPipeline, do_make_age_parser, do_parse_age_in_text, do_parse_int
+
+# The deterministic parsers stand in front of an LLM: they may only be certain
+# (confidence 1.0) where the LLM would be, and must leave everything else to it.
+#
+#   python -m unittest discover tests
+
+parse_age = do_make_age_parser(do_parse_age_in_text)
+
+class AgeParserTest(unittest.TestCase):
+    def test_stated_ages(self):
+        for text, age in [("I'm 42", 42), ("i am 42.", 42), ("I’m 42 years old", 42),
+                          ("my age is 42 years", 42), ("Age: 42", 42), ("age 42", 42), ("42 years old", 42),
+                          ("I just turned 42 years of age", 42), ("42 yo", 42), ("42 y/o!", 42),
+                          ("I'm 42 years old and I live in Paris", 42)]:
+            with self.subTest(text=text):
+                self.assertEqual(parse_age(text), (age, 1.0))
+
+    def test_numbers_that_are_not_ages(self):
+        # A lone number is only a guess; the LLM stage still runs
+        for text, guess in [("I'm 6 feet tall", 6), ("I am 5 minutes late", 5), ("Im 30", 30),
+                            ("I have 3 kids", 3), ("I'm 30 minutes away", 30), ("3 years ago", 3)]:
+            with self.subTest(text=text):
+                self.assertEqual(parse_age(text), (guess, 0.5))
+
+    def test_no_age(self):
+        for text in ["abc", "I'm not telling", "", "I'm 6 feet tall and 2 meters wide"]:
+            with self.subTest(text=text):
+                result = parse_age(text)
+                self.assertTrue(result is None or result[1] < 1.0, result)
+
+    def test_implausible_ages(self):
+        for text in ["I'm 150", "-3", "200 years old"]:
+            with self.subTest(text=text):
+                self.assertEqual(parse_age(text)[1], 0.0)
+
+    def test_parse_int(self):
+        self.assertEqual(do_parse_int(" 42 "), (42, 1.0))
+        self.assertIsNone(do_parse_int("42 years"))
+
+class ExtractionPipelineTest(unittest.TestCase):
+    def do_build(self, llm_answer):
+        self.llm_calls = []
+
+        def do_llm(text):
+            self.llm_calls.append(text)
+            return llm_answer
+
+        return ExtractionPipeline(f"test_age_{id(self)}", [
+            ("int", do_make_age_parser(do_parse_int)),
+            ("regex", parse_age),
+            ("llm", do_llm),
+        ])
+
+    def test_fast_path_skips_the_llm(self):
+        pipeline = self.do_build((99, 1.0))
+        result = pipeline.extract("I'm 42")
+        self.assertEqual((result.value, result.stage), (42, "regex"))
+        self.assertEqual(self.llm_calls, [])
+
+    def test_guess_falls_through_to_the_llm(self):
+        pipeline = self.do_build(None)
+        result = pipeline.extract("I'm 6 feet tall")
+        self.assertEqual(self.llm_calls, ["I'm 6 feet tall"])
+        # Nothing was confident, so the best guess comes back and the caller decides
+        self.assertEqual((result.value, result.confidence), (6, 0.5))
+
+    def test_llm_answer_wins_over_a_guess(self):
+        pipeline = self.do_build((30, 1.0))
+        result = pipeline.extract("I have 3 kids and I'm 30 next week")
+        self.assertEqual((result.value, result.stage), (30, "llm"))
+
+    def test_stats(self):
+        pipeline = self.do_build(None)
+        for text in ["42", "I'm 42", "abc"]:
+            pipeline.extract(text)
+        stats = pipeline.stats()
+        self.assertEqual(stats["calls"], 3)
+        self.assertEqual(stats["hits"], {"int": 1, "regex": 1, "llm": 0})
+        self.assertEqual(stats["unresolved"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import sys
+import unittest
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fast_path_router import FastPathRouter, do_build_fast_path_graph, do_collect_routing_examples
+
+# The router may only skip the supervisor when it is sure; unclear requests
+# must still reach the supervisor.
+#
+#   python -m unittest discover tests
+
+PATTERNS = {
+    "math_expert": [r"\bmultiply\b", r"\badd\b"],
+    "research_expert": [r"\bheadcount\b"],
+}
+
+def do_build_agent(name: str, calls: list):
+    def do_answer(state: MessagesState) -> dict:
+        calls.append(name)
+        return {"messages": [AIMessage(content=f"{name} answer", name=name)]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("answer", do_answer)
+    builder.add_edge(START, "answer")
+    builder.add_edge("answer", END)
+    return builder.compile(name=name)
+
+class FastPathRouterTest(unittest.TestCase):
+    def setUp(self):
+        self.router = FastPathRouter(PATTERNS)
+
+    def test_patterns(self):
+        self.assertEqual(self.router.route("Please multiply 3 by 4"), ["math_expert"])
+        self.assertEqual(self.router.route("What is the headcount of Meta?"), ["research_expert"])
+        self.assertEqual(self.router.route("Tell me a joke"), [])
+
+    def test_compound_requests(self):
+        text = "What is the combined headcount of FAANG? Then multiply it by 2"
+        self.assertEqual(self.router.route(text), [])
+        self.assertEqual(self.router.route(text, allow_parallel=True), ["math_expert", "research_expert"])
+        self.assertEqual(self.router.stats, {"fast_path": 0, "parallel": 1, "supervisor": 1})
+
+    def test_learned_routes(self):
+        self.router.learn([("what is the square root of 144", "math_expert"),
+                           ("who founded the company behind Instagram", "research_expert")])
+        self.assertEqual(self.router.route("square root of 81"), ["math_expert"])
+        self.assertEqual(self.router.route("who founded Instagram"), ["research_expert"])
+        # As many words of one agent as of the other: too close to call
+        self.assertEqual(self.router.route("root of the company behind"), [])
+        self.assertEqual(self.router.route("tell me a joke"), [])
+
+    def test_collect_routing_examples(self):
+        messages = [
+            HumanMessage(content="multiply 3 by 4"),
+            AIMessage(content="", tool_calls=[{"name": "transfer_to_math_expert", "args": {}, "id": "1"}]),
+            AIMessage(content="12", name="math_expert"),
+            HumanMessage(content="thanks"),
+            AIMessage(content="You're welcome"),
+        ]
+        self.assertEqual(do_collect_routing_examples(messages), [("multiply 3 by 4", "math_expert")])
+
+class FastPathGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.agents = {name: do_build_agent(name, self.calls) for name in PATTERNS}
+        self.supervisor = do_build_agent("supervisor", self.calls)
+
+    def do_ask(self, app, text: str) -> list:
+        return app.invoke({"messages": [HumanMessage(content=text)]})["messages"][1:]
+
+    def test_sure_requests_skip_the_supervisor(self):
+        app = do_build_fast_path_graph(self.supervisor, self.agents, FastPathRouter(PATTERNS))
+        self.assertEqual([m.content for m in self.do_ask(app, "multiply 3 by 4")], ["math_expert answer"])
+        self.assertEqual(self.calls, ["math_expert"])
+
+    def test_unsure_requests_go_to_the_supervisor(self):
+        app = do_build_fast_path_graph(self.supervisor, self.agents, FastPathRouter(PATTERNS))
+        self.do_ask(app, "Tell me a joke")
+        self.do_ask(app, "Add the headcount of Meta and Apple")
+        self.assertEqual(self.calls, ["supervisor", "supervisor"])
+
+    def test_compound_requests_are_synthesized(self):
+        synthesizer = RunnableLambda(lambda messages: AIMessage(content=" + ".join(m.content for m in messages[-2:])))
+        app = do_build_fast_path_graph(self.supervisor, self.agents, FastPathRouter(PATTERNS), synthesizer=synthesizer)
+        messages = self.do_ask(app, "Add the headcount of Meta and Apple")
+        self.assertEqual(sorted(self.calls), ["math_expert", "research_expert"])
+        # Agent replies in the router's agent order, then the merged answer
+        self.assertEqual([m.content for m in messages],
+                         ["math_expert answer", "research_expert answer", "math_expert answer + research_expert answer"])
+        self.assertEqual(messages[-1].name, "supervisor")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from xml.etree import ElementTree
+
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import graph_render
+from graph_render import do_layers, do_save_graph_image, do_topology, do_topology_hash
+
+# Graph pictures are drawn locally and cached by topology: the same graph is
+# drawn once, and any change to its nodes or edges draws it again.
+#
+#   python -m unittest discover tests
+
+def do_noop(state: MessagesState) -> dict:
+    return {}
+
+def do_route(state: MessagesState) -> str:
+    return END
+
+def do_build_graph(extra_node: bool = False):
+    # agent -> tools -> agent is the usual tool loop
+    builder = StateGraph(MessagesState)
+    builder.add_node("agent", do_noop)
+    builder.add_node("tools", do_noop)
+    builder.add_edge(START, "agent")
+    builder.add_conditional_edges("agent", do_route, ["tools", END])
+    builder.add_edge("tools", "agent")
+    if extra_node:
+        builder.add_node("summarize", do_noop)
+        builder.add_edge("summarize", END)
+    return builder.compile()
+
+class TopologyTest(unittest.TestCase):
+    def test_hash_follows_the_topology(self):
+        self.assertEqual(do_topology_hash(*do_topology(do_build_graph())), do_topology_hash(*do_topology(do_build_graph())))
+        self.assertNotEqual(do_topology_hash(*do_topology(do_build_graph())),
+                            do_topology_hash(*do_topology(do_build_graph(extra_node=True))))
+
+    def test_layers_ignore_loops(self):
+        layers = do_layers(*do_topology(do_build_graph()))
+        self.assertEqual(layers, {"__start__": 0, "agent": 1, "tools": 2, "__end__": 2})
+
+class SaveGraphImageTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+        # Graphviz may or may not be installed; the pure-Python SVG is always available
+        patcher = mock.patch.object(graph_render.shutil, "which", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def do_save(self, graph, name: str = "graph.png") -> str:
+        return do_save_graph_image(graph, os.path.join(self.tmp.name, name), self.cache_dir)
+
+    def test_svg_has_every_node(self):
+        path = self.do_save(do_build_graph())
+        self.assertEqual(os.path.splitext(path)[1], ".svg")
+        texts = {element.text for element in ElementTree.parse(path).iter("{http://www.w3.org/2000/svg}text")}
+        self.assertLessEqual({"start", "agent", "tools", "end"}, texts)
+
+    def test_unchanged_graph_is_drawn_once(self):
+        with mock.patch.object(graph_render, "do_render_svg", wraps=graph_render.do_render_svg) as render:
+            first = self.do_save(do_build_graph(), "first.png")
+            second = self.do_save(do_build_graph(), "second.png")
+            self.do_save(do_build_graph(extra_node=True), "third.png")
+        self.assertEqual(render.call_count, 2)
+        with open(first, "rb") as f1, open(second, "rb") as f2:
+            self.assertEqual(f1.read(), f2.read())
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+if __name__ == "__main__":
+    unittest.main()
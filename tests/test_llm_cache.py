@@ -0,0 +1,83 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_cache import SQLiteLLMCache
+
+# Cached enrichment answers: which prompts share an entry, and when entries
+# expire or are evicted.
+#
+#   python -m unittest discover tests
+
+MODEL = "gpt-4o-mini temperature=0"
+
+def do_generation(text: str) -> list:
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+class SQLiteLLMCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "llm_cache.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def do_open_cache(self, **kwargs) -> SQLiteLLMCache:
+        cache = SQLiteLLMCache(self.path, **kwargs)
+        self.addCleanup(cache.conn.close)
+        return cache
+
+    def do_lookup_text(self, cache, prompt: str, llm_string: str = MODEL):
+        result = cache.lookup(prompt, llm_string)
+        return result[0].text if result else None
+
+    def test_whitespace_does_not_change_the_key(self):
+        cache = self.do_open_cache()
+        cache.update("Find Jane Doe at Acme", MODEL, do_generation("CTO of Acme"))
+        for prompt in ["Find Jane Doe at Acme", "  Find  Jane Doe\nat Acme ", "Find\\nJane Doe\\tat Acme"]:
+            with self.subTest(prompt=prompt):
+                self.assertEqual(self.do_lookup_text(cache, prompt), "CTO of Acme")
+
+    def test_model_and_prompt_are_part_of_the_key(self):
+        cache = self.do_open_cache()
+        cache.update("Find Jane Doe at Acme", MODEL, do_generation("CTO of Acme"))
+        self.assertIsNone(self.do_lookup_text(cache, "Find Jane Doe at Acme", "gpt-4o temperature=0"))
+        self.assertIsNone(self.do_lookup_text(cache, "Find John Doe at Acme"))
+
+    def test_expired_entries_are_missed_and_deleted(self):
+        cache = self.do_open_cache(ttl_seconds=0.1)
+        cache.update("prompt", MODEL, do_generation("answer"))
+        self.assertEqual(self.do_lookup_text(cache, "prompt"), "answer")
+        time.sleep(0.15)
+        self.assertIsNone(self.do_lookup_text(cache, "prompt"))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = self.do_open_cache(max_entries=2)
+        cache.update("a", MODEL, do_generation("A"))
+        cache.update("b", MODEL, do_generation("B"))
+        time.sleep(0.01)
+        self.do_lookup_text(cache, "a")
+        cache.update("c", MODEL, do_generation("C"))
+        self.assertEqual([self.do_lookup_text(cache, p) for p in "abc"], ["A", None, "C"])
+
+    def test_entries_are_shared_through_the_file(self):
+        self.do_open_cache().update("prompt", MODEL, do_generation("answer"))
+        self.assertEqual(self.do_lookup_text(self.do_open_cache(), "prompt"), "answer")
+
+    def test_stats(self):
+        cache = self.do_open_cache()
+        cache.update("prompt", MODEL, do_generation("answer"))
+        self.do_lookup_text(cache, "prompt")
+        self.do_lookup_text(cache, "other prompt")
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1})
+
+if __name__ == "__main__":
+    unittest.main()
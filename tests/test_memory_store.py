@@ -0,0 +1,99 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory_store import SqliteMemoryStore
+
+# Long-term memory: per-user namespaces, semantic search with filters, and two
+# store instances (two processes) on one file seeing each other's writes.
+#
+#   python -m unittest discover tests
+
+FACTS = {
+    "rent": "Rent of 1200 is due on the first of the month",
+    "coffee": "Buys a coffee every morning before work",
+    "gym": "Pays for a gym membership every month",
+    "flight": "Booked a flight to Lisbon for the summer holiday",
+}
+
+class MemoryStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "memory_store.db")
+        self.store = self.do_open_store()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def do_open_store(self, **kwargs) -> SqliteMemoryStore:
+        store = SqliteMemoryStore(self.path, **kwargs)
+        self.addCleanup(store.conn.close)
+        return store
+
+    def do_put_facts(self, store, user: str) -> None:
+        for key, fact in FACTS.items():
+            store.put(("finance", user, "memories"), key, {"content": fact, "kind": "bill" if key in ("rent", "gym") else "habit"})
+
+    def do_search_keys(self, store, user: str, query: str, **kwargs) -> list[str]:
+        return [item.key for item in store.search(("finance", user), query=query, **kwargs)]
+
+    def test_search_ranks_the_relevant_memory_first(self):
+        self.do_put_facts(self.store, "ann")
+        self.assertEqual(self.do_search_keys(self.store, "ann", "when is the rent due?", limit=1), ["rent"])
+        self.assertEqual(self.do_search_keys(self.store, "ann", "morning coffee", limit=1), ["coffee"])
+
+    def test_users_never_see_each_other_memories(self):
+        self.do_put_facts(self.store, "ann")
+        self.store.put(("finance", "bob", "memories"), "bob-rent", {"content": "Rent is paid by bank transfer"})
+        self.assertEqual(self.do_search_keys(self.store, "bob", "rent", limit=5), ["bob-rent"])
+
+    def test_filter(self):
+        self.do_put_facts(self.store, "ann")
+        self.assertEqual(self.do_search_keys(self.store, "ann", "every month", filter={"kind": "habit"}, limit=5)[0], "coffee")
+        self.assertEqual(set(self.do_search_keys(self.store, "ann", "every month", filter={"kind": "bill"}, limit=5)),
+                         {"rent", "gym"})
+
+    def test_filter_on_a_large_namespace(self):
+        # Above exact_search_limit only bucket neighbours are scored; a filter must still find its matches
+        store = self.do_open_store(exact_search_limit=16)
+        for i in range(200):
+            store.put(("finance", "ann", "memories"), f"note-{i}", {"content": f"Note number {i} about groceries", "kind": "note"})
+        store.put(("finance", "ann", "memories"), "rent", {"content": FACTS["rent"], "kind": "bill"})
+        self.assertEqual(self.do_search_keys(store, "ann", "groceries", filter={"kind": "bill"}, limit=3), ["rent"])
+        self.assertEqual(len(self.do_search_keys(store, "ann", "groceries", filter={"kind": "note"}, limit=3)), 3)
+
+    def test_other_instance_writes_are_seen(self):
+        other = self.do_open_store()
+        self.do_put_facts(self.store, "ann")
+        self.assertEqual(self.do_search_keys(other, "ann", "rent due", limit=1), ["rent"])
+
+        # Added, updated and deleted by the first instance after `other` loaded the namespace
+        self.store.put(("finance", "ann", "memories"), "tea", {"content": "Drinks green tea in the afternoon"})
+        self.store.put(("finance", "ann", "memories"), "coffee", {"content": "Stopped buying coffee, makes it at home"})
+        self.assertEqual(self.do_search_keys(other, "ann", "green tea", limit=1), ["tea"])
+        coffee = other.search(("finance", "ann"), query="coffee at home", limit=1)[0]
+        self.assertEqual((coffee.key, coffee.value["content"]), ("coffee", "Stopped buying coffee, makes it at home"))
+
+        self.store.put(("finance", "ann", "memories"), "rent", None)
+        self.assertNotIn("rent", self.do_search_keys(other, "ann", "rent due", limit=5))
+
+        # Writes of its own keep working after syncing
+        other.put(("finance", "ann", "memories"), "rent", {"content": "Rent went up to 1300"})
+        self.assertEqual(self.do_search_keys(self.store, "ann", "rent", limit=1), ["rent"])
+        self.assertEqual(self.do_search_keys(other, "ann", "rent", limit=1), ["rent"])
+
+    def test_unindexed_items_are_not_searched_semantically(self):
+        self.store.put(("finance", "ann", "budgets"), "groceries", {"amount": 300}, index=False)
+        self.do_put_facts(self.store, "ann")
+        self.assertNotIn("groceries", self.do_search_keys(self.store, "ann", "groceries budget", limit=10))
+        self.assertEqual(self.store.get(("finance", "ann", "budgets"), "groceries").value, {"amount": 300})
+
+    def test_memories_survive_a_restart(self):
+        self.do_put_facts(self.store, "ann")
+        self.assertEqual(self.do_search_keys(self.do_open_store(), "ann", "flight to Lisbon", limit=1), ["flight"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import asyncio
+import os
+import sys
+import time
+import unittest
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parallel_tools import create_parallel_tool_node
+
+# Tool timeouts are counted from when a tool starts: calls queued behind a busy
+# pool must not come back to the model as timed out.
+#
+#   python -m unittest discover tests
+
+@tool
+def slow_lookup(query: str) -> str:
+    """Slow lookup"""
+    time.sleep(0.4)
+    return f"slow {query}"
+
+@tool
+def fast_lookup(query: str) -> str:
+    """Fast lookup"""
+    time.sleep(0.05)
+    return f"fast {query}"
+
+@tool
+def stuck_lookup(query: str) -> str:
+    """Lookup that takes longer than its timeout"""
+    time.sleep(0.5)
+    return f"stuck {query}"
+
+def do_build_graph(tool_node):
+    builder = StateGraph(MessagesState)
+    builder.add_node("tools", tool_node)
+    builder.add_edge(START, "tools")
+    builder.add_edge("tools", END)
+    return builder.compile()
+
+def do_turn(calls: list[tuple[str, str]]) -> dict:
+    tool_calls = [{"name": name, "args": {"query": query}, "id": f"call_{i}", "type": "tool_call"}
+                  for i, (name, query) in enumerate(calls)]
+    return {"messages": [AIMessage(content="", tool_calls=tool_calls)]}
+
+class ParallelToolTimeoutTest(unittest.TestCase):
+    def setUp(self):
+        # Two workers, both taken by the slow calls; the fast calls wait ~0.4s for one,
+        # longer than their own 0.2s timeout
+        self.graph = do_build_graph(create_parallel_tool_node([slow_lookup, fast_lookup, stuck_lookup], max_workers=2,
+                                                              timeout_seconds=0.2, timeouts={"slow_lookup": 1.0}))
+        self.turn = do_turn([("slow_lookup", "a"), ("slow_lookup", "b")] +
+                            [("fast_lookup", str(i)) for i in range(4)])
+
+    def do_check_results(self, messages):
+        messages = messages[1:]
+        self.assertEqual([m.status for m in messages], ["success"] * 6)
+        self.assertEqual([m.content for m in messages], ["slow a", "slow b"] + [f"fast {i}" for i in range(4)])
+
+    def test_queued_sync_calls_are_not_timed_out(self):
+        self.do_check_results(self.graph.invoke(self.turn)["messages"])
+
+    def test_queued_async_calls_are_not_timed_out(self):
+        self.do_check_results(asyncio.run(self.graph.ainvoke(self.turn))["messages"])
+
+    def test_running_call_still_times_out(self):
+        for result in (self.graph.invoke(do_turn([("stuck_lookup", "x")])),
+                       asyncio.run(self.graph.ainvoke(do_turn([("stuck_lookup", "x")])))):
+            message = result["messages"][-1]
+            self.assertEqual(message.status, "error")
+            self.assertIn("did not finish within 0.2s", message.content)
+            self.assertIn("still running", message.content)
+
+if __name__ == "__main__":
+    unittest.main()
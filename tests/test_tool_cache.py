@@ -0,0 +1,126 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tool_cache import ToolResultStore, memoize_tool, tool_cache_stats
+
+# Cached tool results: keys, TTL and the sqlite store shared between processes.
+#
+#   python -m unittest discover tests
+
+class ToolCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "tool_cache.db")
+        self.calls = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def do_open_store(self, ttl_seconds: float = 3600) -> ToolResultStore:
+        store = ToolResultStore(self.path, ttl_seconds=ttl_seconds)
+        self.addCleanup(store.conn.close)
+        return store
+
+    def do_make_tool(self, store=None, name=None):
+        @memoize_tool(store=store, name=name)
+        def trip_cost(destination: str, days: int = 3) -> int:
+            """Trip cost"""
+            self.calls.append((destination, days))
+            return 100 * days
+
+        return trip_cost
+
+    def do_count_rows(self) -> int:
+        with sqlite3.connect(self.path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM tool_cache").fetchone()[0]
+
+    def test_arguments_are_canonicalized(self):
+        trip_cost = self.do_make_tool()
+        self.assertEqual(trip_cost("Rome"), 300)
+        self.assertEqual(trip_cost("Rome", 3), 300)
+        self.assertEqual(trip_cost(days=3, destination="Rome"), 300)
+        self.assertEqual(trip_cost("Rome", days=4), 400)
+        self.assertEqual(self.calls, [("Rome", 3), ("Rome", 4)])
+
+    def test_exceptions_are_not_cached(self):
+        @memoize_tool
+        def flaky(x: int) -> int:
+            """Flaky"""
+            self.calls.append(x)
+            if len(self.calls) == 1:
+                raise RuntimeError("first call fails")
+            return x
+
+        with self.assertRaises(RuntimeError):
+            flaky(1)
+        self.assertEqual(flaky(1), 1)
+        self.assertEqual(self.calls, [1, 1])
+
+    def test_store_is_shared_between_instances(self):
+        self.do_make_tool(self.do_open_store())("Rome")
+        # A new process: its own in-memory cache, the same file
+        self.assertEqual(self.do_make_tool(self.do_open_store())("Rome"), 300)
+        self.assertEqual(self.calls, [("Rome", 3)])
+
+    def test_expired_results_are_not_returned(self):
+        store = self.do_open_store(ttl_seconds=0.1)
+        store.set("key", "value")
+        self.assertEqual(store.get("key"), (True, "value"))
+        time.sleep(0.15)
+        self.assertEqual(store.get("key"), (False, None))
+
+    def test_expired_rows_are_deleted_on_open(self):
+        store = self.do_open_store(ttl_seconds=0.1)
+        for i in range(5):
+            store.set(f"key {i}", i)
+        time.sleep(0.15)
+        self.do_open_store(ttl_seconds=0.1)
+        self.assertEqual(self.do_count_rows(), 0)
+
+    def test_expired_rows_are_deleted_on_write(self):
+        store = self.do_open_store(ttl_seconds=0.1)
+        store.set("old", 1)
+        time.sleep(0.15)
+        store.set("new", 2)
+        self.assertEqual(self.do_count_rows(), 2)  # Not due yet: at most one purge per interval
+
+        store.next_purge = 0.0
+        store.set("newer", 3)
+        self.assertEqual(self.do_count_rows(), 2)
+        self.assertEqual(store.get("old"), (False, None))
+        self.assertEqual(store.get("newer"), (True, 3))
+
+    def test_different_tools_with_the_same_name_do_not_share_results(self):
+        store = self.do_open_store()
+
+        @memoize_tool(store=store)
+        def search(query: str) -> str:
+            """Search the web"""
+            return f"web results for {query}"
+
+        web_search = search
+
+        @memoize_tool(store=store)
+        def search(query: str) -> str:
+            """Search the expense database"""
+            return f"expenses matching {query}"
+
+        self.assertEqual(web_search("rent"), "web results for rent")
+        self.assertEqual(search("rent"), "expenses matching rent")
+        self.assertEqual(len([name for name in tool_cache_stats() if name.startswith("search[")]), 2)
+
+    def test_same_tool_registered_twice_shares_results(self):
+        # As when a tool's file is both run as a script and imported
+        store = self.do_open_store()
+        self.do_make_tool(store)("Paris")
+        self.assertEqual(self.do_make_tool(store)("Paris"), 300)
+        self.assertEqual(self.calls, [("Paris", 3)])
+
+if __name__ == "__main__":
+    unittest.main()
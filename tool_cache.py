@@ -0,0 +1,207 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+
+# Memoization for pure tools - tools whose result only depends on their arguments.
+# Decorate the function before handing it to bind_tools/ToolNode:
+#
+#   @memoize_tool
+#   def add(a: int, b: int) -> int: ...
+#
+#   @memoize_tool(maxsize=256, store=ToolResultStore())
+#   def calculate_trip_cost(destination: str, days: int, people: int) -> str: ...
+#
+# Calls are keyed on the tool name, a hash of its schema (parameters and docstring,
+# as bind_tools sees them) and the canonicalized arguments (defaults applied, keyword order ignored), kept in a per-tool LRU that
+# all graph threads share, and optionally in a sqlite ToolResultStore shared with
+# other processes. Exceptions are never cached. Only JSON-serializable results are
+# written to the store, and rows older than the store's TTL are deleted.
+# The tool name is the function name, as bind_tools sees it, so a stored result is
+# found again whether the tool's file was run as a script or imported. Two different
+# tools with the same name only share results if their parameters and docstrings are
+# identical too; give those distinct names: @memoize_tool(name="...").
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tool_cache.db")
+
+# Expired rows are deleted when a store is opened and then at most this often, on write
+PURGE_INTERVAL_SECONDS = 600
+
+# (tool name, schema hash) -> its cache counters, for tool_cache_stats()
+_registry = {}
+
+class ToolResultStore:
+    """Tool results in sqlite, shared by every process that opens the same file"""
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH, ttl_seconds: float = 24 * 3600):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS tool_cache (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS tool_cache_created_at ON tool_cache (created_at);
+            """
+        )
+        self.next_purge = 0.0
+        with self.lock:
+            self.do_purge_expired()
+
+    def get(self, key: str):
+        """Return (found, result)"""
+        with self.lock:
+            row = self.conn.execute("SELECT result, created_at FROM tool_cache WHERE key = ?", (key,)).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return False, None
+        return True, json.loads(row[0])
+
+    def set(self, key: str, result) -> None:
+        try:
+            serialized = json.dumps(result)
+        except (TypeError, ValueError):
+            return
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO tool_cache (key, result, created_at) VALUES (?, ?, ?)",
+                (key, serialized, time.time()),
+            )
+            self.conn.commit()
+            if time.time() >= self.next_purge:
+                self.do_purge_expired()
+
+    def do_purge_expired(self) -> int:
+        """Delete the rows older than the TTL; the caller holds the lock"""
+        deleted = self.conn.execute("DELETE FROM tool_cache WHERE created_at < ?",
+                                    (time.time() - self.ttl_seconds,)).rowcount
+        self.conn.commit()
+        self.next_purge = time.time() + PURGE_INTERVAL_SECONDS
+        return deleted
+
+    def clear(self) -> None:
+        with self.lock:
+            self.conn.execute("DELETE FROM tool_cache")
+            self.conn.commit()
+
+class _ToolCache:
+    def __init__(self, name: str, maxsize: int, store: ToolResultStore = None):
+        self.name = name
+        self.maxsize = maxsize
+        self.store = store
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return True, self.entries[key]
+        if self.store is not None:
+            found, result = self.store.get(key)
+            if found:
+                self._remember(key, result)
+                with self.lock:
+                    self.store_hits += 1
+                return True, result
+        with self.lock:
+            self.misses += 1
+        return False, None
+
+    def set(self, key: str, result) -> None:
+        self._remember(key, result)
+        if self.store is not None:
+            self.store.set(key, result)
+
+    def _remember(self, key: str, result) -> None:
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self.lock:
+            calls = self.hits + self.store_hits + self.misses
+            return {
+                "hits": self.hits,
+                "store_hits": self.store_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.store_hits) / calls, 3) if calls else 0.0,
+                "size": len(self.entries),
+            }
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.store_hits = self.misses = 0
+
+def do_schema_hash(func, signature: inspect.Signature) -> str:
+    """Short hash of what the model sees of a tool: its parameters and its docstring"""
+    parameters = [
+        (p.name, p.kind.name, getattr(p.annotation, "__qualname__", repr(p.annotation)), repr(p.default))
+        for p in signature.parameters.values()
+    ]
+    schema = (parameters, inspect.getdoc(func) or "")
+    return hashlib.sha256(repr(schema).encode("utf-8")).hexdigest()[:12]
+
+def do_make_cache_key(name: str, schema: str, signature: inspect.Signature, args: tuple, kwargs: dict) -> str:
+    """Canonical key for a call: the same arguments give the same key however they were passed"""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return f"{name}:{schema}:{json.dumps(bound.arguments, sort_keys=True, default=str)}"
+
+def memoize_tool(func=None, *, name: str = None, maxsize: int = 1024, store: ToolResultStore = None):
+    """Cache a pure tool's results by its arguments. Keeps the signature and docstring for tool binding."""
+
+    def do_decorate(func):
+        # Not func.__module__: that is "__main__" or the module name depending on the entry point
+        tool_name = name or func.__name__
+        signature = inspect.signature(func)
+        schema = do_schema_hash(func, signature)
+        cache = _ToolCache(tool_name, maxsize, store)
+        _registry[(tool_name, schema)] = cache
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def memoized(*args, **kwargs):
+                key = do_make_cache_key(tool_name, schema, signature, args, kwargs)
+                found, result = cache.get(key)
+                if not found:
+                    result = await func(*args, **kwargs)
+                    cache.set(key, result)
+                return result
+        else:
+            @functools.wraps(func)
+            def memoized(*args, **kwargs):
+                key = do_make_cache_key(tool_name, schema, signature, args, kwargs)
+                found, result = cache.get(key)
+                if not found:
+                    result = func(*args, **kwargs)
+                    cache.set(key, result)
+                return result
+
+        memoized.cache_stats = cache.stats
+        memoized.cache_clear = cache.clear
+        return memoized
+
+    return do_decorate(func) if func is not None else do_decorate
+
+def tool_cache_stats() -> dict:
+    """Hit/miss counters of every memoized tool, by tool name ("name[schema hash]" when a name is reused)"""
+    names = Counter(name for name, _ in _registry)
+    return {name if names[name] == 1 else f"{name}[{schema}]": cache.stats() for (name, schema), cache in _registry.items()}